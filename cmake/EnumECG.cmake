@@ -0,0 +1,123 @@
+# Functions for generating Enhanced Enum definitions with EnumECG
+#
+# enumecg_add_headers(TARGET <target> DEFINITIONS <file>...
+#                     [OUTPUT_DIR <dir>] [DOCUMENTATION <style>]
+#                     [PRIMARY_TYPE <type>] [VALUE_TYPE <type>] [NAMES]
+#                     [NARROW_TYPES] [ARRAY_SEQUENCES] [STRING_BLOB]
+#                     [SPLIT_HEADERS])
+#
+# Generate a header for each definition file with a single invocation of
+# EnumECG, and make <target> depend on the generated headers. The header
+# generated from DEFINITIONS entry foo.yaml is called foo.hh, and it is placed
+# in OUTPUT_DIR (defaults to ${CMAKE_CURRENT_BINARY_DIR}/enumecg). OUTPUT_DIR is
+# added to the include directories of <target>. If NAMES is given, enumerator
+# name lookup is generated. If NARROW_TYPES is given, the narrowest numeric
+# types fitting the enumerator values are deduced. If ARRAY_SEQUENCES is given,
+# std::array is deduced for sequences whose elements have the same type. If
+# STRING_BLOB is given, string values are stored in a single character array. If
+# SPLIT_HEADERS is given, the label enum generated from foo.yaml is written to
+# foo_label.hh, which is included by foo.hh.
+#
+# EnumECG only rewrites headers whose contents change, and the headers are
+# declared as byproducts of the generation step, so that build tools
+# supporting restat (like Ninja) only recompile the translation units
+# affected by the changed definitions. When the generator supports depfiles,
+# EnumECG reports the templates and package sources it reads, and the
+# headers are regenerated whenever any of them changes.
+#
+# The command used to invoke EnumECG can be customized by setting the
+# ENUMECG_COMMAND variable. By default the enumecg module is run with the
+# Python interpreter found by find_package(Python).
+
+include(FindPython)
+
+if(POLICY CMP0116)
+  cmake_policy(SET CMP0116 NEW)
+endif()
+
+function(enumecg_add_headers)
+  cmake_parse_arguments(ENUMECG
+    "NAMES;NARROW_TYPES;ARRAY_SEQUENCES;STRING_BLOB;SPLIT_HEADERS"
+    "TARGET;OUTPUT_DIR;DOCUMENTATION;PRIMARY_TYPE;VALUE_TYPE"
+    "DEFINITIONS"
+    ${ARGN})
+
+  if(NOT ENUMECG_TARGET)
+    message(FATAL_ERROR "enumecg_add_headers: TARGET is required")
+  endif()
+  if(NOT ENUMECG_DEFINITIONS)
+    message(FATAL_ERROR "enumecg_add_headers: DEFINITIONS is required")
+  endif()
+  if(NOT ENUMECG_OUTPUT_DIR)
+    set(ENUMECG_OUTPUT_DIR "${CMAKE_CURRENT_BINARY_DIR}/enumecg")
+  endif()
+
+  if(ENUMECG_COMMAND)
+    set(ENUMECG_GENERATOR_COMMAND ${ENUMECG_COMMAND})
+  else()
+    find_package(Python REQUIRED COMPONENTS Interpreter)
+    set(ENUMECG_GENERATOR_COMMAND Python::Interpreter -m enumecg)
+  endif()
+
+  set(ENUMECG_OPTIONS "--output-dir" "${ENUMECG_OUTPUT_DIR}")
+  if(ENUMECG_DOCUMENTATION)
+    list(APPEND ENUMECG_OPTIONS "--documentation" "${ENUMECG_DOCUMENTATION}")
+  endif()
+  if(ENUMECG_PRIMARY_TYPE)
+    list(APPEND ENUMECG_OPTIONS "--primary-type" "${ENUMECG_PRIMARY_TYPE}")
+  endif()
+  if(ENUMECG_VALUE_TYPE)
+    list(APPEND ENUMECG_OPTIONS "--value-type" "${ENUMECG_VALUE_TYPE}")
+  endif()
+  if(ENUMECG_NAMES)
+    list(APPEND ENUMECG_OPTIONS "--names")
+  endif()
+  if(ENUMECG_NARROW_TYPES)
+    list(APPEND ENUMECG_OPTIONS "--narrow-types")
+  endif()
+  if(ENUMECG_ARRAY_SEQUENCES)
+    list(APPEND ENUMECG_OPTIONS "--array-sequences")
+  endif()
+  if(ENUMECG_STRING_BLOB)
+    list(APPEND ENUMECG_OPTIONS "--string-blob")
+  endif()
+  if(ENUMECG_SPLIT_HEADERS)
+    list(APPEND ENUMECG_OPTIONS "--split-headers")
+  endif()
+
+  set(ENUMECG_INPUTS)
+  set(ENUMECG_HEADERS)
+  foreach(ENUMECG_DEFINITION ${ENUMECG_DEFINITIONS})
+    get_filename_component(ENUMECG_INPUT "${ENUMECG_DEFINITION}" ABSOLUTE)
+    # Strip only the last extension, like os.path.splitext() in enumecg.
+    # NAME_WE would strip everything from the first dot.
+    get_filename_component(ENUMECG_STEM "${ENUMECG_DEFINITION}" NAME)
+    string(REGEX REPLACE "^(\\.*[^.].*)\\.[^.]*$" "\\1" ENUMECG_STEM "${ENUMECG_STEM}")
+    list(APPEND ENUMECG_INPUTS "${ENUMECG_INPUT}")
+    list(APPEND ENUMECG_HEADERS "${ENUMECG_OUTPUT_DIR}/${ENUMECG_STEM}.hh")
+    if(ENUMECG_SPLIT_HEADERS)
+      list(APPEND ENUMECG_HEADERS "${ENUMECG_OUTPUT_DIR}/${ENUMECG_STEM}_label.hh")
+    endif()
+  endforeach()
+
+  set(ENUMECG_STAMP "${CMAKE_CURRENT_BINARY_DIR}/${ENUMECG_TARGET}EnumECG.stamp")
+  if(CMAKE_GENERATOR MATCHES "Ninja" OR
+      (CMAKE_GENERATOR MATCHES "Makefiles" AND NOT CMAKE_VERSION VERSION_LESS 3.20))
+    set(ENUMECG_DEPFILE "${CMAKE_CURRENT_BINARY_DIR}/${ENUMECG_TARGET}EnumECG.d")
+    list(APPEND ENUMECG_OPTIONS "--depfile" "${ENUMECG_DEPFILE}")
+    set(ENUMECG_DEPFILE_ARGS DEPFILE "${ENUMECG_DEPFILE}")
+  endif()
+  file(MAKE_DIRECTORY "${ENUMECG_OUTPUT_DIR}")
+  add_custom_command(OUTPUT "${ENUMECG_STAMP}"
+    BYPRODUCTS ${ENUMECG_HEADERS}
+    COMMAND ${ENUMECG_GENERATOR_COMMAND} ${ENUMECG_OPTIONS}
+      --stamp "${ENUMECG_STAMP}" ${ENUMECG_INPUTS}
+    DEPENDS ${ENUMECG_INPUTS}
+    ${ENUMECG_DEPFILE_ARGS}
+    COMMENT "Generating Enhanced Enum headers for ${ENUMECG_TARGET}"
+    VERBATIM)
+
+  add_custom_target(${ENUMECG_TARGET}EnumECG DEPENDS "${ENUMECG_STAMP}")
+  add_dependencies(${ENUMECG_TARGET} ${ENUMECG_TARGET}EnumECG)
+  target_include_directories(${ENUMECG_TARGET} PRIVATE "${ENUMECG_OUTPUT_DIR}")
+endfunction()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""Compare the compile time of generated headers and module interfaces
+
+Generates a number of enums and translation units using them, and
+measures the time it takes to compile the translation units when the
+enums are included as headers, and when they are imported from a C++20
+module. The results are printed as JSON.
+
+The enumecg package must be importable, e.g. by setting PYTHONPATH to
+the python/ directory of the repository. Only compilation is measured,
+the object files are not linked.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+import time
+
+from enumecg import generate, generate_module
+
+_INCLUDE_DIR = os.path.join(os.path.dirname(__file__), "..", "include")
+_MODULE_INTERFACE = os.path.join(_INCLUDE_DIR, "enhanced_enum", "enhanced_enum.cppm")
+
+
+def _make_enums(n_enums, n_members):
+    return [
+        {
+            "typename": f"Enum{i}",
+            "members": [
+                {"name": f"ENUMERATOR_{j}", "value": f"value{j}"}
+                for j in range(n_members)
+            ],
+        }
+        for i in range(n_enums)
+    ]
+
+
+def _make_unit_body(enums):
+    lines = ["int use_enums(int n) {", "    int sum = 0;"]
+    for enum in enums:
+        typename = enum["typename"]
+        lines.append(
+            f"    sum += static_cast<int>(Enhanced{typename}::begin()[n].value().size());"
+        )
+    lines += ["    return sum;", "}"]
+    return "\n".join(lines)
+
+
+def _write(path, content):
+    with open(path, "w") as out:
+        out.write(content)
+
+
+def _compile(compiler, flags, source, cwd):
+    start = time.perf_counter()
+    subprocess.run(
+        [compiler, *flags, "-c", source, "-o", os.devnull], check=True, cwd=cwd
+    )
+    return time.perf_counter() - start
+
+
+def _measure_headers(compiler, enums, n_units, workdir):
+    for enum in enums:
+        _write(
+            os.path.join(workdir, f"{enum['typename']}.hh"),
+            "#pragma once\n#include <enhanced_enum/enhanced_enum.hh>\n"
+            "#include <string_view>\n\n" + generate(enum),
+        )
+    includes = "".join(f'#include "{enum["typename"]}.hh"\n' for enum in enums)
+    flags = ["-std=c++20", f"-I{_INCLUDE_DIR}"]
+    total = 0.0
+    for i in range(n_units):
+        source = f"header_unit{i}.cc"
+        _write(os.path.join(workdir, source), includes + _make_unit_body(enums))
+        total += _compile(compiler, flags, source, workdir)
+    return {"interfaces": 0.0, "units": total}
+
+
+def _measure_module(compiler, enums, n_units, workdir):
+    _write(
+        os.path.join(workdir, "enums.cppm"),
+        generate_module(enums, module_name="enums"),
+    )
+    flags = ["-std=c++20", "-fmodules-ts", f"-I{_INCLUDE_DIR}"]
+    interfaces = _compile(
+        compiler, flags + ["-x", "c++"], os.path.abspath(_MODULE_INTERFACE), workdir
+    )
+    interfaces += _compile(compiler, flags + ["-x", "c++"], "enums.cppm", workdir)
+    total = 0.0
+    for i in range(n_units):
+        source = f"module_unit{i}.cc"
+        _write(
+            os.path.join(workdir, source), "import enums;\n" + _make_unit_body(enums)
+        )
+        total += _compile(compiler, flags, source, workdir)
+    return {"interfaces": interfaces, "units": total}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--compiler", default="g++", help="C++ compiler")
+    parser.add_argument("--enums", type=int, default=20, help="Number of enums")
+    parser.add_argument(
+        "--members", type=int, default=50, help="Number of members in each enum"
+    )
+    parser.add_argument(
+        "--units", type=int, default=20, help="Number of translation units"
+    )
+    args = parser.parse_args()
+
+    enums = _make_enums(args.enums, args.members)
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {
+            "compiler": args.compiler,
+            "enums": args.enums,
+            "members": args.members,
+            "units": args.units,
+            "header": _measure_headers(args.compiler, enums, args.units, workdir),
+            "module": _measure_module(args.compiler, enums, args.units, workdir),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
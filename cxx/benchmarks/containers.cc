@@ -0,0 +1,129 @@
+// Compare enhanced_enum::enum_map and enum_set to the node based standard
+// library containers
+//
+// Each benchmark runs an operation for a sequence of pseudorandom enumerators,
+// and prints the average time per operation as a JSON object on its own line.
+
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <iostream>
+#include <map>
+#include <random>
+#include <set>
+#include <string>
+#include <string_view>
+#include <unordered_map>
+#include <unordered_set>
+#include <vector>
+
+#include <enhanced_enum/containers.hh>
+
+#include "opcode.hh"
+
+namespace std {
+
+template<>
+struct hash<EnhancedOpcode> : enhanced_enum::hash<EnhancedOpcode> {};
+
+}
+
+namespace {
+
+constexpr auto ROUNDS = 1000;
+constexpr auto KEYS = 1000;
+
+volatile std::size_t sink;
+
+std::vector<EnhancedOpcode> makeKeys()
+{
+    auto engine = std::minstd_rand {};
+    auto distribution = std::uniform_int_distribution<std::size_t> {
+        0, EnhancedOpcode::size() - 1};
+    auto keys = std::vector<EnhancedOpcode> {};
+    for (auto n = 0; n < KEYS; ++n) {
+        keys.push_back(*(EnhancedOpcode::begin() + distribution(engine)));
+    }
+    return keys;
+}
+
+template<typename Operation>
+void run(std::string_view name, const std::vector<EnhancedOpcode>& keys, Operation operation)
+{
+    auto result = std::size_t {};
+    const auto start = std::chrono::steady_clock::now();
+    for (auto round = 0; round < ROUNDS; ++round) {
+        for (const auto key : keys) {
+            result += operation(key);
+        }
+    }
+    const auto stop = std::chrono::steady_clock::now();
+    sink = result;
+    const auto ns = std::chrono::duration<double, std::nano>(stop - start).count();
+    std::cout << "{\"benchmark\": \"" << name << "\", \"ns_per_op\": "
+              << ns / (ROUNDS * keys.size()) << "}\n";
+}
+
+template<typename Map>
+Map makeMap()
+{
+    auto map = Map {};
+    for (const auto e : EnhancedOpcode::all()) {
+        map[e] = static_cast<std::size_t>(e.get());
+    }
+    return map;
+}
+
+template<typename Map>
+void benchmarkMap(std::string_view name, const std::vector<EnhancedOpcode>& keys)
+{
+    auto map = makeMap<Map>();
+    run(std::string {name} + "/lookup", keys, [&map](const auto key) {
+        return map.at(key);
+    });
+    run(std::string {name} + "/update", keys, [&map](const auto key) {
+        return ++map[key];
+    });
+    run(std::string {name} + "/iterate", keys, [&map](const auto) {
+        auto sum = std::size_t {};
+        for (const auto& [key, value] : map) {
+            sum += value;
+        }
+        return sum;
+    });
+}
+
+template<typename Set>
+void benchmarkSet(std::string_view name, const std::vector<EnhancedOpcode>& keys)
+{
+    auto set = Set {};
+    run(std::string {name} + "/insert_erase", keys, [&set](const auto key) {
+        const auto inserted = set.insert(key).second;
+        if (!inserted) {
+            set.erase(key);
+        }
+        return inserted;
+    });
+    set.clear();
+    for (const auto e : EnhancedOpcode::all()) {
+        if (static_cast<std::size_t>(e.get()) % 2 == 0) {
+            set.insert(e);
+        }
+    }
+    run(std::string {name} + "/contains", keys, [&set](const auto key) {
+        return set.count(key);
+    });
+}
+
+}
+
+int main()
+{
+    const auto keys = makeKeys();
+    benchmarkMap<enhanced_enum::enum_map<EnhancedOpcode, std::size_t>>("enum_map", keys);
+    benchmarkMap<std::map<EnhancedOpcode, std::size_t>>("std::map", keys);
+    benchmarkMap<std::unordered_map<EnhancedOpcode, std::size_t>>("std::unordered_map", keys);
+    benchmarkSet<enhanced_enum::enum_set<EnhancedOpcode>>("enum_set", keys);
+    benchmarkSet<std::set<EnhancedOpcode>>("std::set", keys);
+    benchmarkSet<std::unordered_set<EnhancedOpcode>>("std::unordered_set", keys);
+}
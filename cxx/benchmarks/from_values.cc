@@ -0,0 +1,96 @@
+// Compare the bulk conversions enhanced_enum::from_values and
+// from_values_masked to converting values one by one with enum_base::from
+//
+// Each benchmark converts a column of pseudorandom valid values of an enum, and
+// prints the average time per value as a JSON object on its own line. The
+// enums cover the lookup strategies of the bulk conversions: consecutive
+// integers (Channel), integers in a compact range (MessageType), and strings
+// (Opcode).
+
+#include <chrono>
+#include <cstddef>
+#include <iostream>
+#include <random>
+#include <string>
+#include <string_view>
+#include <vector>
+
+#include <enhanced_enum/enhanced_enum.hh>
+
+#include "channel.hh"
+#include "message_type.hh"
+#include "opcode.hh"
+
+namespace {
+
+constexpr auto ROUNDS = 20;
+constexpr auto VALUES = 100000;
+
+volatile std::size_t sink;
+
+template<typename EnhancedEnum>
+std::vector<typename EnhancedEnum::value_type> makeValues()
+{
+    auto engine = std::minstd_rand {};
+    auto distribution = std::uniform_int_distribution<std::size_t> {
+        0, EnhancedEnum::size() - 1};
+    auto values = std::vector<typename EnhancedEnum::value_type> {};
+    for (auto n = 0; n < VALUES; ++n) {
+        values.push_back(EnhancedEnum::values[distribution(engine)]);
+    }
+    return values;
+}
+
+template<typename Operation>
+void run(const std::string& name, Operation operation)
+{
+    auto result = std::size_t {};
+    const auto start = std::chrono::steady_clock::now();
+    for (auto round = 0; round < ROUNDS; ++round) {
+        result += operation();
+    }
+    const auto stop = std::chrono::steady_clock::now();
+    sink = result;
+    const auto ns = std::chrono::duration<double, std::nano>(stop - start).count();
+    std::cout << "{\"benchmark\": \"" << name << "\", \"ns_per_op\": "
+              << ns / (ROUNDS * VALUES) << "}\n";
+}
+
+template<typename EnhancedEnum>
+void benchmark(std::string_view name)
+{
+    using label_type = typename EnhancedEnum::label_type;
+    const auto values = makeValues<EnhancedEnum>();
+    auto labels = std::vector<label_type>(values.size());
+    auto mask = std::vector<unsigned char>(values.size());
+
+    run(std::string {name} + "/from", [&]() {
+        auto out = labels.begin();
+        for (const auto& value : values) {
+            const auto e = EnhancedEnum::from(value);
+            if (!e) {
+                break;
+            }
+            *out++ = e->get();
+        }
+        return static_cast<std::size_t>(labels.back());
+    });
+    run(std::string {name} + "/from_values", [&]() {
+        enhanced_enum::from_values<label_type>(
+            values.begin(), values.end(), labels.begin());
+        return static_cast<std::size_t>(labels.back());
+    });
+    run(std::string {name} + "/from_values_masked", [&]() {
+        return enhanced_enum::from_values_masked<label_type>(
+            values.begin(), values.end(), labels.begin(), mask.begin());
+    });
+}
+
+}
+
+int main()
+{
+    benchmark<EnhancedChannel>("channel");
+    benchmark<EnhancedMessageType>("message_type");
+    benchmark<EnhancedOpcode>("opcode");
+}
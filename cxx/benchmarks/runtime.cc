@@ -0,0 +1,159 @@
+// Measure the runtime cost of the basic operations of enhanced enums
+//
+// The benchmarks cover enum_base::from(), enum_base::value(), traversing the
+// enumerators with the enum iterators, and enhanced_enum::hash both alone and in
+// an unordered container.
+// Each operation is measured for enums with integer, string and tuple values
+// having 4, 32 and 256 enumerators. The enums are generated from definitions
+// written by the CMake build. Each benchmark prints the average time per
+// operation as a JSON object on its own line, along with the value access policy
+// (see ENHANCED_ENUM_CHECKED_VALUE_ACCESS) the program was built with.
+
+#include <chrono>
+#include <cstddef>
+#include <iostream>
+#include <random>
+#include <string>
+#include <string_view>
+#include <tuple>
+#include <type_traits>
+#include <unordered_set>
+#include <vector>
+
+#include <enhanced_enum/enhanced_enum.hh>
+
+#include "Integer4.hh"
+#include "Integer32.hh"
+#include "Integer256.hh"
+#include "String4.hh"
+#include "String32.hh"
+#include "String256.hh"
+#include "Tuple4.hh"
+#include "Tuple32.hh"
+#include "Tuple256.hh"
+
+namespace {
+
+constexpr auto ROUNDS = 100;
+constexpr auto KEYS = 10000;
+
+constexpr auto VALUE_ACCESS = ENHANCED_ENUM_CHECKED_VALUE_ACCESS ? "checked" : "unchecked";
+
+volatile std::size_t sink;
+
+// Always zero, but opaque to the optimizer so that traversals of the enums are
+// not evaluated at compile time
+volatile std::ptrdiff_t first = 0;
+
+std::size_t consume(std::string_view value)
+{
+    return value.size();
+}
+
+template<typename T>
+std::size_t consume(const T& value)
+{
+    if constexpr (std::is_arithmetic_v<T>) {
+        return static_cast<std::size_t>(value);
+    } else {
+        return consume(std::get<0>(value));
+    }
+}
+
+template<typename EnhancedEnum>
+std::vector<EnhancedEnum> makeKeys()
+{
+    auto engine = std::minstd_rand {};
+    auto distribution = std::uniform_int_distribution<std::size_t> {
+        0, EnhancedEnum::size() - 1};
+    auto keys = std::vector<EnhancedEnum> {};
+    for (auto n = 0; n < KEYS; ++n) {
+        keys.push_back(*(EnhancedEnum::begin() + distribution(engine)));
+    }
+    return keys;
+}
+
+// Run operation, performing ops operations, for a number of rounds
+template<typename Operation>
+void run(const std::string& name, std::size_t ops, Operation operation)
+{
+    auto result = std::size_t {};
+    const auto start = std::chrono::steady_clock::now();
+    for (auto round = 0; round < ROUNDS; ++round) {
+        result += operation();
+    }
+    const auto stop = std::chrono::steady_clock::now();
+    sink = result;
+    const auto ns = std::chrono::duration<double, std::nano>(stop - start).count();
+    std::cout << "{\"benchmark\": \"" << name << "\", \"value_access\": \""
+              << VALUE_ACCESS << "\", \"ns_per_op\": " << ns / (ROUNDS * ops) << "}\n";
+}
+
+template<typename EnhancedEnum>
+void benchmark(std::string_view name)
+{
+    const auto keys = makeKeys<EnhancedEnum>();
+    auto values = std::vector<typename EnhancedEnum::value_type> {};
+    for (const auto key : keys) {
+        values.push_back(key.value());
+    }
+
+    run(std::string {name} + "/from", values.size(), [&]() {
+        auto result = std::size_t {};
+        for (const auto& value : values) {
+            const auto e = EnhancedEnum::from(value);
+            result += e ? static_cast<std::size_t>(e->get()) : 0;
+        }
+        return result;
+    });
+    run(std::string {name} + "/value", keys.size(), [&]() {
+        auto result = std::size_t {};
+        for (const auto key : keys) {
+            result += consume(key.value());
+        }
+        return result;
+    });
+    run(std::string {name} + "/iterate", EnhancedEnum::size(), []() {
+        auto result = std::size_t {};
+        const auto last = EnhancedEnum::end();
+        for (auto it = EnhancedEnum::begin() + first; it != last; ++it) {
+            result = 31 * result + static_cast<std::size_t>(it->get());
+        }
+        return result;
+    });
+    run(std::string {name} + "/hash", keys.size(), [&]() {
+        auto result = std::size_t {};
+        for (const auto key : keys) {
+            result += enhanced_enum::hash<EnhancedEnum> {}(key);
+        }
+        return result;
+    });
+    auto set = std::unordered_set<EnhancedEnum, enhanced_enum::hash<EnhancedEnum>> {};
+    for (const auto e : EnhancedEnum::all()) {
+        if (static_cast<std::size_t>(e.get()) % 2 == 0) {
+            set.insert(e);
+        }
+    }
+    run(std::string {name} + "/unordered_set_contains", keys.size(), [&]() {
+        auto result = std::size_t {};
+        for (const auto key : keys) {
+            result += set.count(key);
+        }
+        return result;
+    });
+}
+
+}
+
+int main()
+{
+    benchmark<EnhancedInteger4>("integer/4");
+    benchmark<EnhancedInteger32>("integer/32");
+    benchmark<EnhancedInteger256>("integer/256");
+    benchmark<EnhancedString4>("string/4");
+    benchmark<EnhancedString32>("string/32");
+    benchmark<EnhancedString256>("string/256");
+    benchmark<EnhancedTuple4>("tuple/4");
+    benchmark<EnhancedTuple32>("tuple/32");
+    benchmark<EnhancedTuple256>("tuple/256");
+}
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""Compare the compile time of full and split generated headers
+
+Generates a codebase-like set of enums and translation units, and
+measures the time it takes to compile the translation units when every
+unit includes the full headers of the enums it uses, and when the
+units that only pass labels around include just the label headers
+(see --split-headers in the command line interface). Each unit uses a
+random subset of the enums, and a fraction of the units use the values
+of the enums. The results are printed as JSON.
+
+The enumecg package must be importable, e.g. by setting PYTHONPATH to
+the python/ directory of the repository. Only compilation is measured,
+the object files are not linked.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+
+from enumecg import generate, generate_label_enum
+
+_INCLUDE_DIR = os.path.join(os.path.dirname(__file__), "..", "include")
+
+
+def _make_enums(n_enums, n_members):
+    return [
+        {
+            "typename": f"Enum{i}",
+            "members": [
+                {"name": f"ENUMERATOR_{j}", "value": [j, f"value{j}"]}
+                for j in range(n_members)
+            ],
+        }
+        for i in range(n_enums)
+    ]
+
+
+def _make_units(enums, n_units, enums_per_unit, value_units):
+    rng = random.Random(0)
+    n_value_units = round(n_units * value_units)
+    return [
+        (rng.sample(enums, min(enums_per_unit, len(enums))), i < n_value_units)
+        for i in range(n_units)
+    ]
+
+
+def _make_unit_body(index, enums, uses_values):
+    lines = []
+    for enum in enums:
+        typename = enum["typename"]
+        lines += [
+            f"{typename}Label next_{typename}_{index}({typename}Label e)",
+            "{",
+            f"    return e == {typename}Label::ENUMERATOR_0 ?",
+            f"        {typename}Label::ENUMERATOR_1 : {typename}Label::ENUMERATOR_0;",
+            "}",
+        ]
+    if uses_values:
+        lines += [f"int use_values_{index}(int n)", "{", "    int sum = 0;"]
+        for enum in enums:
+            typename = enum["typename"]
+            lines.append(
+                f"    sum += std::get<0>(Enhanced{typename}::begin()[n].value());"
+            )
+        lines += ["    return sum;", "}"]
+    return "\n".join(lines) + "\n"
+
+
+def _write(path, content):
+    with open(path, "w") as out:
+        out.write(content)
+
+
+def _compile(compiler, flags, source, cwd):
+    start = time.perf_counter()
+    subprocess.run(
+        [compiler, *flags, "-c", source, "-o", os.devnull], check=True, cwd=cwd
+    )
+    return time.perf_counter() - start
+
+
+def _write_headers(enums, workdir):
+    for enum in enums:
+        typename = enum["typename"]
+        _write(
+            os.path.join(workdir, f"{typename}_label.hh"),
+            "#pragma once\n\n" + generate_label_enum(enum),
+        )
+        _write(
+            os.path.join(workdir, f"{typename}.hh"),
+            "#pragma once\n#include <enhanced_enum/enhanced_enum.hh>\n"
+            "#include <string_view>\n#include <tuple>\n"
+            f'#include "{typename}_label.hh"\n\n'
+            + generate(enum, label_enum=False),
+        )
+
+
+def _measure(compiler, units, workdir, split):
+    flags = ["-std=c++17", f"-I{_INCLUDE_DIR}"]
+    total = 0.0
+    for (index, (enums, uses_values)) in enumerate(units):
+        suffix = "_label.hh" if split and not uses_values else ".hh"
+        includes = "".join(f'#include "{enum["typename"]}{suffix}"\n' for enum in enums)
+        source = f"{'split' if split else 'full'}_unit{index}.cc"
+        _write(
+            os.path.join(workdir, source),
+            includes + _make_unit_body(index, enums, uses_values),
+        )
+        total += _compile(compiler, flags, source, workdir)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--compiler", default="g++", help="C++ compiler")
+    parser.add_argument("--enums", type=int, default=50, help="Number of enums")
+    parser.add_argument(
+        "--members", type=int, default=100, help="Number of members in each enum"
+    )
+    parser.add_argument(
+        "--units", type=int, default=40, help="Number of translation units"
+    )
+    parser.add_argument(
+        "--enums-per-unit",
+        type=int,
+        default=10,
+        help="Number of enums used by each translation unit",
+    )
+    parser.add_argument(
+        "--value-units",
+        type=float,
+        default=0.1,
+        help="Fraction of the translation units using the values of the enums",
+    )
+    args = parser.parse_args()
+
+    enums = _make_enums(args.enums, args.members)
+    units = _make_units(enums, args.units, args.enums_per_unit, args.value_units)
+    with tempfile.TemporaryDirectory() as workdir:
+        _write_headers(enums, workdir)
+        full = _measure(args.compiler, units, workdir, split=False)
+        split = _measure(args.compiler, units, workdir, split=True)
+    print(
+        json.dumps(
+            {
+                "compiler": args.compiler,
+                "enums": args.enums,
+                "members": args.members,
+                "units": args.units,
+                "enums_per_unit": args.enums_per_unit,
+                "value_units": args.value_units,
+                "full": full,
+                "split": split,
+                "speedup": full / split,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
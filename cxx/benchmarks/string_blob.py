@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""Compare enums storing string values in an array and in a string blob
+
+Generates an enum with the given number of string values, both with
+the values stored in an array of string views and in a single string
+blob (see --string-blob in the command line interface), and compiles a
+program measuring enum_base::value() and enum_base::from() for both.
+The size of the program and the average time per operation are printed
+as JSON.
+
+The enumecg package must be importable, e.g. by setting PYTHONPATH to
+the python/ directory of the repository.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+
+from enumecg import generate
+
+_INCLUDE_DIR = os.path.join(os.path.dirname(__file__), "..", "include")
+
+_PROGRAM = """
+#include <chrono>
+#include <cstddef>
+#include <iostream>
+#include <string_view>
+#include <vector>
+
+#include <enhanced_enum/enhanced_enum.hh>
+
+#include "symbol.hh"
+
+volatile std::size_t sink;
+
+template<typename Operation>
+double run(int rounds, std::size_t ops, Operation operation)
+{
+    auto result = std::size_t {};
+    const auto start = std::chrono::steady_clock::now();
+    for (auto round = 0; round < rounds; ++round) {
+        result += operation();
+    }
+    const auto stop = std::chrono::steady_clock::now();
+    sink = result;
+    return std::chrono::duration<double, std::nano>(stop - start).count() / (rounds * ops);
+}
+
+int main()
+{
+    auto keys = std::vector<EnhancedSymbol> {};
+    auto values = std::vector<std::string_view> {};
+    for (auto n = std::size_t {}; n < EnhancedSymbol::size(); n += 97) {
+        keys.push_back(EnhancedSymbol::begin()[n]);
+        values.push_back(keys.back().value());
+    }
+    const auto value_ns = run(100000, keys.size(), [&]() {
+        auto result = std::size_t {};
+        for (const auto key : keys) {
+            result += key.value().size();
+        }
+        return result;
+    });
+    const auto from_ns = run(10, values.size(), [&]() {
+        auto result = std::size_t {};
+        for (const auto value : values) {
+            result += static_cast<std::size_t>(EnhancedSymbol::from(value)->get());
+        }
+        return result;
+    });
+    std::cout << value_ns << " " << from_ns << "\\n";
+}
+"""
+
+
+def _make_enum(n_members, length):
+    return {
+        "typename": "Symbol",
+        "members": [
+            {"name": f"SYMBOL_{i}", "value": f"symbol{i}".ljust(length, "_")}
+            for i in range(n_members)
+        ],
+    }
+
+
+def _write(path, content):
+    with open(path, "w") as out:
+        out.write(content)
+
+
+def _measure(compiler, enum, workdir, string_blob):
+    name = "blob" if string_blob else "array"
+    source_dir = os.path.join(workdir, name)
+    os.mkdir(source_dir)
+    _write(
+        os.path.join(source_dir, "symbol.hh"),
+        "#pragma once\n#include <cstdint>\n#include <string_view>\n\n"
+        + generate(enum, string_blob=string_blob),
+    )
+    _write(os.path.join(source_dir, "main.cc"), _PROGRAM)
+    program = os.path.join(source_dir, "main")
+    subprocess.run(
+        [
+            compiler,
+            "-std=c++17",
+            "-O2",
+            f"-I{_INCLUDE_DIR}",
+            "main.cc",
+            "-o",
+            program,
+        ],
+        check=True,
+        cwd=source_dir,
+    )
+    subprocess.run(["strip", program], check=True)
+    output = subprocess.run([program], check=True, capture_output=True, text=True)
+    (value_ns, from_ns) = map(float, output.stdout.split())
+    return {
+        "binary_bytes": os.path.getsize(program),
+        "value_ns_per_op": value_ns,
+        "from_ns_per_op": from_ns,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--compiler", default="g++", help="C++ compiler")
+    parser.add_argument(
+        "--members", type=int, default=5000, help="Number of members in the enum"
+    )
+    parser.add_argument(
+        "--length", type=int, default=12, help="Minimum length of the string values"
+    )
+    args = parser.parse_args()
+
+    enum = _make_enum(args.members, args.length)
+    with tempfile.TemporaryDirectory() as workdir:
+        array = _measure(args.compiler, enum, workdir, string_blob=False)
+        blob = _measure(args.compiler, enum, workdir, string_blob=True)
+    print(
+        json.dumps(
+            {
+                "compiler": args.compiler,
+                "members": args.members,
+                "length": args.length,
+                "array": array,
+                "blob": blob,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
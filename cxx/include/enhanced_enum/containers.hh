@@ -0,0 +1,592 @@
+/** \file
+ *
+ * \brief Containers keyed by enhanced enumerations
+ */
+
+#ifndef ENHANCED_ENUM_CONTAINERS_HH_INCLUDED_
+#define ENHANCED_ENUM_CONTAINERS_HH_INCLUDED_
+
+#include "enhanced_enum.hh"
+
+#include <array>
+#include <cstddef>
+#include <cstdint>
+#include <initializer_list>
+#include <iterator>
+#include <stdexcept>
+#include <type_traits>
+#include <utility>
+
+ENHANCED_ENUM_EXPORT namespace enhanced_enum {
+namespace details {
+
+template<typename EnhancedEnum>
+constexpr std::size_t enum_index(EnhancedEnum e) noexcept
+{
+    return static_cast<std::size_t>(e.get());
+}
+
+template<typename EnhancedEnum>
+constexpr EnhancedEnum enum_from_index(std::size_t n) noexcept
+{
+    return EnhancedEnum {static_cast<typename EnhancedEnum::label_type>(n)};
+}
+
+template<typename EnhancedEnum, typename T>
+struct enum_map_iterator {
+    using difference_type = std::ptrdiff_t;
+    using value_type = std::pair<EnhancedEnum, std::remove_const_t<T>>;
+    using reference = std::pair<EnhancedEnum, T&>;
+    using iterator_category = std::input_iterator_tag;
+
+    struct pointer {
+        constexpr const reference* operator->() const noexcept { return &ref; }
+        reference ref;
+    };
+
+    enum_map_iterator() = default;
+
+    constexpr enum_map_iterator(T* values, std::size_t n) noexcept :
+        values {values},
+        n {n}
+    {}
+
+    template<
+        typename U,
+        typename = std::enable_if_t<
+            std::is_same_v<const U, T> && !std::is_same_v<U, T>>
+    >
+    constexpr enum_map_iterator(enum_map_iterator<EnhancedEnum, U> other) noexcept :
+        values {other.values},
+        n {other.n}
+    {}
+
+    constexpr reference operator*() const noexcept
+    {
+        return {enum_from_index<EnhancedEnum>(n), values[n]};
+    }
+
+    constexpr pointer operator->() const noexcept { return {**this}; }
+
+    constexpr enum_map_iterator& operator++() noexcept
+    {
+        ++n;
+        return *this;
+    }
+
+    constexpr enum_map_iterator operator++(int) noexcept
+    {
+        const auto tmp = *this;
+        ++*this;
+        return tmp;
+    }
+
+    constexpr enum_map_iterator& operator--() noexcept
+    {
+        --n;
+        return *this;
+    }
+
+    constexpr enum_map_iterator operator--(int) noexcept
+    {
+        const auto tmp = *this;
+        --*this;
+        return tmp;
+    }
+
+    friend constexpr bool operator==(
+        enum_map_iterator lhs, enum_map_iterator rhs) noexcept
+    {
+        return lhs.n == rhs.n;
+    }
+
+    friend constexpr bool operator!=(
+        enum_map_iterator lhs, enum_map_iterator rhs) noexcept
+    {
+        return !(lhs == rhs);
+    }
+
+private:
+    T* values;
+    std::size_t n;
+
+    template<typename, typename> friend struct enum_map_iterator;
+};
+
+template<typename Set>
+struct enum_set_iterator {
+    using difference_type = std::ptrdiff_t;
+    using value_type = typename Set::key_type;
+    using reference = value_type;
+    using pointer = const value_type*;
+    using iterator_category = std::forward_iterator_tag;
+
+    enum_set_iterator() = default;
+
+    constexpr enum_set_iterator(const Set* set, std::size_t n) noexcept :
+        set {set},
+        value {enum_from_index<value_type>(n)}
+    {}
+
+    constexpr reference operator*() const noexcept { return value; }
+    constexpr pointer operator->() const noexcept { return &value; }
+
+    constexpr enum_set_iterator& operator++() noexcept
+    {
+        value = enum_from_index<value_type>(
+            set->find_next(enum_index(value) + 1));
+        return *this;
+    }
+
+    constexpr enum_set_iterator operator++(int) noexcept
+    {
+        const auto tmp = *this;
+        ++*this;
+        return tmp;
+    }
+
+    friend constexpr bool operator==(
+        enum_set_iterator lhs, enum_set_iterator rhs) noexcept
+    {
+        return lhs.value == rhs.value;
+    }
+
+    friend constexpr bool operator!=(
+        enum_set_iterator lhs, enum_set_iterator rhs) noexcept
+    {
+        return !(lhs == rhs);
+    }
+
+private:
+    const Set* set;
+    value_type value;
+};
+
+}
+
+/** \defgroup containers Containers
+ *
+ * Containers using enumerators as keys.
+ *
+ * The enumerators of an enhanced enum are dense indices from zero to
+ * <tt>size() - 1</tt>. The containers in this group use the indices
+ * to store their elements in fixed size arrays, avoiding the
+ * allocations and hashing needed by the node based standard library
+ * containers. The elements are always iterated in the order the
+ * enumerators are declared in the enum.
+ *
+ * The key type of the containers is the enhanced enum, but since
+ * label enumerators convert implicitly to enhanced enumerators, both
+ * can be used for lookup.
+ *
+ * \{
+ */
+
+/** \brief Map from the enumerators of an enum to values
+ *
+ * \c enum_map is a total map: it always contains a value for each
+ * enumerator. The values are stored in a \c std::array indexed by
+ * the label enumerators.
+ *
+ * Dereferencing an iterator of \c enum_map yields a pair containing
+ * the enumerator and a reference to the mapped value:
+ *
+ * \code
+ * enhanced_enum::enum_map<EnhancedStatus, int> counts;
+ * for (auto [status, count] : counts) {
+ *     count = status.value().size();
+ * }
+ * \endcode
+ *
+ * \tparam Enum The enum used as key, either a label enum or an
+ * enhanced enum
+ * \tparam T The mapped type
+ */
+template<typename Enum, typename T>
+class enum_map {
+public:
+    using key_type = make_enhanced_t<Enum>;     ///< \brief The enhanced enum
+    using mapped_type = T;                      ///< \brief The mapped type
+    using value_type = std::pair<key_type, T>;  ///< \brief Enumerator and value
+    using size_type = std::size_t;              ///< \brief Size type
+    using difference_type = std::ptrdiff_t;     ///< \brief Difference type
+    using reference = std::pair<key_type, T&>;  ///< \brief Reference type
+    using const_reference = std::pair<key_type, const T&>; ///< \brief Const reference type
+
+    /// \brief Iterator type
+    using iterator = details::enum_map_iterator<key_type, T>;
+
+    /// \brief Const iterator type
+    using const_iterator = details::enum_map_iterator<key_type, const T>;
+
+    /** \brief Construct a map with value initialized values
+     */
+    constexpr enum_map() : values {} {}
+
+    /** \brief Construct a map with every enumerator mapped to \p value
+     */
+    explicit constexpr enum_map(const T& value) : values {}
+    {
+        fill(value);
+    }
+
+    /** \brief Construct a map from key-value pairs
+     *
+     * Enumerators not appearing in \p init are mapped to value
+     * initialized values. If an enumerator appears several times, the
+     * last value is used.
+     */
+    constexpr enum_map(std::initializer_list<value_type> init) : values {}
+    {
+        for (const auto& [key, value] : init) {
+            (*this)[key] = value;
+        }
+    }
+
+    /** \brief Return the number of enumerators
+     */
+    static constexpr size_type size() noexcept
+    {
+        return key_type::size();
+    }
+
+    /** \brief Return the maximum number of elements
+     *
+     * \return <tt>size()</tt>
+     */
+    static constexpr size_type max_size() noexcept
+    {
+        return size();
+    }
+
+    /** \brief Check if the map is empty
+     *
+     * \return \c true if and only if the enum has no enumerators
+     */
+    static constexpr bool empty() noexcept
+    {
+        return size() == 0;
+    }
+
+    /** \brief Return the value mapped to \p key
+     *
+     * \pre \p key is a valid enumerator
+     */
+    constexpr T& operator[](const key_type& key) noexcept
+    {
+        return values[details::enum_index(key)];
+    }
+
+    /** \brief Return the value mapped to \p key
+     *
+     * \pre \p key is a valid enumerator
+     */
+    constexpr const T& operator[](const key_type& key) const noexcept
+    {
+        return values[details::enum_index(key)];
+    }
+
+    /** \brief Return the value mapped to \p key
+     *
+     * \throw std::out_of_range if \p key is not a valid enumerator
+     */
+    constexpr T& at(const key_type& key)
+    {
+        return values.at(details::enum_index(key));
+    }
+
+    /** \brief Return the value mapped to \p key
+     *
+     * \throw std::out_of_range if \p key is not a valid enumerator
+     */
+    constexpr const T& at(const key_type& key) const
+    {
+        return values.at(details::enum_index(key));
+    }
+
+    /** \brief Return iterator to the first element
+     */
+    constexpr iterator begin() noexcept { return {values.data(), 0}; }
+
+    /** \brief Return iterator to the first element
+     */
+    constexpr const_iterator begin() const noexcept { return cbegin(); }
+
+    /** \brief Return iterator to the first element
+     */
+    constexpr const_iterator cbegin() const noexcept { return {values.data(), 0}; }
+
+    /** \brief Return iterator to one past the last element
+     */
+    constexpr iterator end() noexcept { return {values.data(), size()}; }
+
+    /** \brief Return iterator to one past the last element
+     */
+    constexpr const_iterator end() const noexcept { return cend(); }
+
+    /** \brief Return iterator to one past the last element
+     */
+    constexpr const_iterator cend() const noexcept { return {values.data(), size()}; }
+
+    /** \brief Map every enumerator to \p value
+     */
+    constexpr void fill(const T& value)
+    {
+        for (auto& v : values) {
+            v = value;
+        }
+    }
+
+    /** \brief Swap the contents of \c *this and \p other
+     */
+    void swap(enum_map& other) noexcept(std::is_nothrow_swappable_v<T>)
+    {
+        values.swap(other.values);
+    }
+
+    /** \brief Check if two maps are equal
+     *
+     * \return \c true if and only if each enumerator is mapped to
+     * equal values in \p lhs and \p rhs
+     */
+    friend constexpr bool operator==(const enum_map& lhs, const enum_map& rhs)
+    {
+        for (std::size_t n = 0; n < size(); ++n) {
+            if (!(lhs.values[n] == rhs.values[n])) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    /** \brief Check if two maps are not equal
+     */
+    friend constexpr bool operator!=(const enum_map& lhs, const enum_map& rhs)
+    {
+        return !(lhs == rhs);
+    }
+
+private:
+    std::array<T, key_type::size()> values;
+};
+
+/** \brief Set of the enumerators of an enum
+ *
+ * The set is stored as a bit array, with one bit for each
+ * enumerator. Inserting, erasing and looking up enumerators take
+ * constant time.
+ *
+ * \tparam Enum The enum whose enumerators are stored, either a label
+ * enum or an enhanced enum
+ */
+template<typename Enum>
+class enum_set {
+public:
+    using key_type = make_enhanced_t<Enum>;     ///< \brief The enhanced enum
+    using value_type = key_type;                ///< \brief The enhanced enum
+    using size_type = std::size_t;              ///< \brief Size type
+    using difference_type = std::ptrdiff_t;     ///< \brief Difference type
+    using reference = value_type;               ///< \brief Reference type
+    using const_reference = value_type;         ///< \brief Const reference type
+
+    /// \brief Iterator type
+    using iterator = details::enum_set_iterator<enum_set>;
+
+    /// \brief Const iterator type
+    using const_iterator = iterator;
+
+    /** \brief Construct an empty set
+     */
+    constexpr enum_set() noexcept : words {} {}
+
+    /** \brief Construct a set containing the enumerators in \p init
+     */
+    constexpr enum_set(std::initializer_list<key_type> init) noexcept : words {}
+    {
+        for (const auto key : init) {
+            insert(key);
+        }
+    }
+
+    /** \brief Return the number of enumerators in the set
+     */
+    constexpr size_type size() const noexcept
+    {
+        auto count = size_type {};
+        for (auto word : words) {
+            for (; word; word &= word - 1) {
+                ++count;
+            }
+        }
+        return count;
+    }
+
+    /** \brief Return the maximum number of elements
+     *
+     * \return The number of enumerators in the enum
+     */
+    static constexpr size_type max_size() noexcept
+    {
+        return key_type::size();
+    }
+
+    /** \brief Check if the set is empty
+     */
+    constexpr bool empty() const noexcept
+    {
+        for (const auto word : words) {
+            if (word) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    /** \brief Check if \p key is in the set
+     *
+     * \pre \p key is a valid enumerator
+     */
+    constexpr bool contains(const key_type& key) const noexcept
+    {
+        const auto n = details::enum_index(key);
+        return words[n / word_bits] & bit(n);
+    }
+
+    /** \brief Return the number of elements equal to \p key
+     *
+     * \pre \p key is a valid enumerator
+     *
+     * \return 1 if \p key is in the set, 0 otherwise
+     */
+    constexpr size_type count(const key_type& key) const noexcept
+    {
+        return contains(key) ? 1 : 0;
+    }
+
+    /** \brief Return iterator to \p key
+     *
+     * \pre \p key is a valid enumerator
+     *
+     * \return Iterator to \p key if it is in the set, end() otherwise
+     */
+    constexpr iterator find(const key_type& key) const noexcept
+    {
+        return contains(key) ? iterator {this, details::enum_index(key)} : end();
+    }
+
+    /** \brief Insert \p key to the set
+     *
+     * \pre \p key is a valid enumerator
+     *
+     * \return A pair containing iterator to \p key, and a bool
+     * indicating whether the insertion took place
+     */
+    constexpr std::pair<iterator, bool> insert(const key_type& key) noexcept
+    {
+        const auto n = details::enum_index(key);
+        const auto inserted = !contains(key);
+        words[n / word_bits] |= bit(n);
+        return {iterator {this, n}, inserted};
+    }
+
+    /** \brief Erase \p key from the set
+     *
+     * \pre \p key is a valid enumerator
+     *
+     * \return The number of erased elements (0 or 1)
+     */
+    constexpr size_type erase(const key_type& key) noexcept
+    {
+        const auto n = details::enum_index(key);
+        const auto erased = count(key);
+        words[n / word_bits] &= ~bit(n);
+        return erased;
+    }
+
+    /** \brief Remove all enumerators from the set
+     */
+    constexpr void clear() noexcept
+    {
+        for (auto& word : words) {
+            word = 0;
+        }
+    }
+
+    /** \brief Return iterator to the first element
+     */
+    constexpr iterator begin() const noexcept { return {this, find_next(0)}; }
+
+    /** \brief Return iterator to the first element
+     */
+    constexpr iterator cbegin() const noexcept { return begin(); }
+
+    /** \brief Return iterator to one past the last element
+     */
+    constexpr iterator end() const noexcept { return {this, max_size()}; }
+
+    /** \brief Return iterator to one past the last element
+     */
+    constexpr iterator cend() const noexcept { return end(); }
+
+    /** \brief Swap the contents of \c *this and \p other
+     */
+    void swap(enum_set& other) noexcept
+    {
+        words.swap(other.words);
+    }
+
+    /** \brief Check if two sets contain the same enumerators
+     */
+    friend constexpr bool operator==(const enum_set& lhs, const enum_set& rhs) noexcept
+    {
+        for (std::size_t n = 0; n < word_count; ++n) {
+            if (lhs.words[n] != rhs.words[n]) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    /** \brief Check if two sets contain different enumerators
+     */
+    friend constexpr bool operator!=(const enum_set& lhs, const enum_set& rhs) noexcept
+    {
+        return !(lhs == rhs);
+    }
+
+private:
+    using word_type = std::uint64_t;
+    static constexpr std::size_t word_bits = 64;
+    static constexpr std::size_t word_count = (key_type::size() + word_bits - 1) / word_bits;
+
+    static constexpr word_type bit(std::size_t n) noexcept
+    {
+        return word_type {1} << (n % word_bits);
+    }
+
+    constexpr std::size_t find_next(std::size_t n) const noexcept
+    {
+        while (n < max_size()) {
+            auto word = words[n / word_bits] >> (n % word_bits);
+            if (!word) {
+                n = (n / word_bits + 1) * word_bits;
+                continue;
+            }
+            for (; !(word & 1); word >>= 1) {
+                ++n;
+            }
+            return n;
+        }
+        return max_size();
+    }
+
+    std::array<word_type, word_count> words;
+
+    friend iterator;
+};
+
+/// \}
+
+}
+
+#endif // ENHANCED_ENUM_CONTAINERS_HH_INCLUDED_
@@ -0,0 +1,261 @@
+// Lookup of enumerators by value used by the bulk conversion functions
+//
+// The lookup strategy is selected at compile time from the values of the enum:
+// - Integral values forming a contiguous increasing sequence are converted to
+//   indices by subtracting the first value
+// - Integral values within a compact range are looked up from a table indexed
+//   by the offset from the smallest value
+// - Other values are searched linearly
+//
+// Arguments of other types than the value type are checked to be
+// representable in the value type before they are converted, so that a wider
+// argument is never narrowed to the value of an unrelated enumerator.
+
+#ifndef ENHANCED_ENUM_DETAILS_LOOKUP_HH_INCLUDED_
+#define ENHANCED_ENUM_DETAILS_LOOKUP_HH_INCLUDED_
+
+#include <array>
+#include <cstddef>
+#include <cstdint>
+#include <limits>
+#include <tuple>
+#include <type_traits>
+#include <utility>
+
+ENHANCED_ENUM_EXPORT namespace enhanced_enum {
+namespace details {
+
+enum class lookup_strategy {
+    offset,
+    table,
+    linear,
+};
+
+template<typename T>
+inline constexpr bool is_integral_value_v =
+    std::is_integral_v<T> && !std::is_same_v<T, bool>;
+
+template<typename T>
+struct is_tuple : std::false_type {};
+
+template<typename... Ts>
+struct is_tuple<std::tuple<Ts...>> : std::true_type {};
+
+template<typename T, typename U>
+constexpr bool is_representable(const U& value) noexcept;
+
+template<typename T, typename U, std::size_t... Is>
+constexpr bool elements_are_representable(
+    const U& value, std::index_sequence<Is...>) noexcept
+{
+    return (is_representable<std::tuple_element_t<Is, T>>(std::get<Is>(value)) && ...);
+}
+
+// Check that the floating point value is an integer within the range of the
+// integral type T, without converting values out of the range
+template<typename T, typename U>
+constexpr bool is_integer_in_range(U value) noexcept
+{
+    constexpr auto limit =
+        static_cast<U>(std::uintmax_t {1} << (std::numeric_limits<T>::digits - 1)) * U {2};
+    constexpr auto lower = std::is_signed_v<T> ? -limit : U {};
+    if (!(value >= lower && value < limit)) {
+        return false;
+    }
+    return static_cast<U>(static_cast<T>(value)) == value;
+}
+
+// Check that the floating point value is within the range of the floating
+// point type T, without converting values out of the range
+template<typename T, typename U>
+constexpr bool is_float_in_range(U value) noexcept
+{
+    if (value != value) {
+        return false;
+    }
+    if constexpr (std::numeric_limits<T>::max_exponent < std::numeric_limits<U>::max_exponent) {
+        const auto magnitude = value < U {} ? -value : value;
+        return magnitude <= static_cast<U>(std::numeric_limits<T>::max()) ||
+            magnitude == std::numeric_limits<U>::infinity();
+    } else {
+        return true;
+    }
+}
+
+// Check that converting value to T preserves it. Integers must survive the
+// round trip with their sign, and floating point numbers must survive the
+// round trip exactly. A value is never converted before it is known to be
+// within the range of T. Tuples are checked element by element, and other
+// conversions are assumed to preserve the value.
+template<typename T, typename U>
+constexpr bool is_representable(const U& value) noexcept
+{
+    if constexpr (std::is_same_v<T, U>) {
+        return true;
+    } else if constexpr (is_integral_value_v<T> && std::is_floating_point_v<U>) {
+        return is_integer_in_range<T>(value);
+    } else if constexpr (std::is_floating_point_v<T> && is_integral_value_v<U>) {
+        const auto converted = static_cast<T>(value);
+        return is_integer_in_range<U>(converted) && static_cast<U>(converted) == value;
+    } else if constexpr (is_integral_value_v<T> && is_integral_value_v<U>) {
+        const auto converted = static_cast<T>(value);
+        if (static_cast<U>(converted) != value) {
+            return false;
+        }
+        if constexpr (std::is_signed_v<T> && !std::is_signed_v<U>) {
+            return converted >= T {};
+        } else if constexpr (!std::is_signed_v<T> && std::is_signed_v<U>) {
+            return value >= U {};
+        } else {
+            return true;
+        }
+    } else if constexpr (std::is_floating_point_v<T> && std::is_floating_point_v<U>) {
+        return is_float_in_range<T>(value) && static_cast<U>(static_cast<T>(value)) == value;
+    } else if constexpr (is_tuple<T>::value && is_tuple<U>::value) {
+        if constexpr (std::tuple_size_v<T> == std::tuple_size_v<U>) {
+            return elements_are_representable<T>(
+                value, std::make_index_sequence<std::tuple_size_v<T>> {});
+        } else {
+            return true;
+        }
+    } else {
+        return true;
+    }
+}
+
+template<typename EnhancedEnum, bool = is_integral_value_v<typename EnhancedEnum::value_type>>
+struct value_lookup {
+    using value_type = typename EnhancedEnum::value_type;
+
+    static constexpr auto strategy = lookup_strategy::linear;
+
+    static constexpr std::size_t find(const value_type& value) noexcept
+    {
+        const auto& values = EnhancedEnum::values;
+        for (std::size_t n = 0; n < values.size(); ++n) {
+            if (values[n] == value) {
+                return n;
+            }
+        }
+        return values.size();
+    }
+};
+
+template<typename EnhancedEnum>
+constexpr auto min_value() noexcept
+{
+    auto ret = EnhancedEnum::values[0];
+    for (const auto v : EnhancedEnum::values) {
+        ret = v < ret ? v : ret;
+    }
+    return ret;
+}
+
+template<typename T>
+constexpr std::make_unsigned_t<T> value_offset(T value, T min) noexcept
+{
+    using offset_type = std::make_unsigned_t<T>;
+    return static_cast<offset_type>(
+        static_cast<offset_type>(value) - static_cast<offset_type>(min));
+}
+
+template<typename EnhancedEnum, typename T>
+constexpr std::size_t value_range(T min) noexcept
+{
+    auto ret = std::make_unsigned_t<T> {};
+    for (const auto v : EnhancedEnum::values) {
+        const auto offset = value_offset(v, min);
+        ret = offset > ret ? offset : ret;
+    }
+    // Saturate instead of wrapping around when the full range of a 64-bit
+    // type is used
+    return ret < SIZE_MAX ? static_cast<std::size_t>(ret) + 1 : SIZE_MAX;
+}
+
+template<typename EnhancedEnum, typename T>
+constexpr bool values_are_contiguous(T min) noexcept
+{
+    for (std::size_t n = 0; n < EnhancedEnum::values.size(); ++n) {
+        if (value_offset(EnhancedEnum::values[n], min) != n) {
+            return false;
+        }
+    }
+    return true;
+}
+
+template<typename EnhancedEnum, typename Index, std::size_t N, typename T>
+constexpr std::array<Index, N> make_lookup_table(T min) noexcept
+{
+    const auto size = EnhancedEnum::values.size();
+    auto table = std::array<Index, N> {};
+    for (auto& index : table) {
+        index = static_cast<Index>(size);
+    }
+    // Iterate backwards so that the first enumerator with a given value wins,
+    // like in enum_base::from()
+    if constexpr (N > 0) {
+        for (auto n = size; n > 0; --n) {
+            table[value_offset(EnhancedEnum::values[n - 1], min)] =
+                static_cast<Index>(n - 1);
+        }
+    }
+    return table;
+}
+
+template<typename EnhancedEnum>
+struct value_lookup<EnhancedEnum, true> {
+    using value_type = typename EnhancedEnum::value_type;
+    using index_type = std::conditional_t<
+        (EnhancedEnum::values.size() < UINT8_MAX), std::uint8_t,
+        std::conditional_t<
+            (EnhancedEnum::values.size() < UINT16_MAX), std::uint16_t, std::size_t>>;
+
+    static constexpr std::size_t size = EnhancedEnum::values.size();
+    static constexpr value_type min = min_value<EnhancedEnum>();
+    static constexpr std::size_t range = value_range<EnhancedEnum>(min);
+    static constexpr std::size_t table_size_limit = size < 64 ? 256 : 4 * size;
+
+    static constexpr auto strategy =
+        values_are_contiguous<EnhancedEnum>(min) ? lookup_strategy::offset :
+        range <= table_size_limit ? lookup_strategy::table :
+        lookup_strategy::linear;
+
+    static constexpr std::size_t table_size =
+        strategy == lookup_strategy::table ? range : 0;
+
+    static constexpr std::array<index_type, table_size> table =
+        make_lookup_table<EnhancedEnum, index_type, table_size>(min);
+
+    static constexpr std::size_t find(const value_type& value) noexcept
+    {
+        if constexpr (strategy == lookup_strategy::offset) {
+            const auto n = value_offset(value, min);
+            return n < size ? static_cast<std::size_t>(n) : size;
+        } else if constexpr (strategy == lookup_strategy::table) {
+            const auto n = value_offset(value, min);
+            return n < table_size ? static_cast<std::size_t>(table[n]) : size;
+        } else {
+            return value_lookup<EnhancedEnum, false>::find(value);
+        }
+    }
+};
+
+// Find the index of the enumerator whose value is equal to value, or the
+// size of the enum if there is none. A value not representable as the value
+// type is replaced by a default constructed value instead of being converted,
+// and the lookup doesn't branch on the range check, so that loops calling it
+// can still be vectorized.
+template<typename EnhancedEnum, typename T>
+constexpr std::size_t find_value(const T& value) noexcept
+{
+    using value_type = typename EnhancedEnum::value_type;
+    const auto representable = is_representable<value_type>(value);
+    const auto converted = representable ? static_cast<value_type>(value) : value_type {};
+    const auto n = value_lookup<EnhancedEnum>::find(converted);
+    return representable ? n : EnhancedEnum::size();
+}
+
+}
+}
+
+#endif // ENHANCED_ENUM_DETAILS_LOOKUP_HH_INCLUDED_
@@ -9,7 +9,7 @@
 
 #include <iterator>
 
-namespace enhanced_enum {
+ENHANCED_ENUM_EXPORT namespace enhanced_enum {
 namespace details {
 
 template<typename EnhancedEnum>
@@ -0,0 +1,35 @@
+/** \file
+ *
+ * \brief Module interface unit for the Enhanced Enum library
+ *
+ * Exports the contents of enhanced_enum.hh and containers.hh as the
+ * \c enhanced_enum C++20 module. Module interfaces generated by
+ * EnumECG import this module instead of including the header.
+ */
+
+module;
+
+#include <array>
+#include <cassert>
+#include <cstddef>
+#include <cstdint>
+#include <exception>
+#include <initializer_list>
+#include <iterator>
+#include <limits>
+#include <optional>
+#include <stdexcept>
+#include <string_view>
+#include <tuple>
+#include <type_traits>
+#include <utility>
+
+#if __has_include(<ranges>)
+#include <ranges>
+#endif
+
+export module enhanced_enum;
+
+#define ENHANCED_ENUM_EXPORT export
+#include "enhanced_enum.hh"
+#include "containers.hh"
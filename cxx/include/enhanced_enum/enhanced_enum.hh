@@ -13,15 +13,57 @@
 #define ENHANCED_ENUM_USE_NATIVE_RANGES 0
 #endif
 
+/** \brief Export specifier of the library namespace
+ *
+ * Empty when the header is included normally. The module interface
+ * unit \c enhanced_enum.cppm defines this as \c export before
+ * including the header, to export the whole library from the \c
+ * enhanced_enum module.
+ */
+#ifndef ENHANCED_ENUM_EXPORT
+#define ENHANCED_ENUM_EXPORT
+#endif
+
+/** \brief Always check the enumerator in enum_base::value()
+ *
+ * When nonzero, which is the default, enum_base::value() checks that
+ * the enumerator is valid before looking up its value, and trying to
+ * access the value of an invalid enumerator calls \c
+ * std::terminate. When defined as zero, the value is looked up
+ * without bounds checking, and the enumerator is only checked with
+ * \ref ENHANCED_ENUM_ASSERT. The macro must have the same definition
+ * in all translation units using the library.
+ */
+#ifndef ENHANCED_ENUM_CHECKED_VALUE_ACCESS
+#define ENHANCED_ENUM_CHECKED_VALUE_ACCESS 1
+#endif
+
+/** \brief Assertion used to check the preconditions of the library
+ *
+ * Defaults to \c assert from \c <cassert>, so the preconditions are
+ * checked in debug builds, and not checked when \c NDEBUG is
+ * defined. Can be defined before including the header to use a
+ * custom assertion.
+ */
+#ifndef ENHANCED_ENUM_ASSERT
+#include <cassert>
+#define ENHANCED_ENUM_ASSERT(condition) assert(condition)
+#endif
+
+#include "details/lookup.hh"
 #include "details/ranges.hh"
 
 #include <array>
+#include <cstddef>
+#include <exception>
+#include <iterator>
 #include <optional>
+#include <string_view>
 #include <type_traits>
 
 /** \brief The main namespace for the Enhanced Enum library
  */
-namespace enhanced_enum {
+ENHANCED_ENUM_EXPORT namespace enhanced_enum {
 
 /** \brief Base class for the enhanced enumeration types
  *
@@ -134,6 +176,33 @@ struct enum_base {
         return std::nullopt;
     }
 
+    /** \brief Return the enumerator with the given value
+     *
+     * Overload for arguments convertible to \ref value_type. The
+     * argument is only converted if the conversion preserves it, so
+     * that for example an \c int argument outside the range of an \c
+     * std::uint8_t value type doesn't match the enumerator whose value
+     * it would be narrowed to.
+     *
+     * \param value The value to search
+     *
+     * \return The first enumerator whose value is \p value, or empty
+     * if \p value is not representable as \ref value_type or no such
+     * enumerator exists
+     */
+    template<
+        typename T,
+        typename = std::enable_if_t<
+            !std::is_same_v<T, value_type> &&
+            std::is_convertible_v<const T&, value_type>>>
+    static constexpr std::optional<EnhancedEnum> from(const T& value) noexcept
+    {
+        if (!details::is_representable<value_type>(value)) {
+            return std::nullopt;
+        }
+        return from(static_cast<value_type>(value));
+    }
+
     /** \brief Default constructor
      *
      * Construct an enumerator with indeterminate value
@@ -184,12 +253,24 @@ struct enum_base {
 
     /** \brief Return the value of the enumerator
      *
-     * \throw std::out_of_range if \c *this is not a valid enumerator
+     * \pre \c *this is a valid enumerator. The precondition is always
+     * checked, or only with \ref ENHANCED_ENUM_ASSERT if \ref
+     * ENHANCED_ENUM_CHECKED_VALUE_ACCESS is zero.
+     *
+     * \return A const reference to the value, or a \c std::string_view
+     * if the values are stored in a \ref string_blob
      */
-    constexpr const value_type& value() const noexcept
+    constexpr decltype(auto) value() const noexcept
     {
         const auto n = static_cast<std::size_t>(label);
-        return EnhancedEnum::values.at(n);
+#if ENHANCED_ENUM_CHECKED_VALUE_ACCESS
+        if (n >= size()) {
+            std::terminate();
+        }
+#else
+        ENHANCED_ENUM_ASSERT(n < size());
+#endif
+        return EnhancedEnum::values[n];
     }
 
 private:
@@ -495,6 +576,506 @@ struct hash
     }
 };
 
+////////////////////////////////////////////////////////////////////////////////
+// String blobs
+////////////////////////////////////////////////////////////////////////////////
+
+#ifndef IS_DOXYGEN
+
+namespace details {
+
+// Not constexpr, so that calling it fails the constant initialization of a
+// string blob whose offsets don't match its characters
+inline void string_blob_offsets_do_not_match_characters() noexcept {}
+
+template<typename Offset>
+struct string_blob_iterator {
+    using difference_type = std::ptrdiff_t;
+    using value_type = std::string_view;
+    using reference = std::string_view;
+    using pointer = void;
+    using iterator_category = std::input_iterator_tag;
+
+    constexpr reference operator*() const noexcept
+    {
+        return {characters + offset[0], static_cast<std::size_t>(offset[1] - offset[0])};
+    }
+
+    constexpr string_blob_iterator& operator++() noexcept
+    {
+        ++offset;
+        return *this;
+    }
+
+    constexpr string_blob_iterator operator++(int) noexcept
+    {
+        auto ret = *this;
+        ++offset;
+        return ret;
+    }
+
+    friend constexpr bool operator==(
+        string_blob_iterator lhs, string_blob_iterator rhs) noexcept
+    {
+        return lhs.offset == rhs.offset;
+    }
+
+    friend constexpr bool operator!=(
+        string_blob_iterator lhs, string_blob_iterator rhs) noexcept
+    {
+        return !(lhs == rhs);
+    }
+
+    const char* characters;
+    const Offset* offset;
+};
+
+}
+
+#endif // IS_DOXYGEN
+
+/** \brief Array of strings stored in a single character array
+ *
+ * The strings are stored back to back in one string literal, and the
+ * string blob refers to it along with a table of offsets to the
+ * beginning of each string. Compared to an array of \c
+ * std::string_view objects, the strings need one pointer in total
+ * instead of a pointer and a size each, and they are close to each
+ * other in memory.
+ *
+ * String blobs are generated by EnumECG as the \c values of enhanced
+ * enums with string values, when requested. Like \c std::array, it
+ * has size() and the subscript operator, but the strings are returned
+ * by value as \c std::string_view objects.
+ *
+ * \tparam Offset The unsigned integer type of the offsets
+ * \tparam Size The number of strings
+ */
+template<typename Offset, std::size_t Size>
+class string_blob {
+public:
+    using value_type = std::string_view; ///< \brief The type of the strings
+    using size_type = std::size_t;       ///< \brief The type of the indices
+
+    /** \brief Construct a string blob
+     *
+     * The number of characters in \p characters, excluding the
+     * terminating null character, must be equal to the last offset.
+     * Otherwise the string blob can't be initialized at compile time.
+     *
+     * \param characters The string literal containing the strings
+     * \param offsets The offset of each string in \p characters,
+     * followed by the number of characters
+     */
+    template<std::size_t N>
+    constexpr string_blob(
+        const char (&characters)[N],
+        const std::array<Offset, Size + 1>& offsets) noexcept :
+        characters {characters},
+        offsets {offsets}
+    {
+        if (offsets[Size] + 1 != N) {
+            details::string_blob_offsets_do_not_match_characters();
+        }
+    }
+
+    /** \brief Return the number of strings
+     */
+    static constexpr size_type size() noexcept
+    {
+        return Size;
+    }
+
+    /** \brief Return the string at index \p n
+     *
+     * \pre <tt>n < size()</tt>
+     */
+    constexpr value_type operator[](size_type n) const noexcept
+    {
+        return *details::string_blob_iterator<Offset> {characters, &offsets[n]};
+    }
+
+    /** \brief Return an input iterator to the first string
+     */
+    constexpr auto begin() const noexcept
+    {
+        return details::string_blob_iterator<Offset> {characters, offsets.data()};
+    }
+
+    /** \brief Return an iterator to one past the last string
+     */
+    constexpr auto end() const noexcept
+    {
+        return details::string_blob_iterator<Offset> {characters, offsets.data() + Size};
+    }
+
+private:
+    const char* characters;
+    std::array<Offset, Size + 1> offsets;
+};
+
+////////////////////////////////////////////////////////////////////////////////
+// Flags
+////////////////////////////////////////////////////////////////////////////////
+
+#ifndef IS_DOXYGEN
+
+namespace details {
+
+template<typename Flags>
+struct flags_iterator {
+    using difference_type = std::ptrdiff_t;
+    using value_type = typename Flags::enum_type;
+    using reference = value_type;
+    using pointer = void;
+    using iterator_category = std::input_iterator_tag;
+
+    flags_iterator() = default;
+
+    constexpr flags_iterator(Flags flags, std::size_t n) noexcept :
+        flags {flags},
+        n {flags.find_next(n)}
+    {}
+
+    constexpr reference operator*() const noexcept
+    {
+        return value_type {static_cast<typename value_type::label_type>(n)};
+    }
+
+    constexpr flags_iterator& operator++() noexcept
+    {
+        n = flags.find_next(n + 1);
+        return *this;
+    }
+
+    constexpr flags_iterator operator++(int) noexcept
+    {
+        const auto tmp = *this;
+        ++*this;
+        return tmp;
+    }
+
+    friend constexpr bool operator==(flags_iterator lhs, flags_iterator rhs) noexcept
+    {
+        return lhs.n == rhs.n;
+    }
+
+    friend constexpr bool operator!=(flags_iterator lhs, flags_iterator rhs) noexcept
+    {
+        return !(lhs == rhs);
+    }
+
+private:
+    Flags flags;
+    std::size_t n;
+};
+
+}
+
+#endif // IS_DOXYGEN
+
+/** \brief Set of enumerators of an enhanced enum with bit flag values
+ *
+ * The values of the enhanced enum must be distinct powers of two. A
+ * flags object stores the bitwise or of the values of the enumerators
+ * it contains, so it has the size of the value type, and the set
+ * operations are single bitwise operations.
+ *
+ * EnumECG generates an alias for the flags type of enums defined as
+ * flags, along with the \c |, \c &, \c ^ and \c ~ operators
+ * accepting any combination of flags, enhanced enumerators and label
+ * enumerators. The compound assignment operators are members of this
+ * class.
+ *
+ * Iterating over the flags yields the enumerators it contains, in the
+ * order they are declared.
+ *
+ * \tparam EnhancedEnum The enhanced enum type
+ */
+template<typename EnhancedEnum>
+class flags {
+    static_assert( is_enhanced_enum_v<EnhancedEnum> );
+    static_assert( details::is_integral_value_v<typename EnhancedEnum::value_type> );
+
+public:
+    using enum_type = EnhancedEnum; ///< \brief The enhanced enum type
+    using label_type = typename EnhancedEnum::label_type; ///< \brief The label enum type
+
+    /// \brief The unsigned integer type of the bitmask
+    using mask_type = std::make_unsigned_t<typename EnhancedEnum::value_type>;
+
+    /// \brief Iterator type
+    using iterator = details::flags_iterator<flags>;
+
+    /** \brief Construct empty flags
+     */
+    constexpr flags() noexcept = default;
+
+    /** \brief Construct flags containing \p e
+     */
+    constexpr flags(enum_type e) noexcept : bits {static_cast<mask_type>(e.value())} {}
+
+    /** \brief Construct flags containing \p label
+     */
+    constexpr flags(label_type label) noexcept : flags {enum_type {label}} {}
+
+    /** \brief Return flags containing all enumerators
+     */
+    static constexpr flags all() noexcept
+    {
+        auto ret = flags {};
+        for (const auto e : enum_type::all()) {
+            ret |= e;
+        }
+        return ret;
+    }
+
+    /** \brief Return the flags with the given bitmask
+     *
+     * \param mask The bitmask
+     *
+     * \return The flags whose mask() is \p mask, or empty if \p mask
+     * has bits not corresponding to any enumerator
+     */
+    static constexpr std::optional<flags> from_mask(mask_type mask) noexcept
+    {
+        if (mask & ~all().bits) {
+            return std::nullopt;
+        }
+        auto ret = flags {};
+        ret.bits = mask;
+        return ret;
+    }
+
+    /** \brief Return the bitmask
+     */
+    constexpr mask_type mask() const noexcept
+    {
+        return bits;
+    }
+
+    /** \brief Check if the flags are empty
+     */
+    constexpr bool empty() const noexcept
+    {
+        return !bits;
+    }
+
+    /** \brief Check if the flags are not empty
+     */
+    explicit constexpr operator bool() const noexcept
+    {
+        return !empty();
+    }
+
+    /** \brief Return the number of enumerators contained in the flags
+     */
+    constexpr std::size_t size() const noexcept
+    {
+        auto ret = std::size_t {};
+        for (auto word = bits; word; word &= word - 1) {
+            ++ret;
+        }
+        return ret;
+    }
+
+    /** \brief Check if all enumerators in \p other are contained in \c *this
+     */
+    constexpr bool contains(flags other) const noexcept
+    {
+        return (bits & other.bits) == other.bits;
+    }
+
+    /** \brief Check if any enumerator in \p other is contained in \c *this
+     */
+    constexpr bool intersects(flags other) const noexcept
+    {
+        return bits & other.bits;
+    }
+
+    /** \brief Return iterator to the first enumerator
+     */
+    constexpr iterator begin() const noexcept { return {*this, 0}; }
+
+    /** \brief Return iterator to one past the last enumerator
+     */
+    constexpr iterator end() const noexcept { return {*this, enum_type::size()}; }
+
+    /** \brief Add the enumerators in \p other
+     */
+    constexpr flags& operator|=(flags other) noexcept
+    {
+        bits |= other.bits;
+        return *this;
+    }
+
+    /** \brief Keep only the enumerators also in \p other
+     */
+    constexpr flags& operator&=(flags other) noexcept
+    {
+        bits &= other.bits;
+        return *this;
+    }
+
+    /** \brief Toggle the enumerators in \p other
+     */
+    constexpr flags& operator^=(flags other) noexcept
+    {
+        bits ^= other.bits;
+        return *this;
+    }
+
+    /** \brief Check if two flags contain the same enumerators
+     */
+    friend constexpr bool operator==(flags lhs, flags rhs) noexcept
+    {
+        return lhs.bits == rhs.bits;
+    }
+
+    /** \brief Check if two flags contain different enumerators
+     */
+    friend constexpr bool operator!=(flags lhs, flags rhs) noexcept
+    {
+        return !(lhs == rhs);
+    }
+
+private:
+    constexpr std::size_t find_next(std::size_t n) const noexcept
+    {
+        for (; n < enum_type::size(); ++n) {
+            if (bits & static_cast<mask_type>(enum_type::values[n])) {
+                break;
+            }
+        }
+        return n;
+    }
+
+    mask_type bits {};
+
+    friend iterator;
+};
+
+////////////////////////////////////////////////////////////////////////////////
+// Bulk conversions
+////////////////////////////////////////////////////////////////////////////////
+
+/** \defgroup bulkconversions Bulk conversions
+ *
+ * Functions for converting sequences of values to enumerators.
+ *
+ * Unlike enum_base::from(), which searches the enumerators linearly
+ * and wraps each result in \c std::optional, the bulk conversion
+ * functions select the lookup strategy at compile time based on the
+ * values of the enumeration. If the value type is integral, and the
+ * values are consecutive integers, the enumerator is computed from
+ * the offset of the value. If the values are within a compact range,
+ * the enumerator is looked up from a table. Otherwise the enumerators
+ * are searched linearly.
+ *
+ * \{
+ */
+
+/** \brief The result of from_values()
+ */
+template<typename InputIt, typename OutputIt>
+struct from_values_result {
+    /** \brief Iterator to the first value that could not be converted,
+     * or the end of the input range if all values were converted
+     */
+    InputIt in;
+
+    /** \brief Iterator one past the last enumerator written
+     */
+    OutputIt out;
+};
+
+/** \brief Convert values to enumerators until the first failure
+ *
+ * Writes the enumerator whose value is equal to each value in the
+ * range <tt>[first, last)</tt> to the range beginning at \p d_first,
+ * until a value that doesn't belong to any enumerator is encountered.
+ * If several enumerators have the same value, the first of them is
+ * written, like in enum_base::from().
+ *
+ * \code
+ * const auto result = from_values<StatusLabel>(
+ *     values.begin(), values.end(), labels.begin());
+ * if (result.in != values.end()) {
+ *     // handle the invalid value at index result.in - values.begin()
+ * }
+ * \endcode
+ *
+ * \tparam Enum The type of the written enumerators, either an enhanced
+ * enum or a label enum
+ *
+ * \param first, last The range of values, convertible to the value
+ * type of \p Enum. Values not representable as the value type don't
+ * belong to any enumerator.
+ * \param d_first The beginning of the output range
+ *
+ * \return A \ref from_values_result containing the iterators to the
+ * first value not converted, and one past the last enumerator written
+ */
+template<typename Enum, typename InputIt, typename OutputIt>
+constexpr from_values_result<InputIt, OutputIt> from_values(
+    InputIt first, InputIt last, OutputIt d_first)
+{
+    using EnhancedEnum = make_enhanced_t<Enum>;
+    using label_type = typename EnhancedEnum::label_type;
+    for (; first != last; ++first, ++d_first) {
+        const auto n = details::find_value<EnhancedEnum>(*first);
+        if (n == EnhancedEnum::size()) {
+            break;
+        }
+        *d_first = static_cast<Enum>(static_cast<label_type>(n));
+    }
+    return {first, d_first};
+}
+
+/** \brief Convert values to enumerators, marking the failures in a mask
+ *
+ * Writes an enumerator to the range beginning at \p d_first, and a
+ * flag to the range beginning at \p mask_first, for each value in the
+ * range <tt>[first, last)</tt>. If the value belongs to an
+ * enumerator, the enumerator and \c true are written. Otherwise \p
+ * fallback and \c false are written. The loop doesn't branch on the
+ * result of the lookup, which allows the compiler to vectorize it
+ * when the enumerators are computed from the values.
+ *
+ * \tparam Enum The type of the written enumerators, either an enhanced
+ * enum or a label enum
+ *
+ * \param first, last The range of values, convertible to the value
+ * type of \p Enum. Values not representable as the value type don't
+ * belong to any enumerator.
+ * \param d_first The beginning of the output range of enumerators
+ * \param mask_first The beginning of the output range of flags
+ * \param fallback The enumerator written for the values that could not
+ * be converted. Defaults to the first enumerator.
+ *
+ * \return The number of values that could not be converted
+ */
+template<typename Enum, typename InputIt, typename OutputIt, typename MaskIt>
+constexpr std::size_t from_values_masked(
+    InputIt first, InputIt last, OutputIt d_first, MaskIt mask_first,
+    Enum fallback = Enum {})
+{
+    using EnhancedEnum = make_enhanced_t<Enum>;
+    using label_type = typename EnhancedEnum::label_type;
+    const auto fallback_index = static_cast<std::size_t>(ensure_enhanced(fallback).get());
+    auto failures = std::size_t {};
+    for (; first != last; ++first, ++d_first, ++mask_first) {
+        const auto n = details::find_value<EnhancedEnum>(*first);
+        const auto found = n != EnhancedEnum::size();
+        *d_first = static_cast<Enum>(static_cast<label_type>(found ? n : fallback_index));
+        *mask_first = found;
+        failures += !found;
+    }
+    return failures;
+}
+
+/// \}
+
 }
 
 #endif // ENHANCED_ENUM_HH_INCLUDED_
@@ -9,10 +9,78 @@ from tests.conftest import STATUS_DEFINITION_DICT, NESTED_ENUM_DEFINITION_DICT
 from enumecg import generate
 
 
+_LARGE_ENUM_DEFINITION_DICT = {
+    "typename": "LargeEnum",
+    "members": [{"name": f"ENUMERATOR_{n}", "value": n} for n in range(100)],
+}
+
+
+_NARROW_ENUM_DEFINITION_DICT = {
+    "typename": "NarrowEnum",
+    "members": [
+        {"name": "SMALL", "value": (0, -1, 0.5)},
+        {"name": "LARGE", "value": (255, 127, 2.0)},
+    ],
+}
+
+
+_SEGMENT_DEFINITION_DICT = {
+    "typename": "Segment",
+    "members": [
+        {"name": "DIAGONAL", "value": ((0, 0), (1, 1))},
+        {"name": "HORIZONTAL", "value": ((0, 0), (1, 0))},
+    ],
+}
+
+
+_WIRE_CODE_DEFINITION_DICT = {
+    "typename": "WireCode",
+    "members": [
+        {"name": "PING", "value": 10},
+        {"name": "PONG", "value": -3},
+        {"name": "DATA", "value": 42},
+        {"name": "ALIAS", "value": 10},
+    ],
+}
+
+
+_SPARSE_CODE_DEFINITION_DICT = {
+    "typename": "SparseCode",
+    "members": [
+        {"name": "SMALL", "value": 0},
+        {"name": "HUGE", "value": 1000000},
+    ],
+}
+
+
+_COLOR_DEFINITION_DICT = {
+    "typename": "Color",
+    "members": [
+        {"name": "RED", "value": "red"},
+        {"name": "NONE", "value": ""},
+        {"name": "ESCAPED", "value": "it's\tescaped"},
+        {"name": "CYAN", "value": "cyan"},
+    ],
+}
+
+
+_PERMISSION_DEFINITION_DICT = {
+    "typename": "Permission",
+    "flags": True,
+    "members": [
+        {"name": "READ"},
+        {"name": "WRITE"},
+        {"name": "EXECUTE", "value": 16},
+        {"name": "DELETE"},
+    ],
+}
+
+
 _STATUS_HH_TEMPLATE = jinja2.Template(
     """
 #include <enhanced_enum/enhanced_enum.hh>
 
+#include <cstdint>
 #include <string_view>
 
 namespace testapp {
@@ -25,19 +93,71 @@ namespace nested {
 
 {{ nested_enum_definitions }}
 
+}
+
+namespace large {
+
+{{ large_enum_definitions }}
+
+}
+
+namespace narrow {
+
+{{ narrow_enum_definitions }}
+
+}
+
+namespace arrays {
+
+{{ segment_definitions }}
+
+}
+
+namespace wire {
+
+{{ wire_code_definitions }}
+
+{{ sparse_code_definitions }}
+
+}
+
+namespace blob {
+
+{{ color_definitions }}
+
+}
+
+namespace flags {
+
+{{ permission_definitions }}
+
 }
 """
 )
 
 
 def main(filename):
-    status_definitions = generate(STATUS_DEFINITION_DICT)
+    status_definitions = generate(STATUS_DEFINITION_DICT, names=True)
     nested_enum_definitions = generate(
         NESTED_ENUM_DEFINITION_DICT, primary_type="enhanced", documentation="doxygen",
     )
+    large_enum_definitions = generate(_LARGE_ENUM_DEFINITION_DICT, names=True)
+    narrow_enum_definitions = generate(_NARROW_ENUM_DEFINITION_DICT, narrow_types=True)
+    segment_definitions = generate(_SEGMENT_DEFINITION_DICT, array_sequences=True)
+    wire_code_definitions = generate(_WIRE_CODE_DEFINITION_DICT, narrow_types=True)
+    sparse_code_definitions = generate(_SPARSE_CODE_DEFINITION_DICT)
+    color_definitions = generate(_COLOR_DEFINITION_DICT, names=True, string_blob=True)
+    permission_definitions = generate(_PERMISSION_DEFINITION_DICT, narrow_types=True)
     status_hh = _STATUS_HH_TEMPLATE.render(
         status_definitions=status_definitions,
         nested_enum_definitions=nested_enum_definitions,
+        large_enum_definitions=large_enum_definitions,
+        narrow_enum_definitions=narrow_enum_definitions,
+        segment_definitions=segment_definitions,
+        wire_code_definitions=wire_code_definitions,
+        sparse_code_definitions=sparse_code_definitions,
+        color_definitions=color_definitions,
+        permission_definitions=permission_definitions,
     )
     with open(filename, "w") as out:
         print(status_hh, file=out)
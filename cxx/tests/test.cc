@@ -1,11 +1,20 @@
 #include <algorithm>
 #include <array>
+#include <cstdint>
+#include <iterator>
+#include <limits>
 #include <map>
 #include <ostream>
+#include <stdexcept>
 #include <tuple>
+#include <unordered_map>
+#include <utility>
+#include <vector>
 
 #include <gtest/gtest.h>
 
+#include <enhanced_enum/containers.hh>
+
 #include "status.hh"
 
 using testapp::StatusLabel;
@@ -120,6 +129,14 @@ static_assert( *(EnhancedStatus::end() - 2) == Statuses::WAITING_FOR_INPUT );
 static_assert( Statuses::begin() == EnhancedStatus::begin() );
 static_assert( Statuses::end() == EnhancedStatus::end() );
 
+// Names
+
+static_assert( EnhancedStatus::names.size() == 3u );
+static_assert( Statuses::BUSY.name() == "BUSY" );
+static_assert( EnhancedStatus::from_name("BUSY") == Statuses::BUSY );
+static_assert( !EnhancedStatus::from_name("BUSZ") );
+static_assert( !EnhancedStatus::from_name("") );
+
 // Test nested enum type
 
 static_assert(
@@ -134,6 +151,114 @@ static_assert(
     std::tuple { 0, std::tuple { "string", true } }
 );
 
+// Test narrow value types
+
+static_assert(
+    std::is_same_v<
+       narrow::EnhancedNarrowEnum::value_type,
+       std::tuple<std::uint8_t, std::int8_t, float>
+    >
+);
+
+static_assert(
+    narrow::NarrowEnums::LARGE_VALUE ==
+    std::tuple<std::uint8_t, std::int8_t, float> { 255, 127, 2.0f }
+);
+
+static_assert( narrow::EnhancedNarrowEnum::from(std::tuple { 0, -1, 0.5 }) == narrow::NarrowEnums::SMALL );
+static_assert( !narrow::EnhancedNarrowEnum::from(std::tuple { 256, -1, 0.5 }) );
+static_assert( !narrow::EnhancedNarrowEnum::from(std::tuple { 255, 127, 2.0000001 }) );
+static_assert( wire::EnhancedWireCode::from(10) == wire::WireCodes::PING );
+static_assert( !wire::EnhancedWireCode::from(266) );
+static_assert( !wire::EnhancedWireCode::from(10u + UINT32_MAX / 2 + 1) );
+static_assert( wire::EnhancedWireCode::from(10.0) == wire::WireCodes::PING );
+static_assert( !wire::EnhancedWireCode::from(10.5) );
+static_assert( !wire::EnhancedWireCode::from(1e300) );
+static_assert( !narrow::EnhancedNarrowEnum::from(std::tuple { 0, -1, 1e300 }) );
+static_assert( narrow::EnhancedNarrowEnum::from(std::tuple { 0.0, -1, 0.5 }) == narrow::NarrowEnums::SMALL );
+
+static_assert( enhanced_enum::details::is_representable<float>(16777216) );
+static_assert( !enhanced_enum::details::is_representable<float>(16777217) );
+static_assert( !enhanced_enum::details::is_representable<std::int32_t>(INT32_MAX + 1.0) );
+static_assert( enhanced_enum::details::is_representable<std::int32_t>(INT32_MIN * 1.0) );
+static_assert( !enhanced_enum::details::is_representable<std::uint64_t>(-1.0) );
+static_assert( !enhanced_enum::details::is_representable<std::uint64_t>(18446744073709551616.0) );
+static_assert( enhanced_enum::details::is_representable<float>(-std::numeric_limits<double>::infinity()) );
+static_assert( !enhanced_enum::details::is_representable<float>(std::numeric_limits<double>::quiet_NaN()) );
+
+// Test array value types
+
+static_assert(
+    std::is_same_v<
+       arrays::EnhancedSegment::value_type,
+       std::array<std::array<long, 2>, 2>
+    >
+);
+
+static_assert( arrays::Segments::DIAGONAL_VALUE[1][0] == 1 );
+static_assert( arrays::Segments::HORIZONTAL_VALUE[1][1] == 0 );
+
+// Bulk conversions
+
+static_assert(
+    enhanced_enum::details::value_lookup<large::EnhancedLargeEnum>::strategy ==
+    enhanced_enum::details::lookup_strategy::offset
+);
+static_assert(
+    enhanced_enum::details::value_lookup<wire::EnhancedWireCode>::strategy ==
+    enhanced_enum::details::lookup_strategy::table
+);
+static_assert(
+    enhanced_enum::details::value_lookup<wire::EnhancedSparseCode>::strategy ==
+    enhanced_enum::details::lookup_strategy::linear
+);
+static_assert(
+    enhanced_enum::details::value_lookup<EnhancedStatus>::strategy ==
+    enhanced_enum::details::lookup_strategy::linear
+);
+
+constexpr bool fromValuesInConstantExpression()
+{
+    const auto values = std::array<std::int8_t, 3> {42, -3, 10};
+    auto labels = std::array<wire::WireCodeLabel, 3> {};
+    const auto result = enhanced_enum::from_values<wire::WireCodeLabel>(
+        values.begin(), values.end(), labels.begin());
+    return result.in == values.end() && result.out == labels.end() &&
+        labels[0] == wire::WireCodeLabel::DATA &&
+        labels[1] == wire::WireCodeLabel::PONG &&
+        labels[2] == wire::WireCodeLabel::PING;
+}
+
+static_assert( fromValuesInConstantExpression() );
+
+constexpr bool fromValuesShouldNotNarrowWiderValues()
+{
+    const auto values = std::array<int, 2> {42, 266};
+    auto labels = std::array<wire::WireCodeLabel, 2> {};
+    const auto result = enhanced_enum::from_values<wire::WireCodeLabel>(
+        values.begin(), values.end(), labels.begin());
+    return result.in == values.begin() + 1 &&
+        labels[0] == wire::WireCodeLabel::DATA;
+}
+
+static_assert( fromValuesShouldNotNarrowWiderValues() );
+
+constexpr bool fromValuesShouldNotConvertFloatingValuesOutOfRange()
+{
+    const auto values = std::array<double, 4> {42.0, 1e300, 10.5, -3.0};
+    auto labels = std::array<wire::WireCodeLabel, 4> {};
+    auto mask = std::array<bool, 4> {};
+    const auto failures = enhanced_enum::from_values_masked(
+        values.begin(), values.end(), labels.begin(), mask.begin(),
+        wire::WireCodeLabel::PING);
+    return failures == 2 && mask[0] && !mask[1] && !mask[2] && mask[3] &&
+        labels[0] == wire::WireCodeLabel::DATA &&
+        labels[1] == wire::WireCodeLabel::PING &&
+        labels[3] == wire::WireCodeLabel::PONG;
+}
+
+static_assert( fromValuesShouldNotConvertFloatingValuesOutOfRange() );
+
 // Ranges and concepts
 
 #if __cpp_lib_ranges
@@ -160,6 +285,30 @@ static_assert(
 
 #endif // __cpp_lib_ranges
 
+// Containers
+
+using StatusMap = enhanced_enum::enum_map<EnhancedStatus, int>;
+using StatusSet = enhanced_enum::enum_set<EnhancedStatus>;
+
+static_assert( std::is_same_v<enhanced_enum::enum_map<StatusLabel, int>::key_type, EnhancedStatus> );
+static_assert( std::is_same_v<enhanced_enum::enum_set<StatusLabel>::key_type, EnhancedStatus> );
+static_assert( StatusMap::size() == 3u );
+static_assert( !StatusMap::empty() );
+static_assert( StatusSet::max_size() == 3u );
+static_assert( StatusMap {}[Statuses::BUSY] == 0 );
+static_assert( StatusMap {123}[Statuses::BUSY] == 123 );
+static_assert( StatusMap { {Statuses::BUSY, 123} }[StatusLabel::BUSY] == 123 );
+static_assert( StatusMap { {Statuses::BUSY, 123} } == StatusMap { {Statuses::BUSY, 123} } );
+static_assert( StatusMap { {Statuses::BUSY, 123} } != StatusMap {} );
+static_assert( (*StatusMap {}.begin()).first == Statuses::INITIALIZING );
+static_assert( StatusSet {}.empty() );
+static_assert( StatusSet { Statuses::BUSY }.size() == 1u );
+static_assert( StatusSet { Statuses::BUSY }.contains(StatusLabel::BUSY) );
+static_assert( !StatusSet { Statuses::BUSY }.contains(StatusLabel::INITIALIZING) );
+static_assert( *StatusSet { Statuses::BUSY, Statuses::WAITING_FOR_INPUT }.begin() == Statuses::WAITING_FOR_INPUT );
+static_assert( StatusSet { Statuses::BUSY } == StatusSet { Statuses::BUSY, Statuses::BUSY } );
+static_assert( StatusSet { Statuses::BUSY } != StatusSet {} );
+
 // Non-compile time tests start here:
 
 class EnhancedEnumTest : public testing::TestWithParam<EnumBundle> {};
@@ -178,12 +327,28 @@ TEST_P(EnhancedEnumTest, testValue)
     EXPECT_EQ(bundle.enhanced.value(), bundle.value);
 }
 
+// Accessing the value of an invalid enumerator is only checked in debug builds,
+// unless the checked value access is enabled
+#if ENHANCED_ENUM_CHECKED_VALUE_ACCESS || !defined(NDEBUG)
+TEST_F(EnhancedEnumTest, testValueOfInvalidEnumerator)
+{
+    const auto invalid = EnhancedStatus {static_cast<StatusLabel>(3)};
+    EXPECT_DEATH(static_cast<void>(invalid.value()), "");
+}
+#endif
+
 TEST_P(EnhancedEnumTest, testConstructFromValue)
 {
     const auto bundle = GetParam();
     EXPECT_EQ(EnhancedStatus::from(bundle.value), bundle.enhanced);
 }
 
+TEST_P(EnhancedEnumTest, testName)
+{
+    const auto bundle = GetParam();
+    EXPECT_EQ(EnhancedStatus::from_name(bundle.enhanced.name()), bundle.enhanced);
+}
+
 // Ranges and iterators
 
 TEST_F(EnhancedEnumTest, testAll)
@@ -238,6 +403,30 @@ TEST_F(EnhancedEnumTest, testIteratorRandomAccessReversal)
     EXPECT_EQ(iter[-1], Statuses::BUSY);
 }
 
+TEST_F(EnhancedEnumTest, testNamesRoundTrip)
+{
+    using large::EnhancedLargeEnum;
+    for (const auto e : EnhancedLargeEnum::all()) {
+        EXPECT_EQ(EnhancedLargeEnum::from_name(e.name()), e);
+    }
+}
+
+TEST_F(EnhancedEnumTest, testFromNameWithInvalidName)
+{
+    EXPECT_FALSE(EnhancedStatus::from_name("WAITING_FOR_OUTPUT"));
+    EXPECT_FALSE(EnhancedStatus::from_name("busy"));
+    EXPECT_FALSE(EnhancedStatus::from_name("BUSY "));
+}
+
+TEST_F(EnhancedEnumTest, testFromArrayValue)
+{
+    using arrays::EnhancedSegment;
+    namespace Segments = arrays::Segments;
+    const auto value = EnhancedSegment::value_type {{ {{ 0, 0 }}, {{ 1, 0 }} }};
+    EXPECT_EQ(EnhancedSegment::from(value), Segments::HORIZONTAL);
+    EXPECT_FALSE(EnhancedSegment::from(EnhancedSegment::value_type {}));
+}
+
 TEST_F(EnhancedEnumTest, testMap)
 {
     std::map<EnhancedStatus, StatusLabel> map;
@@ -271,6 +460,303 @@ TEST_F(EnhancedEnumTest, testUnorderedMap)
     }
 }
 
+TEST_F(EnhancedEnumTest, testEnumMap)
+{
+    StatusMap map;
+    for (const auto e : EnhancedStatus::all()) {
+        map[e] = static_cast<int>(e.get());
+    }
+    for (const auto e : EnhancedStatus::all()) {
+        EXPECT_EQ(map.at(e), static_cast<int>(e.get()));
+    }
+}
+
+TEST_F(EnhancedEnumTest, testEnumMapAtInvalidEnumerator)
+{
+    StatusMap map;
+    EXPECT_THROW(map.at(static_cast<StatusLabel>(3)), std::out_of_range);
+}
+
+TEST_F(EnhancedEnumTest, testEnumMapIteration)
+{
+    StatusMap map;
+    for (auto [e, value] : map) {
+        value = static_cast<int>(e.get()) + 1;
+    }
+    const auto& const_map = map;
+    auto iter = const_map.begin();
+    EXPECT_EQ(iter->first, Statuses::INITIALIZING);
+    EXPECT_EQ(iter->second, 1);
+    ++iter;
+    EXPECT_EQ((*iter).first, Statuses::WAITING_FOR_INPUT);
+    EXPECT_EQ((*iter).second, 2);
+    ++iter;
+    EXPECT_EQ(iter->first, Statuses::BUSY);
+    EXPECT_EQ(iter->second, 3);
+    ++iter;
+    EXPECT_EQ(iter, const_map.end());
+}
+
+TEST_F(EnhancedEnumTest, testEnumMapFill)
+{
+    StatusMap map;
+    map.fill(123);
+    EXPECT_EQ(map, StatusMap {123});
+}
+
+TEST_F(EnhancedEnumTest, testEnumMapSwap)
+{
+    StatusMap map1 {1};
+    StatusMap map2 {2};
+    map1.swap(map2);
+    EXPECT_EQ(map1, StatusMap {2});
+    EXPECT_EQ(map2, StatusMap {1});
+}
+
+TEST_F(EnhancedEnumTest, testEnumSet)
+{
+    StatusSet set;
+    EXPECT_TRUE(set.empty());
+    EXPECT_TRUE(set.insert(Statuses::BUSY).second);
+    EXPECT_FALSE(set.insert(Statuses::BUSY).second);
+    EXPECT_TRUE(set.contains(Statuses::BUSY));
+    EXPECT_EQ(set.count(Statuses::BUSY), 1u);
+    EXPECT_EQ(set.count(Statuses::INITIALIZING), 0u);
+    EXPECT_EQ(set.size(), 1u);
+    EXPECT_EQ(set.erase(Statuses::BUSY), 1u);
+    EXPECT_EQ(set.erase(Statuses::BUSY), 0u);
+    EXPECT_TRUE(set.empty());
+}
+
+TEST_F(EnhancedEnumTest, testEnumSetFind)
+{
+    const StatusSet set {Statuses::WAITING_FOR_INPUT};
+    EXPECT_EQ(*set.find(Statuses::WAITING_FOR_INPUT), Statuses::WAITING_FOR_INPUT);
+    EXPECT_EQ(set.find(Statuses::BUSY), set.end());
+}
+
+TEST_F(EnhancedEnumTest, testEnumSetIteration)
+{
+    const StatusSet set {Statuses::BUSY, Statuses::INITIALIZING};
+    EXPECT_EQ(
+        std::vector<EnhancedStatus>(set.begin(), set.end()),
+        (std::vector<EnhancedStatus> {Statuses::INITIALIZING, Statuses::BUSY}));
+}
+
+TEST_F(EnhancedEnumTest, testEnumSetClear)
+{
+    StatusSet set {Statuses::BUSY, Statuses::INITIALIZING};
+    set.clear();
+    EXPECT_TRUE(set.empty());
+    EXPECT_EQ(set.begin(), set.end());
+}
+
+TEST_F(EnhancedEnumTest, testEnumSetWithMultipleWords)
+{
+    using large::EnhancedLargeEnum;
+    enhanced_enum::enum_set<EnhancedLargeEnum> set;
+    std::vector<EnhancedLargeEnum> expected;
+    for (const auto e : EnhancedLargeEnum::all()) {
+        if (e.value() % 3 == 0) {
+            set.insert(e);
+            expected.push_back(e);
+        }
+    }
+    EXPECT_EQ(set.size(), expected.size());
+    EXPECT_EQ(std::vector<EnhancedLargeEnum>(set.begin(), set.end()), expected);
+    for (const auto e : EnhancedLargeEnum::all()) {
+        EXPECT_EQ(set.contains(e), e.value() % 3 == 0);
+    }
+}
+
+TEST_F(EnhancedEnumTest, testFromValuesShouldStopAtFirstFailure)
+{
+    const auto values = std::vector<std::string_view> {
+        "busy", "initializing", "invalid", "busy"};
+    auto enums = std::vector<EnhancedStatus>(values.size(), Statuses::WAITING_FOR_INPUT);
+    const auto result = enhanced_enum::from_values<EnhancedStatus>(
+        values.begin(), values.end(), enums.begin());
+    EXPECT_EQ(result.in - values.begin(), 2);
+    EXPECT_EQ(result.out - enums.begin(), 2);
+    EXPECT_EQ(enums[0], Statuses::BUSY);
+    EXPECT_EQ(enums[1], Statuses::INITIALIZING);
+    EXPECT_EQ(enums[2], Statuses::WAITING_FOR_INPUT);
+}
+
+TEST_F(EnhancedEnumTest, testFromValuesWithOffsetLookup)
+{
+    using large::EnhancedLargeEnum;
+    auto values = std::vector<long> {};
+    for (auto n = 99; n >= 0; --n) {
+        values.push_back(n);
+    }
+    auto enums = std::vector<EnhancedLargeEnum> {};
+    const auto result = enhanced_enum::from_values<EnhancedLargeEnum>(
+        values.begin(), values.end(), std::back_inserter(enums));
+    EXPECT_EQ(result.in, values.end());
+    ASSERT_EQ(enums.size(), values.size());
+    for (auto n = 0u; n < values.size(); ++n) {
+        EXPECT_EQ(enums[n].value(), values[n]);
+    }
+    const auto invalid = std::array {0L, 100L, -1L};
+    EXPECT_EQ(
+        enhanced_enum::from_values<EnhancedLargeEnum>(
+            invalid.begin(), invalid.end(), enums.begin()).in,
+        invalid.begin() + 1);
+}
+
+TEST_F(EnhancedEnumTest, testFromValuesMaskedShouldAgreeWithFrom)
+{
+    using wire::EnhancedWireCode;
+    auto values = std::vector<std::int8_t> {};
+    for (auto n = INT8_MIN; n <= INT8_MAX; ++n) {
+        values.push_back(static_cast<std::int8_t>(n));
+    }
+    auto labels = std::vector<wire::WireCodeLabel>(values.size());
+    auto mask = std::vector<bool>(values.size());
+    const auto failures = enhanced_enum::from_values_masked(
+        values.begin(), values.end(), labels.begin(), mask.begin(),
+        wire::WireCodeLabel::DATA);
+    EXPECT_EQ(failures, values.size() - 3);
+    for (auto n = 0u; n < values.size(); ++n) {
+        const auto expected = EnhancedWireCode::from(values[n]);
+        EXPECT_EQ(mask[n], expected.has_value());
+        EXPECT_EQ(labels[n], expected.value_or(wire::WireCodes::DATA));
+    }
+}
+
+TEST_F(EnhancedEnumTest, testFromValuesMaskedShouldNotNarrowWiderValues)
+{
+    using wire::EnhancedWireCode;
+    auto values = std::vector<std::int16_t> {};
+    for (auto n = INT16_MIN; n <= INT16_MAX; ++n) {
+        values.push_back(static_cast<std::int16_t>(n));
+    }
+    auto labels = std::vector<wire::WireCodeLabel>(values.size());
+    auto mask = std::vector<bool>(values.size());
+    const auto failures = enhanced_enum::from_values_masked(
+        values.begin(), values.end(), labels.begin(), mask.begin(),
+        wire::WireCodeLabel::DATA);
+    EXPECT_EQ(failures, values.size() - 3);
+    for (auto n = 0u; n < values.size(); ++n) {
+        const auto expected = EnhancedWireCode::from(values[n]);
+        EXPECT_EQ(mask[n], expected.has_value());
+        EXPECT_EQ(labels[n], expected.value_or(wire::WireCodes::DATA));
+    }
+    EXPECT_FALSE(EnhancedWireCode::from(std::int16_t {266}));
+}
+
+TEST_F(EnhancedEnumTest, testFromValuesMaskedWithLinearLookup)
+{
+    using wire::EnhancedSparseCode;
+    namespace SparseCodes = wire::SparseCodes;
+    const auto values = std::array {0L, 5L, 1000000L};
+    auto enums = std::array<EnhancedSparseCode, 3> {};
+    auto mask = std::array<bool, 3> {};
+    EXPECT_EQ(
+        enhanced_enum::from_values_masked<EnhancedSparseCode>(
+            values.begin(), values.end(), enums.begin(), mask.begin()),
+        1u);
+    EXPECT_EQ(enums, (std::array {SparseCodes::SMALL, SparseCodes::SMALL, SparseCodes::HUGE}));
+    EXPECT_EQ(mask, (std::array {true, false, true}));
+}
+
+TEST_F(EnhancedEnumTest, testStringBlobValues)
+{
+    using blob::EnhancedColor;
+    namespace Colors = blob::Colors;
+    static_assert(Colors::RED.value() == "red");
+    static_assert(Colors::CYAN_VALUE == "cyan");
+    EXPECT_EQ(EnhancedColor::values.size(), 4u);
+    EXPECT_EQ(
+        (std::vector<std::string_view>(
+            EnhancedColor::values.begin(), EnhancedColor::values.end())),
+        (std::vector<std::string_view> {"red", "", "it's\tescaped", "cyan"}));
+    EXPECT_EQ(Colors::NONE.value(), "");
+    EXPECT_EQ(Colors::ESCAPED.value(), "it's\tescaped");
+}
+
+TEST_F(EnhancedEnumTest, testStringBlobFrom)
+{
+    using blob::EnhancedColor;
+    namespace Colors = blob::Colors;
+    static_assert(EnhancedColor::from("cyan") == Colors::CYAN);
+    EXPECT_EQ(EnhancedColor::from(""), Colors::NONE);
+    EXPECT_EQ(EnhancedColor::from("blue"), std::nullopt);
+    const auto values = std::array<std::string_view, 3> {"red", "blue", "cyan"};
+    auto labels = std::array<blob::ColorLabel, 3> {};
+    auto mask = std::array<bool, 3> {};
+    EXPECT_EQ(
+        enhanced_enum::from_values_masked(
+            values.begin(), values.end(), labels.begin(), mask.begin(),
+            blob::ColorLabel::NONE),
+        1u);
+    EXPECT_EQ(
+        labels,
+        (std::array {blob::ColorLabel::RED, blob::ColorLabel::NONE, blob::ColorLabel::CYAN}));
+}
+
+TEST_F(EnhancedEnumTest, testFlagsOperators)
+{
+    using flags::PermissionFlags;
+    using flags::PermissionLabel;
+    namespace Permissions = flags::Permissions;
+    static_assert(sizeof(PermissionFlags) == sizeof(std::uint8_t));
+    constexpr auto rw = Permissions::READ | PermissionLabel::WRITE;
+    static_assert(rw.mask() == 0b11);
+    static_assert((rw & Permissions::WRITE) == Permissions::WRITE);
+    static_assert((rw ^ PermissionLabel::READ) == PermissionLabel::WRITE);
+    static_assert((PermissionLabel::READ | PermissionLabel::EXECUTE).mask() == 0b10001);
+    static_assert(~rw == (Permissions::EXECUTE | Permissions::DELETE));
+    static_assert(~PermissionFlags::all() == PermissionFlags {});
+    auto permissions = PermissionFlags {};
+    EXPECT_TRUE(permissions.empty());
+    EXPECT_FALSE(permissions);
+    permissions |= Permissions::DELETE;
+    permissions |= PermissionLabel::READ;
+    EXPECT_EQ(permissions.mask(), 0b101u);
+    permissions &= rw;
+    EXPECT_EQ(permissions, Permissions::READ);
+    permissions ^= rw;
+    EXPECT_EQ(permissions, PermissionLabel::WRITE);
+}
+
+TEST_F(EnhancedEnumTest, testFlagsContains)
+{
+    using flags::PermissionFlags;
+    namespace Permissions = flags::Permissions;
+    constexpr auto rw = Permissions::READ | Permissions::WRITE;
+    static_assert(rw.contains(Permissions::READ));
+    static_assert(rw.contains(rw));
+    static_assert(!rw.contains(Permissions::READ | Permissions::DELETE));
+    static_assert(rw.contains(PermissionFlags {}));
+    EXPECT_TRUE(rw.intersects(Permissions::READ | Permissions::DELETE));
+    EXPECT_FALSE(rw.intersects(Permissions::EXECUTE));
+    EXPECT_EQ(rw.size(), 2u);
+    EXPECT_EQ(PermissionFlags::all().size(), 4u);
+}
+
+TEST_F(EnhancedEnumTest, testFlagsFromMask)
+{
+    using flags::PermissionFlags;
+    namespace Permissions = flags::Permissions;
+    static_assert(PermissionFlags::from_mask(0b10010) == (Permissions::WRITE | Permissions::EXECUTE));
+    EXPECT_EQ(PermissionFlags::from_mask(0), PermissionFlags {});
+    EXPECT_EQ(PermissionFlags::from_mask(0b1000), std::nullopt);
+}
+
+TEST_F(EnhancedEnumTest, testFlagsIteration)
+{
+    using flags::EnhancedPermission;
+    namespace Permissions = flags::Permissions;
+    const auto permissions = Permissions::DELETE | Permissions::READ | Permissions::EXECUTE;
+    EXPECT_EQ(
+        (std::vector<EnhancedPermission>(permissions.begin(), permissions.end())),
+        (std::vector {Permissions::READ, Permissions::EXECUTE, Permissions::DELETE}));
+    const auto none = flags::PermissionFlags {};
+    EXPECT_EQ(none.begin(), none.end());
+}
+
 INSTANTIATE_TEST_SUITE_P(
     WithEnumBundle,
     EnhancedEnumTest,
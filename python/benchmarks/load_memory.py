@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""Measure the peak memory used when loading YAML definitions
+
+Generates a YAML definition with the given number of members, and
+measures the peak memory allocated while loading it with
+enumecg.loaders.load() and with yaml.safe_load(). The size of the
+loaded definition is reported for reference. The results are printed
+as JSON.
+
+The enumecg package must be importable, e.g. by running the script
+from the python/ directory of the repository with PYTHONPATH set to
+it.
+"""
+
+import argparse
+import io
+import json
+import tracemalloc
+
+import yaml
+
+from enumecg.loaders import Format, load
+
+
+def _make_document(n_members):
+    return "typename: Enum\nmembers:\n" + "".join(
+        f"- name: ENUMERATOR_{i}\n  value: value{i}\n" for i in range(n_members)
+    )
+
+
+def _measure(load_function, document):
+    tracemalloc.start()
+    try:
+        result = load_function(io.StringIO(document))
+        size, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"result_bytes": size, "peak_bytes": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--members", type=int, default=10000, help="Number of members in the enum"
+    )
+    args = parser.parse_args()
+
+    document = _make_document(args.members)
+    results = {
+        "members": args.members,
+        "enumecg": _measure(lambda file: load(file, Format.yaml), document),
+        "safe_load": _measure(yaml.safe_load, document),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
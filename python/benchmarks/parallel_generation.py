@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Measure the speedup of generating a large enum in parallel
+
+Generates an enum definition with the given number of members, and
+measures the time it takes to generate code from it with an
+increasing number of worker processes. Unlike in render_time.py, the
+time includes creating the enum definition, since that is part of the
+work split between the processes. The direct backend is used, since
+the parallel generation writes the code from preformatted strings like
+it does, so that the speedup relative to a single process reflects
+the number of processes only. The results are printed as JSON.
+
+The enumecg package must be importable, e.g. by running the script
+from the python/ directory of the repository with PYTHONPATH set to
+it.
+"""
+
+import argparse
+import json
+import os
+import time
+
+from enumecg import generator
+
+
+def _make_enum(n_members):
+    return {
+        "typename": "Symbol",
+        "members": [
+            {"name": f"SYMBOL_{i}", "value": [i, f"symbol{i}"]}
+            for i in range(n_members)
+        ],
+    }
+
+
+def _measure(code_generator, enum, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        code_generator.generate_enum_definitions(enum)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--members", type=int, default=1000000, help="Number of members in the enum"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+        help="Numbers of worker processes",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of repetitions per measurement"
+    )
+    args = parser.parse_args()
+
+    enum = _make_enum(args.members)
+    results = []
+    for processes in args.processes:
+        seconds = _measure(
+            generator(backend="direct", processes=processes), enum, args.repeat
+        )
+        results.append({"processes": processes, "seconds": seconds})
+    for result in results:
+        result["speedup"] = results[0]["seconds"] / result["seconds"]
+    print(json.dumps({"members": args.members, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
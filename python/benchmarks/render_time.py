@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""Measure the time it takes to render enum definitions
+
+Generates enums of increasing size and measures the time it takes to
+render them with and without documentation, and with the direct
+backend that writes undocumented code without templates. The
+definitions are created once per enum, so that only the rendering is
+measured. The results are printed as JSON.
+
+The enumecg package must be importable, e.g. by running the script
+from the python/ directory of the repository with PYTHONPATH set to
+it.
+"""
+
+import argparse
+import json
+import time
+
+from enumecg import generator
+from enumecg.definitions import make_definition
+
+
+def _make_enum(n_members):
+    return make_definition(
+        {
+            "typename": "Enum",
+            "docstring": "Benchmark enum\n\nLong description",
+            "members": [
+                {"name": f"ENUMERATOR_{i}", "value": f"value{i}"}
+                for i in range(n_members)
+            ],
+        }
+    )
+
+
+def _measure(code_generator, enum, repeat):
+    code_generator.generate_enum_definitions(enum)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        code_generator.generate_enum_definitions(enum)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--members",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000, 5000],
+        help="Number of members in the enums",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of repetitions per enum"
+    )
+    args = parser.parse_args()
+
+    generators = {
+        "undocumented": generator(),
+        "doxygen": generator(documentation="doxygen"),
+        "direct": generator(backend="direct"),
+    }
+    results = []
+    for n_members in args.members:
+        enum = _make_enum(n_members)
+        result = {"members": n_members}
+        for key, code_generator in generators.items():
+            result[key] = _measure(code_generator, enum, args.repeat)
+        results.append(result)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
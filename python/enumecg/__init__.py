@@ -11,7 +11,7 @@ __author__ = "Jaakko Moisio"
 
 import typing
 
-from . import definitions, generators, exceptions
+from . import definitions, generators, exceptions, loaders
 
 
 def _convert_to_enumerator(enum_type, value, parameter):
@@ -23,33 +23,87 @@ def _convert_to_enumerator(enum_type, value, parameter):
     return value
 
 
+def _make_definition(
+    enum,
+    *,
+    primary_type=None,
+    value_type=None,
+    narrow_types=False,
+    array_sequences=False,
+    **_options,
+):
+    # Make the definition with the definition options among the keyword
+    # arguments of generate(), so that it can be passed to several of the
+    # functions below without being converted and deduced again
+    return definitions.make_definition(
+        enum,
+        primary_type=_convert_to_enumerator(
+            definitions.PrimaryType, primary_type, "primary_type"
+        ),
+        value_type=value_type,
+        narrow_types=narrow_types,
+        array_sequences=array_sequences,
+    )
+
+
 def generator(
-    *, documentation: typing.Union[generators.DocumentationStyle, str, None] = None
+    *,
+    documentation: typing.Union[generators.DocumentationStyle, str, None] = None,
+    names: bool = False,
+    backend: typing.Union[generators.Backend, str, None] = None,
+    processes: int = 1,
+    string_blob: bool = False,
 ) -> generators.CodeGenerator:
     """Create code generator for an enhanced enum type
 
-    Creates an instance of :class:`generators.CodeGenerator`.
+    Creates an instance of :class:`generators.CodeGenerator`, or
+    :class:`generators.DirectCodeGenerator` if the direct backend is
+    selected.
 
     Parameters:
         documentation: A string or an enumerator indicating the documentation
                        style. See :ref:`enumecg-documentation-generation`.
+        names: If ``True``, generate enumerator name lookup. See
+               :ref:`enumecg-enumerator-names`.
+        backend: A string or an enumerator indicating the backend
+                 (see :class:`generators.Backend`). The default is
+                 the Jinja backend.
+        processes: The number of worker processes used to generate
+                   large enums. See :ref:`enumecg-parallel-generation`.
+        string_blob: If ``True``, store string values in a single
+                     character array. See :ref:`enumecg-string-blobs`.
 
     Returns:
         The :class:`generators.CodeGenerator` instance.
     """
-    return generators.CodeGenerator(
+    generator_class = (
+        generators.DirectCodeGenerator
+        if _convert_to_enumerator(generators.Backend, backend, "backend")
+        == generators.Backend.direct
+        else generators.CodeGenerator
+    )
+    return generator_class(
         documentation=_convert_to_enumerator(
             generators.DocumentationStyle, documentation, "documentation"
-        )
+        ),
+        names=names,
+        processes=processes,
+        string_blob=string_blob,
     )
 
 
-def generate(
+def generate(  # pylint: disable=too-many-arguments
     enum: definitions.Enum,
     *,
     documentation: typing.Union[generators.DocumentationStyle, str, None] = None,
     primary_type: typing.Union[definitions.PrimaryType, str, None] = None,
     value_type: typing.Optional[str] = None,
+    narrow_types: bool = False,
+    array_sequences: bool = False,
+    names: bool = False,
+    processes: int = 1,
+    string_blob: bool = False,
+    label_enum: bool = True,
 ) -> str:
     """Generate code for an enhanced enum
 
@@ -79,17 +133,249 @@ def generate(
         primary_type: A string or an enumerator indicating the
                       primary type. See :ref:`enumecg-primary-enum`.
         value_type: See :ref:`enumerator-value-type`.
+        narrow_types: If ``True``, deduce the narrowest numeric types
+                      fitting the values. See :ref:`enumecg-narrow-types`.
+        array_sequences: If ``True``, deduce ``std::array`` for
+                         homogeneous sequences. See :ref:`enumecg-array-sequences`.
+        names: If ``True``, generate enumerator name lookup. See
+               :ref:`enumecg-enumerator-names`.
+        processes: The number of worker processes used to generate
+                   large enums. See :ref:`enumecg-parallel-generation`.
+        string_blob: If ``True``, store string values in a single
+                     character array. See :ref:`enumecg-string-blobs`.
+        label_enum: If ``False``, omit the definition of the label
+                    enum. See :ref:`enumecg-split-headers`.
 
     Returns:
         The enhanced enum definition created from the ``enum`` description.
 
     """
     return str(
-        generator(documentation=documentation).generate_enum_definitions(
+        generator(
+            documentation=documentation,
+            names=names,
+            processes=processes,
+            string_blob=string_blob,
+        ).generate_enum_definitions(
+            enum,
+            label_enum=label_enum,
+            primary_type=_convert_to_enumerator(
+                definitions.PrimaryType, primary_type, "primary_type"
+            ),
+            value_type=value_type,
+            narrow_types=narrow_types,
+            array_sequences=array_sequences,
+        )
+    )
+
+
+def iter_generate(  # pylint: disable=too-many-arguments
+    enum: definitions.Enum,
+    *,
+    documentation: typing.Union[generators.DocumentationStyle, str, None] = None,
+    primary_type: typing.Union[definitions.PrimaryType, str, None] = None,
+    value_type: typing.Optional[str] = None,
+    narrow_types: bool = False,
+    array_sequences: bool = False,
+    names: bool = False,
+    processes: int = 1,
+    string_blob: bool = False,
+    label_enum: bool = True,
+) -> typing.Iterator[str]:
+    """Generate code for an enhanced enum in chunks
+
+    This function is the streaming variant of :func:`generate()`,
+    accepting the same parameters. The code is rendered lazily as the
+    chunks are consumed, so a consumer comparing the code against
+    existing content can stop at the first difference.
+
+    Returns:
+        An iterator over the chunks of the generated code
+    """
+    return generator(
+        documentation=documentation,
+        names=names,
+        processes=processes,
+        string_blob=string_blob,
+    ).iter_enum_definitions(
+        enum,
+        label_enum=label_enum,
+        primary_type=_convert_to_enumerator(
+            definitions.PrimaryType, primary_type, "primary_type"
+        ),
+        value_type=value_type,
+        narrow_types=narrow_types,
+        array_sequences=array_sequences,
+    )
+
+
+def plan(  # pylint: disable=too-many-arguments
+    enum: definitions.Enum,
+    *,
+    documentation: typing.Union[generators.DocumentationStyle, str, None] = None,
+    primary_type: typing.Union[definitions.PrimaryType, str, None] = None,
+    value_type: typing.Optional[str] = None,
+    names: bool = False,
+    narrow_types: bool = False,
+    array_sequences: bool = False,
+    string_blob: bool = False,
+    label_enum: bool = True,
+) -> generators.EnumPlan:
+    """Plan code generation for an enhanced enum without generating code
+
+    This function accepts the same parameters as :func:`generate()`,
+    but instead of the code, it returns the typenames deduced from the
+    definition and a fingerprint of the code. Calling
+    :func:`generate()` with arguments resulting in the same
+    fingerprint generates identical code. See
+    :meth:`generators.CodeGenerator.plan_enum_definitions()`.
+
+    Returns:
+        A :class:`generators.EnumPlan` instance
+    """
+    return generator(
+        documentation=documentation, names=names, string_blob=string_blob
+    ).plan_enum_definitions(
+        enum,
+        label_enum=label_enum,
+        primary_type=_convert_to_enumerator(
+            definitions.PrimaryType, primary_type, "primary_type"
+        ),
+        value_type=value_type,
+        narrow_types=narrow_types,
+        array_sequences=array_sequences,
+    )
+
+
+def generate_label_enum(
+    enum: definitions.Enum,
+    *,
+    documentation: typing.Union[generators.DocumentationStyle, str, None] = None,
+    primary_type: typing.Union[definitions.PrimaryType, str, None] = None,
+) -> str:
+    """Generate the label enum of an enhanced enum
+
+    This function is a shorthand for creating a code generator and
+    invoking
+    :meth:`generators.CodeGenerator.generate_label_enum_definition()`
+    in one call. The code complements the code generated by
+    :func:`generate()` with ``label_enum=False``. See
+    :ref:`enumecg-split-headers`.
+
+    Parameters:
+        enum: The enum definition. See :func:`generate()`.
+        documentation: A string or an enumerator indicating the documentation
+                       style. See :ref:`enumecg-documentation-generation`.
+        primary_type: A string or an enumerator indicating the
+                      primary type. See :ref:`enumecg-primary-enum`.
+
+    Returns:
+        The definition of the label enum
+    """
+    return str(
+        generator(documentation=documentation).generate_label_enum_definition(
             enum,
             primary_type=_convert_to_enumerator(
                 definitions.PrimaryType, primary_type, "primary_type"
             ),
+        )
+    )
+
+
+def generate_module(  # pylint: disable=too-many-arguments
+    enums: typing.Iterable[definitions.Enum],
+    *,
+    module_name: str,
+    namespace: typing.Optional[str] = None,
+    includes: typing.Iterable[str] = (),
+    documentation: typing.Union[generators.DocumentationStyle, str, None] = None,
+    primary_type: typing.Union[definitions.PrimaryType, str, None] = None,
+    value_type: typing.Optional[str] = None,
+    narrow_types: bool = False,
+    array_sequences: bool = False,
+    names: bool = False,
+    processes: int = 1,
+    string_blob: bool = False,
+) -> str:
+    """Generate C++20 module interface unit for enhanced enums
+
+    This function is a shorthand for creating a code generator and
+    invoking :meth:`generators.CodeGenerator.generate_module_interface()`
+    in one call. See :ref:`enumecg-cxx-modules`.
+
+    Parameters:
+        enums: The enum definitions. See :func:`generate()`.
+        module_name: The name of the module
+        namespace: If given, the definitions are placed in this namespace
+        includes: Additional headers included in the module interface
+        documentation: A string or an enumerator indicating the documentation
+                       style. See :ref:`enumecg-documentation-generation`.
+        primary_type: A string or an enumerator indicating the
+                      primary type. See :ref:`enumecg-primary-enum`.
+        value_type: See :ref:`enumerator-value-type`.
+        narrow_types: If ``True``, deduce the narrowest numeric types
+                      fitting the values. See :ref:`enumecg-narrow-types`.
+        array_sequences: If ``True``, deduce ``std::array`` for
+                         homogeneous sequences. See :ref:`enumecg-array-sequences`.
+        names: If ``True``, generate enumerator name lookup. See
+               :ref:`enumecg-enumerator-names`.
+        processes: The number of worker processes used to generate
+                   large enums. See :ref:`enumecg-parallel-generation`.
+        string_blob: If ``True``, store string values in a single
+                     character array. See :ref:`enumecg-string-blobs`.
+
+    Returns:
+        The module interface unit containing the enhanced enum definitions
+    """
+    return str(
+        generator(
+            documentation=documentation,
+            names=names,
+            processes=processes,
+            string_blob=string_blob,
+        ).generate_module_interface(
+            enums,
+            module_name=module_name,
+            namespace=namespace,
+            includes=includes,
+            primary_type=_convert_to_enumerator(
+                definitions.PrimaryType, primary_type, "primary_type"
+            ),
             value_type=value_type,
+            narrow_types=narrow_types,
+            array_sequences=array_sequences,
+        )
+    )
+
+
+def generate_python_module(
+    enum: definitions.Enum,
+    *,
+    class_name: typing.Optional[str] = None,
+    primary_type: typing.Union[definitions.PrimaryType, str, None] = None,
+) -> str:
+    """Generate Python module for an enhanced enum
+
+    This function is a shorthand for creating a code generator and
+    invoking :meth:`generators.CodeGenerator.generate_python_module()`
+    in one call. See :ref:`enumecg-python-modules`.
+
+    Parameters:
+        enum: The enum definition. See :func:`generate()`.
+        class_name: The name of the enum class. Defaults to the
+                    typename of the enhanced enum.
+        primary_type: A string or an enumerator indicating the
+                      primary type. See :ref:`enumecg-primary-enum`.
+
+    Returns:
+        The Python module containing the enum class and the lookup tables
+    """
+    return str(
+        generator().generate_python_module(
+            enum,
+            class_name=class_name,
+            primary_type=_convert_to_enumerator(
+                definitions.PrimaryType, primary_type, "primary_type"
+            ),
         )
     )
@@ -0,0 +1,438 @@
+"""
+Batch operations
+................
+
+Contains the operations processing a batch of definition files at
+once. A batch consists of :class:`Job` objects, each associating a
+definition file with the header generated from it. They are used to
+implement the ``--manifest``, ``--check``, ``--plan``, ``--shard`` and
+``--results`` options of the command line interface.
+
+The headers written by the command line interface consist of the
+generated code followed by a newline, and the operations in this
+module expect the headers to follow the same convention.
+"""
+
+import concurrent.futures
+import functools
+import hashlib
+import itertools
+import json
+import os
+import typing
+
+from . import exceptions, generators, iter_generate, loaders
+from . import plan as _plan_enum
+
+
+class Job(typing.NamedTuple):
+    """Definition file and the header generated from it"""
+
+    definition: str
+    """Path to the definition file"""
+
+    header: str
+    """Path to the generated header"""
+
+
+def load_manifest(file: typing.TextIO) -> typing.List[Job]:
+    """Load a batch from a manifest file
+
+    The manifest is a JSON document containing a list of objects with
+    ``definition`` and ``header`` keys:
+
+    .. code-block:: json
+
+        [
+            {"definition": "status.yaml", "header": "include/status.hh"},
+            {"definition": "color.csv", "header": "include/color.hh"}
+        ]
+
+    Relative paths are interpreted relative to the directory
+    containing the manifest.
+
+    Parameters:
+        file: The manifest file
+
+    Returns:
+        List of jobs in the order they appear in the manifest
+
+    Raises:
+        :exc:`exceptions.Error`: If the manifest is invalid.
+    """
+    name = getattr(file, "name", "")
+    directory = os.path.dirname(name) if name else ""
+    try:
+        entries = json.load(file)
+        if not isinstance(entries, list):
+            raise TypeError("Manifest is not a list")
+        return [
+            Job(
+                os.path.join(directory, entry["definition"]),
+                os.path.join(directory, entry["header"]),
+            )
+            for entry in entries
+        ]
+    except (KeyError, TypeError, ValueError) as ex:
+        raise exceptions.Error(f"Invalid manifest {name}") from ex
+
+
+class JobPlan(typing.NamedTuple):
+    """Plan for a job
+
+    Returned by :func:`plan()`.
+    """
+
+    job: Job
+    """The planned job"""
+
+    plan: generators.EnumPlan
+    """The plan for the enum in the definition file of the job"""
+
+    def asdict(self) -> typing.Dict[str, typing.Optional[str]]:
+        """Return the plan as a :class:`dict` that can be serialized to JSON
+
+        The dict contains the fields of both :attr:`job` and :attr:`plan`.
+        """
+        return {**self.job._asdict(), **self.plan._asdict()}
+
+
+def _load_job(job, load_options):
+    with open(job.definition, encoding="utf-8") as file:
+        return loaders.load(file, **(load_options or {}))
+
+
+def _matches(chunks, file):
+    for chunk in chunks:
+        if file.read(len(chunk)) != chunk:
+            return False
+    return not file.read(1)
+
+
+def is_up_to_date(
+    job: Job, *, load_options: typing.Optional[typing.Mapping] = None, **options
+) -> bool:
+    """Check if the header of a job is up to date
+
+    The code is generated in chunks (see :func:`enumecg.iter_generate()`),
+    and each chunk is compared against the header as soon as it is
+    rendered. The comparison stops at the first difference.
+
+    Parameters:
+        job: The job to check
+        load_options: The keyword arguments passed to :func:`loaders.load()`
+        options: The keyword arguments passed to :func:`enumecg.iter_generate()`
+
+    Returns:
+        ``True`` if the header exists and its content is equal to the
+        code generated from the definition, ``False`` otherwise
+
+    Raises:
+        :exc:`exceptions.Error`: If the code cannot be generated from
+          the definition.
+    """
+    enum = _load_job(job, load_options)
+    try:
+        with open(job.header, encoding="utf-8") as header:
+            return _matches(
+                itertools.chain(iter_generate(enum, **options), ["\n"]), header
+            )
+    except FileNotFoundError:
+        return False
+
+
+def check(
+    jobs: typing.Iterable[Job],
+    *,
+    processes: int = 1,
+    load_options: typing.Optional[typing.Mapping] = None,
+    **options,
+) -> typing.List[Job]:
+    """Check which headers in a batch are stale
+
+    Parameters:
+        jobs: The jobs to check
+        processes: The number of worker processes. If greater than
+                   one, the jobs are checked in parallel in a process pool.
+        load_options: The keyword arguments passed to :func:`loaders.load()`
+        options: The keyword arguments passed to :func:`enumecg.iter_generate()`
+
+    Returns:
+        List of the jobs whose headers are not up to date (see
+        :func:`is_up_to_date()`), in the order they were given
+
+    Raises:
+        :exc:`exceptions.Error`: If the code cannot be generated from
+          any of the definitions.
+    """
+    jobs = list(jobs)
+    check_job = functools.partial(is_up_to_date, load_options=load_options, **options)
+    if processes > 1 and len(jobs) > 1:
+        with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+            results = list(executor.map(check_job, jobs))
+    else:
+        results = [check_job(job) for job in jobs]
+    return [job for (job, up_to_date) in zip(jobs, results) if not up_to_date]
+
+
+def plan(
+    jobs: typing.Iterable[Job],
+    *,
+    load_options: typing.Optional[typing.Mapping] = None,
+    **options,
+) -> typing.List[JobPlan]:
+    """Plan a batch without generating code
+
+    Loads the definitions and deduces the enum definitions from them,
+    but does not generate or read any headers. The fingerprints of the
+    plans can be compared against the fingerprints recorded when the
+    headers were last generated, to decide cheaply which headers need
+    to be regenerated.
+
+    Parameters:
+        jobs: The jobs to plan
+        load_options: The keyword arguments passed to :func:`loaders.load()`
+        options: The keyword arguments passed to :func:`enumecg.plan()`
+
+    Returns:
+        List of the plans, in the order the jobs were given
+
+    Raises:
+        :exc:`exceptions.Error`: If any of the definitions is invalid.
+    """
+    return [
+        JobPlan(job, _plan_enum(_load_job(job, load_options), **options))
+        for job in jobs
+    ]
+
+
+class Shard(typing.NamedTuple):
+    """Shard of a batch
+
+    A batch is split into shards so that they can be processed
+    independently, for instance on different machines. See
+    :func:`select_shard()`.
+    """
+
+    index: int
+    """The one-based index of the shard"""
+
+    count: int
+    """The number of shards in the batch"""
+
+    def __str__(self):
+        return f"{self.index}/{self.count}"
+
+
+def parse_shard(spec: str) -> Shard:
+    """Parse a shard from the ``INDEX/COUNT`` notation
+
+    Parameters:
+        spec: The index of the shard and the number of shards
+              separated by a slash, e.g. ``2/4``
+
+    Returns:
+        A :class:`Shard` instance
+
+    Raises:
+        :exc:`exceptions.Error`: If ``spec`` is not a valid shard.
+    """
+    try:
+        index, count = map(int, spec.split("/"))
+    except ValueError as ex:
+        raise exceptions.Error(f"Invalid shard {spec!r}, expected INDEX/COUNT") from ex
+    if not 1 <= index <= count:
+        raise exceptions.Error(f"Shard index {index} is not between 1 and {count}")
+    return Shard(index, count)
+
+
+def _get_shard_index(job, count, root):
+    path = os.path.relpath(job.header, root) if root else os.path.normpath(job.header)
+    digest = hashlib.sha256(path.replace(os.sep, "/").encode()).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def select_shard(
+    jobs: typing.Iterable[Job], shard: Shard, *, root: typing.Optional[str] = None
+) -> typing.List[Job]:
+    """Select the jobs assigned to a shard of a batch
+
+    Each job is assigned to a shard by a hash of the path of its
+    header. The assignment only depends on the path and the number of
+    shards, so every machine processing a shard of the same batch
+    agrees on it, and each job is assigned to exactly one shard.
+
+    Parameters:
+        jobs: The jobs of the batch
+        shard: The shard to select
+        root: If given, the paths are hashed relative to this
+              directory, so that the assignment doesn't depend on where
+              the batch is located. Typically the directory containing
+              the manifest, or the output directory.
+
+    Returns:
+        List of the jobs assigned to ``shard``, in the order they were given
+    """
+    return [
+        job for job in jobs if _get_shard_index(job, shard.count, root) == shard.index
+    ]
+
+
+class JobResult(typing.NamedTuple):
+    """Result of a job in a batch run
+
+    Written to the result file of the batch with :func:`dump_results()`.
+    """
+
+    job: Job
+    """The job"""
+
+    fingerprint: str
+    """The fingerprint of the code generated for the job (see :func:`plan()`)"""
+
+    status: str
+    """The outcome of the job. For generation, either ``"generated"`` or
+    ``"unchanged"``, depending on whether the header was written. For
+    checks, either ``"up-to-date"`` or ``"stale"``."""
+
+    def asdict(self) -> typing.Dict[str, str]:
+        """Return the result as a :class:`dict` that can be serialized to JSON
+
+        The dict contains the fields of :attr:`job`, and the fingerprint
+        and the status.
+        """
+        return {
+            **self.job._asdict(),
+            "fingerprint": self.fingerprint,
+            "status": self.status,
+        }
+
+
+def dump_results(
+    results: typing.Iterable[JobResult],
+    file: typing.TextIO,
+    *,
+    shard: Shard = Shard(1, 1),
+):
+    """Write the results of a batch run to a result file
+
+    The result file is a JSON document containing the shard that was
+    processed and the results of its jobs:
+
+    .. code-block:: json
+
+        {
+            "shard": "1/2",
+            "results": [
+                {
+                    "definition": "status.yaml",
+                    "header": "include/status.hh",
+                    "fingerprint": "...",
+                    "status": "generated"
+                }
+            ]
+        }
+
+    Like in manifests, the paths are relative to the directory
+    containing the result file.
+
+    Parameters:
+        results: The results of the jobs
+        file: The result file
+        shard: The shard the results are for
+    """
+    directory = os.path.dirname(getattr(file, "name", "")) or os.curdir
+    json.dump(
+        {
+            "shard": str(shard),
+            "results": [
+                {
+                    **result.asdict(),
+                    "definition": os.path.relpath(result.job.definition, directory),
+                    "header": os.path.relpath(result.job.header, directory),
+                }
+                for result in results
+            ],
+        },
+        file,
+        indent=2,
+    )
+
+
+def load_results(file: typing.TextIO) -> typing.Tuple[Shard, typing.List[JobResult]]:
+    """Load the results of a batch run from a result file
+
+    See :func:`dump_results()` for the format of the file.
+
+    Parameters:
+        file: The result file
+
+    Returns:
+        Tuple containing the shard and the results of its jobs
+
+    Raises:
+        :exc:`exceptions.Error`: If the result file is invalid.
+    """
+    name = getattr(file, "name", "")
+    directory = os.path.dirname(name) if name else ""
+    try:
+        document = json.load(file)
+        return (
+            parse_shard(document["shard"]),
+            [
+                JobResult(
+                    Job(
+                        os.path.join(directory, entry["definition"]),
+                        os.path.join(directory, entry["header"]),
+                    ),
+                    entry["fingerprint"],
+                    entry["status"],
+                )
+                for entry in document["results"]
+            ],
+        )
+    except (exceptions.Error, KeyError, TypeError, ValueError) as ex:
+        raise exceptions.Error(f"Invalid result file {name}") from ex
+
+
+def merge_results(files: typing.Iterable[typing.TextIO]) -> typing.List[JobResult]:
+    """Merge the result files of the shards of a batch
+
+    Parameters:
+        files: The result files, one for each shard
+
+    Returns:
+        List of the results of all jobs in the batch, ordered by shard
+
+    Raises:
+        :exc:`exceptions.Error`: If any of the result files is
+          invalid, the files are not from the shards of the same batch,
+          any shard is missing or given more than once, or the same
+          header is in more than one shard.
+    """
+    shards = {}
+    for file in files:
+        shard, results = load_results(file)
+        if shards and shard.count != next(iter(shards)).count:
+            raise exceptions.Error("Result files are from different numbers of shards")
+        if shard in shards:
+            raise exceptions.Error(f"Shard {shard} is given more than once")
+        shards[shard] = results
+    count = next(iter(shards)).count if shards else 0
+    missing = [
+        str(Shard(index, count))
+        for index in range(1, count + 1)
+        if Shard(index, count) not in shards
+    ]
+    if missing:
+        raise exceptions.Error(f"Missing results for shards {', '.join(missing)}")
+    merged = [result for shard in sorted(shards) for result in shards[shard]]
+    headers = set()
+    for result in merged:
+        header = os.path.normpath(result.job.header)
+        if header in headers:
+            raise exceptions.Error(
+                f"Header {result.job.header} is in more than one shard"
+            )
+        headers.add(header)
+    return merged
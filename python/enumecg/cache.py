@@ -0,0 +1,268 @@
+"""
+Remote cache
+............
+
+Contains the client of a remote cache of generated code. The cache is
+used to implement the ``--cache-url`` option of the command line
+interface, so that machines generating headers from the same
+definitions can share the code instead of each rendering it.
+
+The cache is an HTTP server storing the code under the fingerprints
+returned by :func:`enumecg.plan()`. The fingerprint covers the
+definition, the options, the templates, and the source code and the
+version of the package, so the code stored under it never needs to be
+invalidated. The protocol consists of two requests:
+
+- ``GET <url>/<fingerprint>`` responds with status 200 and the code as
+  UTF-8 encoded body, or with status 404 if the code is not cached.
+
+- ``PUT <url>/<fingerprint>`` with the code as UTF-8 encoded body
+  stores the code, and responds with any 2xx status.
+
+Any HTTP server or object store that can serve and accept files under
+a common prefix implements the protocol.
+"""
+
+import http.client
+import time
+import typing
+import urllib.parse
+
+from . import definitions, exceptions, generate, plan, _make_definition
+
+DEFAULT_TIMEOUT = 2.0
+"""Default timeout (in seconds) of the requests to the cache"""
+
+
+class CacheInfo(typing.NamedTuple):
+    """Statistics of a remote cache
+
+    Returned by :meth:`RemoteCache.info()`.
+    """
+
+    hits: int
+    """Number of lookups that returned code from the cache"""
+
+    misses: int
+    """Number of lookups that did not find the code in the cache"""
+
+    stores: int
+    """Number of times code was stored in the cache"""
+
+    errors: int
+    """Number of requests that failed"""
+
+    requests: int
+    """Number of requests sent to the cache"""
+
+    latency: float
+    """Total time (in seconds) spent waiting for the responses of the requests"""
+
+
+# pylint: disable=too-many-instance-attributes
+class RemoteCache:
+    """Client of a remote cache of generated code
+
+    The client keeps a single connection to the server open, and
+    reuses it for all the requests made while processing a batch. If
+    the server cannot be reached, or does not respond within the
+    timeout, the request counts as an error, and the cache is not used
+    for the rest of the batch, so that an unavailable server delays a
+    batch at most once by the timeout. The code is then generated
+    locally. The client can be used as a context manager that closes
+    the connection on exit.
+
+    .. testsetup::
+
+        from enumecg.cache import RemoteCache
+
+    .. doctest::
+
+        >>> with RemoteCache("http://localhost:1", timeout=0.1) as cache:
+        ...     cache.get("0123abcd")
+        ...     cache.info().errors
+        1
+    """
+
+    def __init__(self, url: str, *, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Parameters:
+          url: The URL of the cache. The fingerprints are appended to
+            its path.
+          timeout: The timeout (in seconds) of connecting to the
+            cache, and of each request
+
+        Raises:
+          :exc:`exceptions.Error`: If the URL is not a valid HTTP or
+            HTTPS URL.
+        """
+        parts = urllib.parse.urlsplit(url)
+        try:
+            port = parts.port
+        except ValueError as ex:
+            raise exceptions.Error(f"Invalid cache URL {url}") from ex
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise exceptions.Error(f"Invalid cache URL {url}")
+        self._connection_type = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._host = parts.hostname
+        self._port = port
+        self._path = parts.path.rstrip("/")
+        self._timeout = timeout
+        self._connection = None
+        self._reused = False
+        self._available = True
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._errors = 0
+        self._requests = 0
+        self._latency = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _send(self, method, key, body):
+        if self._connection is None:
+            self._connection = self._connection_type(
+                self._host, self._port, timeout=self._timeout
+            )
+            self._reused = False
+        headers = {"Content-Type": "text/plain; charset=utf-8"} if body else {}
+        self._connection.request(
+            method, f"{self._path}/{key}", body=body, headers=headers
+        )
+        response = self._connection.getresponse()
+        data = response.read()
+        if response.will_close:
+            self.close()
+        else:
+            self._reused = True
+        return (response.status, data)
+
+    def _request(self, method, key, body=None):
+        if not self._available:
+            return None
+        self._requests += 1
+        start = time.perf_counter()
+        try:
+            try:
+                return self._send(method, key, body)
+            except (http.client.RemoteDisconnected, ConnectionResetError):
+                # The server may close an idle connection at any time,
+                # so a request on a reused connection is retried once
+                if not self._reused:
+                    raise
+                self.close()
+                return self._send(method, key, body)
+        except (OSError, http.client.HTTPException):
+            self.close()
+            self._available = False
+            self._errors += 1
+            return None
+        finally:
+            self._latency += time.perf_counter() - start
+
+    def get(self, key: str) -> typing.Optional[str]:
+        """Return the code stored in the cache
+
+        Parameters:
+          key: The fingerprint of the code
+
+        Returns:
+          The code, or ``None`` if it is not in the cache, or the
+          cache is unavailable
+        """
+        response = self._request("GET", key)
+        if response is None:
+            return None
+        (status, data) = response
+        if status == http.client.OK:
+            try:
+                code = data.decode("utf-8")
+            except UnicodeDecodeError:
+                self._errors += 1
+                return None
+            self._hits += 1
+            return code
+        if status == http.client.NOT_FOUND:
+            self._misses += 1
+        else:
+            self._errors += 1
+        return None
+
+    def put(self, key: str, code: str) -> bool:
+        """Store code in the cache
+
+        Parameters:
+          key: The fingerprint of the code
+          code: The code
+
+        Returns:
+          ``True`` if the code was stored, ``False`` otherwise
+        """
+        response = self._request("PUT", key, code.encode("utf-8"))
+        if response is None:
+            return False
+        (status, _) = response
+        if 200 <= status < 300:
+            self._stores += 1
+            return True
+        self._errors += 1
+        return False
+
+    def generate(self, enum: definitions.Enum, *, processes: int = 1, **options) -> str:
+        """Generate code for an enhanced enum, fetching it from the cache if possible
+
+        The code is looked up from the cache by the fingerprint of
+        its plan. If it is not found, it is generated and stored in
+        the cache. The enum definition is made only once, and used
+        both for planning and generating the code.
+
+        Parameters:
+          enum: The enum definition
+          processes: The number of processes used to generate the code
+            if it is not in the cache
+          options: The keyword arguments passed to :func:`enumecg.plan()`
+            and :func:`enumecg.generate()`
+
+        Returns:
+          The same code that :func:`enumecg.generate()` returns
+
+        Raises:
+          :exc:`exceptions.Error`: If the code cannot be generated from
+            the definition.
+        """
+        definition = _make_definition(enum, **options)
+        fingerprint = plan(definition, **options).fingerprint
+        code = self.get(fingerprint)
+        if code is None:
+            code = generate(definition, processes=processes, **options)
+            self.put(fingerprint, code)
+        return code
+
+    def info(self) -> CacheInfo:
+        """Return statistics of the requests made to the cache"""
+        return CacheInfo(
+            hits=self._hits,
+            misses=self._misses,
+            stores=self._stores,
+            errors=self._errors,
+            requests=self._requests,
+            latency=self._latency,
+        )
+
+    def close(self):
+        """Close the connection to the cache
+
+        A new connection is opened if the cache is used after closing.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
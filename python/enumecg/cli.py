@@ -6,12 +6,28 @@ Contains the command line interface to EnumECG. The entry point is
 :func:`cli()`.
 """
 
+import contextlib
+import json
+import os
 import traceback
+import typing
 
 import click
-import yaml
 
-from . import generate
+from . import (
+    batch,
+    cache,
+    exceptions,
+    generate,
+    generate_label_enum,
+    generate_module,
+    generate_python_module,
+    generator,
+    loaders,
+    plan,
+    watch,
+    _make_definition,
+)
 from .generators import DocumentationStyle
 from .definitions import PrimaryType
 
@@ -20,12 +36,520 @@ def _get_enum_values(enum_type):
     return [e.value for e in enum_type.__members__.values()]
 
 
-def _report_error_and_fail(message):
+def _report_error_and_fail(message) -> typing.NoReturn:
     click.secho(message, err=True, fg="red")
     traceback.print_exc()
     raise click.Abort()
 
 
+def _get_output_path(output_dir, path, extension=".hh"):
+    stem, _ = os.path.splitext(os.path.basename(path))
+    return os.path.join(output_dir, stem + extension)
+
+
+def _get_label_header_path(path):
+    root, extension = os.path.splitext(path)
+    return root + "_label" + extension
+
+
+def _write_if_changed(path, content):
+    try:
+        with open(path, encoding="utf-8") as existing:
+            if existing.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "w", encoding="utf-8") as out:
+        out.write(content)
+    return True
+
+
+def _touch(path):
+    with open(path, "a", encoding="utf-8"):
+        os.utime(path)
+
+
+def _escape_make_path(path):
+    return path.replace("$", "$$").replace("#", "\\#").replace(" ", "\\ ")
+
+
+def _write_depfile(path, targets, dependencies):
+    targets = [_escape_make_path(os.path.abspath(target)) for target in targets]
+    dependencies = dict.fromkeys(
+        _escape_make_path(os.path.abspath(dependency)) for dependency in dependencies
+    )
+    with open(path, "w", encoding="utf-8") as out:
+        out.write(" ".join(targets) + ":")
+        for dependency in dependencies:
+            out.write(f" \\\n  {dependency}")
+        out.write("\n")
+
+
+def _get_loader_options(input_format, typename):
+    return {
+        "format": loaders.Format(input_format) if input_format else None,
+        "typename": typename,
+    }
+
+
+def _load_enum(file, input_format, typename):
+    return loaders.load(file, **_get_loader_options(input_format, typename))
+
+
+def _load_from_file(path, load_options):
+    try:
+        file = click.open_file(path, encoding="utf-8")
+    except OSError as ex:
+        raise click.FileError(path, hint=ex.strerror) from ex
+    with file:
+        try:
+            return _load_enum(file, **load_options)
+        except Exception:  # pylint: disable=broad-except
+            _report_error_and_fail(f"Failed to load {file.name}")
+
+
+def _plan_definition(definition, fingerprints, path, **options):
+    # Record the fingerprint of the generated code for the results, planning
+    # the definition already made for generating the code instead of loading
+    # the file again
+    if fingerprints is not None:
+        fingerprints[path] = plan(definition, **options).fingerprint
+
+
+def _generate_from_file(
+    path, load_options, remote_cache=None, fingerprints=None, processes=1, **options
+):
+    enum = _load_from_file(path, load_options)
+    try:
+        definition = _make_definition(enum, **options)
+        _plan_definition(definition, fingerprints, path, **options)
+        if remote_cache:
+            return remote_cache.generate(definition, processes=processes, **options)
+        return generate(definition, processes=processes, **options)
+    except Exception:  # pylint: disable=broad-except
+        _report_error_and_fail(f"Failed to generate code from {path}")
+
+
+def _generate_split_headers_from_file(
+    path, header, load_options, fingerprints=None, processes=1, **options
+):
+    enum = _load_from_file(path, load_options)
+    label_header = _get_label_header_path(header)
+    try:
+        definition = _make_definition(enum, **options)
+        _plan_definition(definition, fingerprints, path, label_enum=False, **options)
+        label_code = generate_label_enum(
+            definition,
+            documentation=options["documentation"],
+            primary_type=options["primary_type"],
+        )
+        code = generate(definition, label_enum=False, processes=processes, **options)
+    except Exception:  # pylint: disable=broad-except
+        _report_error_and_fail(f"Failed to generate code from {path}")
+    return [
+        (label_header, "#pragma once\n\n" + label_code),
+        (header, f'#include "{os.path.basename(label_header)}"\n\n' + code),
+    ]
+
+
+def _generate_python_module_from_file(path, load_options, primary_type):
+    enum = _load_from_file(path, load_options)
+    try:
+        return generate_python_module(enum, primary_type=primary_type)
+    except Exception:  # pylint: disable=broad-except
+        _report_error_and_fail(f"Failed to generate Python module from {path}")
+
+
+def _generate_module_from_files(paths, load_options, **options):
+    enums = [_load_from_file(path, load_options) for path in paths]
+    try:
+        return generate_module(enums, **options)
+    except Exception:  # pylint: disable=broad-except
+        _report_error_and_fail(f"Failed to generate module {options['module_name']}")
+
+
+def _load_manifest(path):
+    with open(path, encoding="utf-8") as file:
+        try:
+            return batch.load_manifest(file)
+        except Exception:  # pylint: disable=broad-except
+            _report_error_and_fail(f"Failed to load manifest {path}")
+
+
+def _parse_shard(ctx, param, value):  # pylint: disable=unused-argument
+    if value is None:
+        return None
+    try:
+        return batch.parse_shard(value)
+    except exceptions.Error as ex:
+        raise click.BadParameter(str(ex)) from ex
+
+
+def _plan_jobs(jobs, load_options, **options):
+    try:
+        plans = batch.plan(
+            jobs, load_options=_get_loader_options(**load_options), **options
+        )
+    except Exception:  # pylint: disable=broad-except
+        _report_error_and_fail("Failed to plan headers")
+    return [job_plan.plan.fingerprint for job_plan in plans]
+
+
+def _write_results(path, shard, jobs, fingerprints, statuses):
+    with open(path, "w", encoding="utf-8") as out:
+        batch.dump_results(
+            [
+                batch.JobResult(job, fingerprint, status)
+                for (job, fingerprint, status) in zip(jobs, fingerprints, statuses)
+            ],
+            out,
+            shard=shard or batch.Shard(1, 1),
+        )
+
+
+def _report_stale(stale, total):
+    for header in stale:
+        click.echo(header)
+    if stale:
+        raise click.ClickException(f"{len(stale)} of {total} headers are stale")
+
+
+def _run_check(jobs, processes, load_options, results_path, shard, **options):
+    try:
+        stale = batch.check(
+            jobs,
+            processes=processes,
+            load_options=_get_loader_options(**load_options),
+            **options,
+        )
+    except Exception:  # pylint: disable=broad-except
+        _report_error_and_fail("Failed to check headers")
+    if results_path:
+        stale_jobs = set(stale)
+        _write_results(
+            results_path,
+            shard,
+            jobs,
+            _plan_jobs(jobs, load_options, **options),
+            ["stale" if job in stale_jobs else "up-to-date" for job in jobs],
+        )
+    _report_stale([job.header for job in stale], len(jobs))
+
+
+def _run_merge(paths, results_path):
+    with contextlib.ExitStack() as stack:
+        files = [stack.enter_context(open(path, encoding="utf-8")) for path in paths]
+        try:
+            results = batch.merge_results(files)
+        except Exception:  # pylint: disable=broad-except
+            _report_error_and_fail("Failed to merge results")
+    with click.open_file(results_path or "-", "w") as out:
+        batch.dump_results(results, out)
+        if not results_path:
+            out.write("\n")
+    _report_stale(
+        [result.job.header for result in results if result.status == "stale"],
+        len(results),
+    )
+
+
+def _open_cache(url, timeout):
+    if not url:
+        return None
+    try:
+        return cache.RemoteCache(url, timeout=timeout)
+    except exceptions.Error as ex:
+        raise click.BadParameter(str(ex), param_hint="--cache-url") from ex
+
+
+def _report_cache_info(info):
+    average_ms = 1000 * info.latency / info.requests if info.requests else 0.0
+    click.echo(
+        f"Cache: {info.hits} hits, {info.misses} misses, {info.stores} stores, "
+        f"{info.errors} errors, {average_ms:.1f} ms average latency",
+        err=True,
+    )
+
+
+def _run_plan(jobs, load_options, **options):
+    try:
+        plans = batch.plan(
+            jobs, load_options=_get_loader_options(**load_options), **options
+        )
+    except Exception:  # pylint: disable=broad-except
+        _report_error_and_fail("Failed to plan headers")
+    click.echo(json.dumps([job_plan.asdict() for job_plan in plans], indent=2))
+
+
+def _report_event(events, event, path, *, output=None, error=None):
+    if events == "json":
+        record = {"event": event, "input": path}
+        if output:
+            record["output"] = output
+        if error:
+            record["error"] = error
+        click.echo(json.dumps(record))
+    else:
+        message = f"{event}: {path}"
+        if output:
+            message += f" -> {output}"
+        if error:
+            message += f": {error}"
+        click.secho(message, fg="red" if error else None)
+
+
+def _run_watch(directory, output_dir, events, load_options, **options):
+    def _regenerate(path):
+        output_path = _get_output_path(output_dir, path)
+        try:
+            with open(path, encoding="utf-8") as file:
+                output = generate(_load_enum(file, **load_options), **options)
+        except Exception as ex:  # pylint: disable=broad-except
+            _report_event(events, "error", path, error=str(ex))
+        else:
+            changed = _write_if_changed(output_path, output + "\n")
+            _report_event(
+                events,
+                "generated" if changed else "unchanged",
+                path,
+                output=output_path,
+            )
+
+    os.makedirs(output_dir, exist_ok=True)
+    try:
+        watch.Watcher(directory).watch(_regenerate)
+    except KeyboardInterrupt:
+        pass
+
+
+_GENERATOR_OPTIONS = (
+    "documentation",
+    "primary_type",
+    "value_type",
+    "names",
+    "narrow_types",
+    "array_sequences",
+    "string_blob",
+)
+
+_INCOMPATIBLE_OPTIONS = {
+    "watch_dir": (
+        "files",
+        "stamp",
+        "depfile",
+        "manifest",
+        "check",
+        "plan_only",
+        "module_name",
+        "python",
+        "split_headers",
+        "shard",
+        "results_path",
+        "merge_results",
+        "cache_url",
+    ),
+    "merge_results": (
+        "manifest",
+        "output_dir",
+        "stamp",
+        "depfile",
+        "check",
+        "plan_only",
+        "module_name",
+        "python",
+        "split_headers",
+        "shard",
+        "cache_url",
+    ),
+    "manifest": ("files", "output_dir", "module_name"),
+    "plan_only": ("check", "module_name", "stamp", "depfile", "results_path"),
+    "check": ("module_name", "stamp", "depfile"),
+    "python": ("check", "plan_only", "module_name", "shard", "results_path"),
+    "split_headers": ("check", "plan_only", "module_name", "python"),
+    "cache_url": ("check", "plan_only", "module_name", "python", "split_headers"),
+    "shard": ("module_name",),
+    "results_path": ("module_name",),
+}
+"""Options mapped to the options they cannot be used with"""
+
+_REQUIRED_OPTIONS = {
+    "watch_dir": ("output_dir",),
+    "merge_results": ("files",),
+    "check": ("output_dir", "manifest"),
+    "split_headers": ("output_dir", "manifest"),
+    "shard": ("output_dir", "manifest"),
+    "results_path": ("output_dir", "manifest", "merge_results"),
+    "depfile": ("output_dir", "manifest", "stamp"),
+}
+"""Options mapped to the options of which at least one they require"""
+
+
+def _format_options(names):
+    params = {param.name: param for param in click.get_current_context().command.params}
+    options = [
+        params[name].opts[0] if isinstance(params[name], click.Option) else "FILE"
+        for name in names
+    ]
+    if len(options) == 1:
+        return options[0]
+    return ", ".join(options[:-1]) + " or " + options[-1]
+
+
+def _validate_options(params):
+    for name, incompatible in _INCOMPATIBLE_OPTIONS.items():
+        if params[name]:
+            given = [other for other in incompatible if params[other]]
+            if given:
+                raise click.UsageError(
+                    f"{_format_options([name])} cannot be used with "
+                    f"{_format_options(given)}"
+                )
+    for name, required in _REQUIRED_OPTIONS.items():
+        if params[name] and not any(params[other] for other in required):
+            raise click.UsageError(
+                f"{_format_options([name])} requires {_format_options(required)}"
+            )
+
+
+def _check_unique_headers(jobs):
+    definitions = {}
+    for job in jobs:
+        if job.header:
+            other = definitions.setdefault(os.path.normpath(job.header), job.definition)
+            if other != job.definition:
+                raise click.UsageError(
+                    f"Both {other} and {job.definition} would be written to {job.header}"
+                )
+
+
+def _get_jobs(params):
+    if params["manifest"]:
+        jobs = _load_manifest(params["manifest"])
+    else:
+        files = params["files"] or ("-",)
+        output_dir = params["output_dir"]
+        if output_dir and "-" in files:
+            raise click.UsageError("Cannot read standard input with --output-dir")
+        extension = ".py" if params["python"] else ".hh"
+        jobs = [
+            batch.Job(
+                path,
+                _get_output_path(output_dir, path, extension) if output_dir else None,
+            )
+            for path in files
+        ]
+    _check_unique_headers(jobs)
+    return jobs
+
+
+def _iter_outputs(  # pylint: disable=too-many-arguments
+    jobs, load_options, options, params, *, remote_cache, fingerprints
+):
+    if params["module_name"]:
+        module_name = params["module_name"]
+        output_dir = params["output_dir"]
+        yield (
+            os.path.join(output_dir, f"{module_name}.cppm") if output_dir else None,
+            _generate_module_from_files(
+                [job.definition for job in jobs],
+                load_options,
+                module_name=module_name,
+                namespace=params["namespace"],
+                processes=params["processes"],
+                **options,
+            ),
+        )
+    elif params["split_headers"]:
+        for job in jobs:
+            yield from _generate_split_headers_from_file(
+                job.definition,
+                job.header,
+                load_options,
+                fingerprints=fingerprints,
+                processes=params["processes"],
+                **options,
+            )
+    elif params["python"]:
+        for job in jobs:
+            yield (
+                job.header,
+                _generate_python_module_from_file(
+                    job.definition, load_options, options["primary_type"]
+                ),
+            )
+    else:
+        for job in jobs:
+            yield (
+                job.header,
+                _generate_from_file(
+                    job.definition,
+                    load_options,
+                    remote_cache=remote_cache,
+                    fingerprints=fingerprints,
+                    processes=params["processes"],
+                    **options,
+                ),
+            )
+
+
+def _write_outputs(outputs):
+    written = []
+    changed = set()
+    for output_path, output in outputs:
+        if output_path:
+            os.makedirs(os.path.dirname(output_path) or os.curdir, exist_ok=True)
+            if _write_if_changed(output_path, output + "\n"):
+                changed.add(output_path)
+            written.append(output_path)
+        else:
+            click.echo(output)
+    return (written, changed)
+
+
+def _run_generate(jobs, load_options, options, params):
+    remote_cache = _open_cache(params["cache_url"], params["cache_timeout"])
+    fingerprints = {} if params["results_path"] else None
+    with remote_cache or contextlib.nullcontext():
+        (written, changed) = _write_outputs(
+            _iter_outputs(
+                jobs,
+                load_options,
+                options,
+                params,
+                remote_cache=remote_cache,
+                fingerprints=fingerprints,
+            )
+        )
+    if remote_cache:
+        _report_cache_info(remote_cache.info())
+
+    if params["results_path"]:
+        _write_results(
+            params["results_path"],
+            params["shard"],
+            jobs,
+            [fingerprints[job.definition] for job in jobs],
+            [
+                "generated"
+                if job.header in changed
+                or _get_label_header_path(job.header) in changed
+                else "unchanged"
+                for job in jobs
+            ],
+        )
+
+    if params["depfile"]:
+        _write_depfile(
+            params["depfile"],
+            [params["stamp"]] if params["stamp"] else written,
+            [job.definition for job in jobs if job.definition != "-"]
+            + generator(documentation=options["documentation"]).get_dependencies(),
+        )
+
+    if params["stamp"]:
+        _touch(params["stamp"])
+
+
 @click.command()
 @click.option(
     "--documentation",
@@ -38,17 +562,223 @@ def _report_error_and_fail(message):
     help="Primary enumeration type",
 )
 @click.option("--value-type", help="Enumerator value type")
-@click.argument("file", type=click.File(), default="-")
-def cli(file, documentation, primary_type, value_type):
+@click.option(
+    "--names",
+    is_flag=True,
+    help="Generate enumerator name table and lookup by name",
+)
+@click.option(
+    "--narrow-types",
+    is_flag=True,
+    help="Deduce the narrowest numeric types fitting the enumerator values",
+)
+@click.option(
+    "--array-sequences",
+    is_flag=True,
+    help="Deduce std::array for sequences whose elements have the same type",
+)
+@click.option(
+    "--string-blob",
+    is_flag=True,
+    help="Store string values in a single character array",
+)
+@click.option(
+    "--format",
+    "input_format",
+    type=click.Choice(_get_enum_values(loaders.Format)),
+    help="Format of the definition files  [default: deduced from extension]",
+)
+@click.option("--typename", help="Override the typename of the definitions")
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False, writable=True),
+    help="Write a header for each FILE to this directory",
+)
+@click.option(
+    "--stamp",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Touch this file after successful generation",
+)
+@click.option(
+    "--depfile",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write Makefile dependency rules for the outputs to this file",
+)
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Read pairs of definition files and headers from this JSON file",
+)
+@click.option(
+    "--check",
+    is_flag=True,
+    help="Check that the headers are up to date instead of writing them",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    "processes",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of parallel processes used by --check and for large enums",
+)
+@click.option(
+    "--plan",
+    "plan_only",
+    is_flag=True,
+    help="Print the headers that would be generated as JSON instead of writing them",
+)
+@click.option(
+    "--module",
+    "module_name",
+    help="Generate a C++20 module interface with this name from all FILEs",
+)
+@click.option(
+    "--namespace", help="Namespace of the definitions in the module interface"
+)
+@click.option(
+    "--python",
+    is_flag=True,
+    help="Generate Python modules containing the enums instead of C++ headers",
+)
+@click.option(
+    "--split-headers",
+    is_flag=True,
+    help="Write the label enum of each FILE to a separate header",
+)
+@click.option(
+    "--shard",
+    metavar="INDEX/COUNT",
+    callback=_parse_shard,
+    help="Process only the jobs assigned to this shard of the batch",
+)
+@click.option(
+    "--results",
+    "results_path",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the fingerprint and outcome of each job to this JSON file",
+)
+@click.option(
+    "--merge-results",
+    is_flag=True,
+    help="Merge the result files given as FILEs instead of generating code",
+)
+@click.option(
+    "--cache-url",
+    metavar="URL",
+    help="Fetch the generated headers from, and store them in, this HTTP cache",
+)
+@click.option(
+    "--cache-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=cache.DEFAULT_TIMEOUT,
+    show_default=True,
+    help="Timeout in seconds of the requests to --cache-url",
+)
+@click.option(
+    "--watch",
+    "watch_dir",
+    type=click.Path(exists=True, file_okay=False),
+    help="Watch definitions in this directory and regenerate them when changed",
+)
+@click.option(
+    "--events",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    show_default=True,
+    help="Format of the events reported in watch mode",
+)
+@click.argument(
+    "files",
+    metavar="[FILE]...",
+    nargs=-1,
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+)
+def cli(**params):
     """Generate C++ boilerplate for an Enhanced Enum definition
 
     This executable is a part of the Enhanced Enum library. It is used
     to generate the necessary C++ boilerplate to make an enumeration
     type work with the library.
 
-    FILE is a YAML file containing the definition of the enum type. If
-    FILE is - or no FILE is given, the definition is read from the
-    standard input.
+    FILE is a YAML, JSON or CSV file containing the definition of the
+    enum type. The format is deduced from the extension of FILE unless
+    given with --format. A CSV file is a table of enumerator names and
+    values, and the typename is deduced from the name of FILE unless
+    given with --typename. If FILE is - or no FILE is given, the
+    definition is read from the standard input.
+
+    If --output-dir is given, the code generated from each FILE is
+    written to a header in that directory, named after the FILE with
+    its extension replaced by .hh. It is an error if two FILEs would
+    be written to the same header. Headers whose content would not
+    change are not rewritten, so that their timestamps are
+    preserved. Otherwise the generated code is printed to the standard
+    output.
+
+    If --manifest is given, the definition files and the headers
+    generated from them are read from a JSON file containing a list of
+    objects with "definition" and "header" keys, instead of FILE and
+    --output-dir.
+
+    If --check is given, nothing is written. Instead each header is
+    compared against the code that would be generated for it. The
+    stale headers are printed, and the exit status is non-zero if
+    there are any. The headers can be checked in parallel with --jobs.
+    Otherwise --jobs sets the number of processes used to generate the
+    code for enums with a large number of members.
+
+    If --plan is given, nothing is generated. Instead a JSON list is
+    printed, containing for each FILE the path of the header, the
+    deduced typenames and a fingerprint of the code that would be
+    generated. The fingerprint changes whenever the generated code
+    would change.
+
+    If --module is given, a single C++20 module interface unit
+    containing the definitions from all FILEs is generated instead. It
+    is written to the file named after the module with extension
+    .cppm in --output-dir, or printed to the standard output.
+
+    If --python is given, a Python module containing an enum class and
+    tables for looking up its members by value and by name is generated
+    from each FILE instead. With --output-dir, the modules are named
+    after the FILEs with their extensions replaced by .py.
+
+    If --split-headers is given, the label enum generated from each
+    FILE is written to its own header, named after the header of the
+    FILE with _label appended to its stem. The header of the FILE
+    includes the label header, and contains the rest of the code.
+    Translation units that only use the labels can include the label
+    header alone.
+
+    If --shard is given, only the headers assigned to that shard of
+    the batch are generated or checked. The headers are assigned to
+    COUNT shards by a hash of their paths relative to --output-dir or
+    the directory of --manifest, so that the shards can be processed
+    on different machines. If --results is given, the fingerprint of
+    the code generated for each header and whether the header was
+    written, or was stale when checking, are written to a JSON
+    file. If --merge-results is given, the result files of all shards
+    given as FILEs are merged into one, written to --results or
+    printed. The exit status is non-zero if any shard is missing or
+    any header is stale.
+
+    If --cache-url is given, the code for each header is first looked
+    up from an HTTP cache by the fingerprint of the code, and only
+    generated if it is not found, in which case it is also stored in
+    the cache. If the cache cannot be reached within --cache-timeout,
+    the code is generated locally. Statistics of the cache requests
+    are printed to the standard error.
+
+    If --depfile is given, a Makefile rule listing every file read
+    during the generation is written for the stamp file, or the
+    generated headers if no stamp is given.
+
+    If --watch is given, the definitions in the directory are watched
+    and the headers in --output-dir regenerated whenever they
+    change. An event is printed for each regenerated header, either as
+    a status line, or as a JSON object if --events=json is given.
 
     For a full discussion of the purpose of the library, and a
     detailed description of the code generation process, see:
@@ -56,19 +786,50 @@ def cli(file, documentation, primary_type, value_type):
         https://enhanced-enum.readthedocs.io/en/latest/
 
     """
-    try:
-        enum = yaml.safe_load(file)
-    except Exception:  # pylint: disable=broad-except
-        _report_error_and_fail(f"Failed to load {file.name}")
+    _validate_options(params)
+    load_options = {
+        "input_format": params["input_format"],
+        "typename": params["typename"],
+    }
+    options = {name: params[name] for name in _GENERATOR_OPTIONS}
 
-    try:
-        output = generate(
-            enum,
-            documentation=documentation,
-            primary_type=primary_type,
-            value_type=value_type,
+    if params["watch_dir"]:
+        _run_watch(
+            params["watch_dir"],
+            params["output_dir"],
+            params["events"],
+            load_options,
+            **options,
         )
-    except Exception:  # pylint: disable=broad-except
-        _report_error_and_fail(f"Failed to generate code from {file.name}")
+        return
+
+    if params["merge_results"]:
+        if "-" in params["files"]:
+            raise click.UsageError("--merge-results requires result files as FILE")
+        _run_merge(params["files"], params["results_path"])
+        return
 
-    click.echo(output)
+    jobs = _get_jobs(params)
+    if params["shard"]:
+        manifest = params["manifest"]
+        jobs = batch.select_shard(
+            jobs,
+            params["shard"],
+            root=os.path.dirname(manifest) if manifest else params["output_dir"],
+        )
+
+    if params["plan_only"]:
+        if any(job.definition == "-" for job in jobs):
+            raise click.UsageError("Cannot read standard input with --plan")
+        _run_plan(jobs, load_options, **options)
+    elif params["check"]:
+        _run_check(
+            jobs,
+            params["processes"],
+            load_options,
+            params["results_path"],
+            params["shard"],
+            **options,
+        )
+    else:
+        _run_generate(jobs, load_options, options, params)
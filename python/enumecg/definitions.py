@@ -7,9 +7,14 @@ representation of an enum definition.
 """
 
 import collections.abc as cabc
+import concurrent.futures
+import copy
 import enum as py_enum
 import dataclasses
+import itertools
+import multiprocessing
 import typing
+import weakref
 
 import docstring_parser
 
@@ -45,8 +50,11 @@ class EnumMemberDefinition:
     enumerator_name: str
     enumerator_value_constant_name: str
     enumerator_value_initializers: typing.Union[typing.Sequence, str]
+    enumerator_value: typing.Any = dataclasses.field(default=None, compare=False)
+    """The Python value of the enumerator, if the definition was made from one"""
 
 
+# pylint: disable=too-many-instance-attributes
 @dataclasses.dataclass
 class EnumDefinition:
     """Enum definition"""
@@ -58,6 +66,8 @@ class EnumDefinition:
     associate_namespace_name: str
     label_enum_documentation: typing.Optional[EnumDocumentation] = None
     enhanced_enum_documentation: typing.Optional[EnumDocumentation] = None
+    flags_typename: typing.Optional[str] = None
+    """The typename of the flags type, if the enum is a flags enum"""
 
 
 Enum = typing.Union[EnumDefinition, typing.Mapping, py_enum.EnumMeta]
@@ -68,72 +78,260 @@ are used to generate enhanced enum definition.
 """
 
 
-def _make_definition_from_dict(enum_dict, *, primary_type, value_type):
-    typename = enum_dict["typename"]
-    members = enum_dict["members"]
-    formatter = utils.NameFormatter(typename)
-    member_formatter = utils.NameFormatter(*(member["name"] for member in members))
-    label_enum_typename = (
-        formatter.join(formatter.parts[0] + ["label"])
-        if primary_type != PrimaryType.label
-        else typename
-    )
-    enhanced_enum_typename = (
-        formatter.join(["enhanced"] + formatter.parts[0])
-        if primary_type != PrimaryType.enhanced
-        else typename
-    )
-    type_deducer = utils.CppTypeDeducer(
-        *(member["value"] for member in members), type_name=value_type
-    )
-    unparsed_docstring = enum_dict.get("docstring")
-    if unparsed_docstring:
-        parsed_docstring = docstring_parser.parse(unparsed_docstring)
-        documentation = EnumDocumentation(
-            short_description=parsed_docstring.short_description,
-            long_description=parsed_docstring.long_description,
+def _iter_free_bits(used):
+    return (bit for bit in (1 << n for n in itertools.count()) if bit not in used)
+
+
+def _make_flag_values(members):
+    values = [member.get("value") for member in members]
+    names = {}
+    for (member, value) in zip(members, values):
+        if value is None:
+            continue
+        if (
+            isinstance(value, bool)
+            or not isinstance(value, int)
+            or value <= 0
+            or value & (value - 1)
+        ):
+            raise exceptions.Error(
+                f"Value {value!r} of flag {member['name']!r} is not a power of two"
+            )
+        if value in names:
+            raise exceptions.Error(
+                f"Flags {names[value]!r} and {member['name']!r} have the same value"
+            )
+        names[value] = member["name"]
+    free_bits = _iter_free_bits(names)
+    return [next(free_bits) if value is None else value for value in values]
+
+
+class _EnumDictConverter:
+    """Converts a dict into an enum definition, a range of members at a time"""
+
+    def __init__(
+        self, enum_dict, *, primary_type, value_type, narrow_types, array_sequences
+    ):
+        typename = enum_dict["typename"]
+        self._members = enum_dict["members"]
+        flags = enum_dict.get("flags", False)
+        self._values = (
+            _make_flag_values(self._members)
+            if flags
+            else [member["value"] for member in self._members]
         )
-    else:
-        documentation = None
-    return EnumDefinition(
-        label_enum_typename=label_enum_typename,
-        enhanced_enum_typename=enhanced_enum_typename,
-        value_type_typename=type_deducer.type_name,
-        members=[
+        formatter = utils.NameFormatter(typename)
+        self._member_formatter = utils.NameFormatter(
+            *(member["name"] for member in self._members)
+        )
+        label_enum_typename = (
+            formatter.join(formatter.parts[0] + ["label"])
+            if primary_type != PrimaryType.label
+            else typename
+        )
+        enhanced_enum_typename = (
+            formatter.join(["enhanced"] + formatter.parts[0])
+            if primary_type != PrimaryType.enhanced
+            else typename
+        )
+        self._type_deducer = utils.CppTypeDeducer(
+            *self._values,
+            type_name=value_type,
+            narrow=narrow_types,
+            arrays=array_sequences,
+        )
+        unparsed_docstring = enum_dict.get("docstring")
+        if unparsed_docstring:
+            parsed_docstring = docstring_parser.parse(unparsed_docstring)
+            documentation = EnumDocumentation(
+                short_description=parsed_docstring.short_description,
+                long_description=parsed_docstring.long_description,
+            )
+        else:
+            documentation = None
+        self.definition = EnumDefinition(
+            label_enum_typename=label_enum_typename,
+            enhanced_enum_typename=enhanced_enum_typename,
+            value_type_typename=self._type_deducer.type_name,
+            members=[],
+            associate_namespace_name=formatter.join(formatter.parts[0], pluralize=True),
+            label_enum_documentation=documentation
+            if primary_type == PrimaryType.label
+            else None,
+            enhanced_enum_documentation=documentation
+            if primary_type == PrimaryType.enhanced
+            else None,
+            flags_typename=formatter.join(formatter.parts[0] + ["flags"])
+            if flags
+            else None,
+        )
+
+    def __len__(self):
+        return len(self._members)
+
+    def make_members(self, start, stop):
+        """Make the definitions of the members in the range ``[start, stop)``"""
+        return [
             EnumMemberDefinition(
                 enumerator_name=member["name"],
-                enumerator_value_constant_name=member_formatter.join(
-                    member_formatter.parts[n] + ["value"]
+                enumerator_value_constant_name=self._member_formatter.join(
+                    self._member_formatter.parts[n] + ["value"]
                 ),
-                enumerator_value_initializers=type_deducer.get_initializer(
-                    member["value"]
+                enumerator_value_initializers=self._type_deducer.get_value_initializer(
+                    value
                 ),
+                enumerator_value=value,
+            )
+            for (n, (member, value)) in enumerate(
+                zip(self._members[start:stop], self._values[start:stop]), start
             )
-            for (n, member) in enumerate(members)
-        ],
-        associate_namespace_name=formatter.join(formatter.parts[0], pluralize=True),
-        label_enum_documentation=documentation
-        if primary_type == PrimaryType.label
-        else None,
-        enhanced_enum_documentation=documentation
-        if primary_type == PrimaryType.enhanced
-        else None,
+        ]
+
+
+class _EnumDefinitionSlicer:
+    """Returns the members of an existing enum definition a range at a time"""
+
+    def __init__(self, definition):
+        self._members = definition.members
+        self.definition = dataclasses.replace(definition, members=[])
+
+    def __len__(self):
+        return len(self._members)
+
+    def make_members(self, start, stop):
+        """Return the definitions of the members in the range ``[start, stop)``"""
+        return list(self._members[start:stop])
+
+
+def _make_definition_from_dict(enum_dict, **options):
+    converter = _EnumDictConverter(enum_dict, **options)
+    return dataclasses.replace(
+        converter.definition, members=converter.make_members(0, len(converter))
     )
 
 
+def _is_single_flag(member):
+    return member.value > 0 and not member.value & (member.value - 1)
+
+
 def _extract_python_enum_attrs(enum):
+    flags = issubclass(enum, py_enum.Flag)
+    # Iterating a flag enum yields the empty and composite members before
+    # Python 3.11 but not after, so they are skipped explicitly
+    members = [member for member in enum if not flags or _is_single_flag(member)]
     return {
         "typename": enum.__name__,
-        "members": [{"name": member.name, "value": member.value} for member in enum],
+        "members": [{"name": member.name, "value": member.value} for member in members],
         "docstring": enum.__doc__,
+        "flags": flags,
     }
 
 
+class DefinitionCacheInfo(typing.NamedTuple):
+    """Statistics of the definition cache
+
+    Returned by :func:`get_definition_cache_info()`.
+    """
+
+    hits: int
+    """Number of definitions returned from the cache"""
+
+    misses: int
+    """Number of definitions created because they were not in the cache"""
+
+    size: int
+    """Number of definitions currently in the cache"""
+
+
+def _copy_definition(definition):
+    return dataclasses.replace(
+        definition,
+        members=[copy.copy(member) for member in definition.members],
+        label_enum_documentation=copy.copy(definition.label_enum_documentation),
+        enhanced_enum_documentation=copy.copy(definition.enhanced_enum_documentation),
+    )
+
+
+class _DefinitionCache:
+    def __init__(self):
+        self._definitions = weakref.WeakKeyDictionary()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, enum, key, factory):
+        """Return a copy of the definition cached for the enum and the key
+
+        If there is no definition in the cache, it is created by
+        calling the factory, and only cached if the factory
+        succeeds. The definition and its members are copied, but the
+        enumerator values are shared with the cached definition.
+        """
+        definitions = self._definitions.get(enum, {})
+        try:
+            definition = definitions[key]
+        except KeyError:
+            self._misses += 1
+            definition = factory()
+            self._definitions.setdefault(enum, {})[key] = definition
+        else:
+            self._hits += 1
+        return _copy_definition(definition)
+
+    def clear(self):
+        """Remove all definitions and reset the statistics"""
+        self._definitions.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def info(self):
+        """Return the statistics as :class:`DefinitionCacheInfo`"""
+        return DefinitionCacheInfo(
+            hits=self._hits,
+            misses=self._misses,
+            size=sum(len(definitions) for definitions in self._definitions.values()),
+        )
+
+
+_DEFINITION_CACHE = _DefinitionCache()
+
+
+def get_definition_cache_info() -> DefinitionCacheInfo:
+    """Return statistics of the definition cache
+
+    :func:`make_definition()` caches the definitions it creates from
+    Python enum classes. The cache is keyed by the enum class and the
+    options, and the entries are discarded when the enum class is
+    garbage collected.
+    """
+    return _DEFINITION_CACHE.info()
+
+
+def clear_definition_cache():
+    """Clear the definition cache
+
+    Removes all definitions from the cache used by
+    :func:`make_definition()`, and resets the statistics returned by
+    :func:`get_definition_cache_info()`.
+    """
+    _DEFINITION_CACHE.clear()
+
+
+def _make_definition_from_mapping(enum, **options):
+    try:
+        return _make_definition_from_dict(enum, **options)
+    except (KeyError, AttributeError, TypeError, ValueError) as ex:
+        raise exceptions.Error(
+            f"Failed to convert {enum!r} into an enum definition"
+        ) from ex
+
+
 def make_definition(
     enum: Enum,
     *,
     primary_type: typing.Optional[PrimaryType] = None,
     value_type: typing.Optional[str] = None,
+    narrow_types: bool = False,
+    array_sequences: bool = False,
 ) -> EnumDefinition:
     """Make :class:`EnumDefinition` instance from various types
 
@@ -153,6 +351,18 @@ def make_definition(
         primary_type: A :class:`PrimaryType` enumerator indicating the
                       primary type. See :ref:`enumecg-primary-enum`.
         value_type: See :ref:`enumerator-value-type`.
+        narrow_types: If ``True``, deduce the narrowest numeric types
+                      fitting the values. See :ref:`enumecg-narrow-types`.
+        array_sequences: If ``True``, deduce ``std::array`` for
+                         homogeneous sequences. See :ref:`enumecg-array-sequences`.
+
+    The definitions created from Python enum classes are cached, so
+    that converting the same class with the same options again is
+    cheap. A copy of the cached definition is returned, so it and its
+    members can be modified freely. The enumerator values and
+    initializers of the members are shared with the cached definition
+    instead of copied, and must not be mutated. See
+    :func:`get_definition_cache_info()`.
 
     Raises:
         :exc:`exceptions.Error`: If ``enum`` is invalid and cannot be
@@ -161,18 +371,139 @@ def make_definition(
     if isinstance(enum, EnumDefinition):
         return enum
 
+    options = _get_definition_options(
+        primary_type=primary_type,
+        value_type=value_type,
+        narrow_types=narrow_types,
+        array_sequences=array_sequences,
+    )
+
+    if isinstance(enum, py_enum.EnumMeta):
+        return _DEFINITION_CACHE.get(
+            enum,
+            tuple(options.items()),
+            lambda: _make_definition_from_mapping(
+                _extract_python_enum_attrs(enum), **options
+            ),
+        )
+
+    if not isinstance(enum, cabc.Mapping):
+        raise exceptions.Error(
+            f"Could not convert {enum!r} of type {type(enum)} into EnumDefinition"
+        )
+
+    return _make_definition_from_mapping(enum, **options)
+
+
+def _get_definition_options(
+    *, primary_type=None, value_type=None, narrow_types=False, array_sequences=False
+):
+    return {
+        "primary_type": primary_type,
+        "value_type": value_type,
+        "narrow_types": narrow_types,
+        "array_sequences": array_sequences,
+    }
+
+
+def _make_converter(enum, options):
+    if isinstance(enum, EnumDefinition):
+        return _EnumDefinitionSlicer(enum)
     if isinstance(enum, py_enum.EnumMeta):
         enum = _extract_python_enum_attrs(enum)
     elif not isinstance(enum, cabc.Mapping):
         raise exceptions.Error(
             f"Could not convert {enum!r} of type {type(enum)} into EnumDefinition"
         )
-
     try:
-        return _make_definition_from_dict(
-            enum, primary_type=primary_type, value_type=value_type
-        )
+        return _EnumDictConverter(enum, **options)
     except (KeyError, AttributeError, TypeError, ValueError) as ex:
         raise exceptions.Error(
             f"Failed to convert {enum!r} into an enum definition"
         ) from ex
+
+
+def _map_chunk(start, converter, function, chunk_size):
+    members = converter.make_members(start, start + chunk_size)
+    return function(dataclasses.replace(converter.definition, members=members), start)
+
+
+_CHUNK_WORKER_ARGS = ()
+
+
+def _init_chunk_worker(*args):
+    global _CHUNK_WORKER_ARGS  # pylint: disable=global-statement
+    _CHUNK_WORKER_ARGS = args
+
+
+def _map_chunk_in_worker(start):
+    return _map_chunk(start, *_CHUNK_WORKER_ARGS)
+
+
+def _get_chunk_pool_context():
+    # Fork the workers where possible, so that they inherit the enum instead
+    # of unpickling a copy of it each
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+T = typing.TypeVar("T")
+
+
+def map_member_chunks(
+    enum: Enum,
+    function: typing.Callable[[EnumDefinition, int], T],
+    *,
+    chunk_size: int,
+    processes: int = 1,
+    **options,
+) -> typing.Tuple[EnumDefinition, typing.List[T]]:
+    """Make an enum definition in chunks of members and map a function over them
+
+    This function is used to process the members of very large enums
+    in parallel. The members are split into chunks of ``chunk_size``
+    consecutive members. For each chunk, the member definitions are
+    made and ``function`` is called with an :class:`EnumDefinition`
+    containing only the members of the chunk, and the index of the
+    first member of the chunk.
+
+    The type of the enumerator values and the case style of the
+    enumerator names are deduced from all members before the chunks
+    are processed, so the member definitions are equal to the ones
+    made by :func:`make_definition()`. Unlike :func:`make_definition()`,
+    this function doesn't cache the definitions.
+
+    Parameters:
+        enum: The enum definition
+        function: The function called for each chunk. If ``processes``
+                  is greater than one, it must be picklable.
+        chunk_size: The number of members in each chunk
+        processes: The number of worker processes. If greater than
+                   one and there is more than one chunk, the chunks
+                   are processed in parallel in a process pool.
+        options: The keyword arguments passed to :func:`make_definition()`
+
+    Returns:
+        A tuple containing the enum definition without any members,
+        and the results of ``function`` in the order of the chunks
+
+    Raises:
+        :exc:`exceptions.Error`: If ``enum`` is invalid and cannot be
+          converted to :class:`EnumDefinition`.
+    """
+    converter = _make_converter(enum, _get_definition_options(**options))
+    starts = range(0, max(len(converter), 1), chunk_size)
+    if processes > 1 and len(starts) > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+            min(processes, len(starts)),
+            mp_context=_get_chunk_pool_context(),
+            initializer=_init_chunk_worker,
+            initargs=(converter, function, chunk_size),
+        ) as executor:
+            results = list(executor.map(_map_chunk_in_worker, starts))
+    else:
+        results = [
+            _map_chunk(start, converter, function, chunk_size) for start in starts
+        ]
+    return converter.definition, results
@@ -6,9 +6,18 @@ The module contains the code generator consuming enum definitions and
 outputting C++ code.
 """
 
+import ast
 import collections.abc as cabc
+import dataclasses
 import enum as py_enum
+import functools
+import hashlib
+import itertools
+import json
+import keyword
 import os
+import pkgutil
+import sys
 import typing
 
 import jinja2
@@ -27,6 +36,21 @@ class DocumentationStyle(py_enum.Enum):
     """Doxygen documentation style"""
 
 
+class Backend(py_enum.Enum):
+    """Possible code generator backends
+
+    These are the accepted choices for the ``backend`` argument in
+    :func:`enumecg.generator()`. Both backends generate identical code.
+    """
+
+    jinja = "jinja"
+    """Render the code from Jinja templates (:class:`CodeGenerator`)"""
+
+    direct = "direct"
+    """Write the code directly from preformatted strings
+    (:class:`DirectCodeGenerator`)"""
+
+
 def _make_initializer_list(value):
     if isinstance(value, str):
         return value
@@ -42,10 +66,145 @@ def _make_initializer_list_ensure_outer_braces(value):
     return _make_initializer_list(value)
 
 
+def _freeze(value):
+    if isinstance(value, (str, bytes)) or not isinstance(value, cabc.Sequence):
+        return value
+    return tuple(_freeze(v) for v in value)
+
+
+def _make_python_literal(value):
+    return repr(_freeze(value))
+
+
+def _unique_by_value(members):
+    members_by_value = {}
+    for member in members:
+        members_by_value.setdefault(_freeze(member.enumerator_value), member)
+    return list(members_by_value.values())
+
+
+def _check_python_member(member):
+    name = member.enumerator_name
+    if not name.isidentifier() or keyword.iskeyword(name) or name.startswith("_"):
+        raise exceptions.Error(f"{name!r} is not a valid Python enum member name")
+    if member.enumerator_value is None:
+        raise exceptions.Error(f"Enumerator {name!r} has no Python value")
+
+
+def _get_string_length(member):
+    # The initializers of string values are string literals whose escape
+    # sequences are also valid in Python
+    initializer = member.enumerator_value_initializers
+    try:
+        value = ast.literal_eval(initializer)
+    except (SyntaxError, ValueError):
+        value = None
+    if not isinstance(value, str) or not initializer.startswith('"'):
+        raise exceptions.Error(
+            f"Enumerator {member.enumerator_name!r} is not initialized from a string"
+        )
+    return len(value.encode())
+
+
+def _get_offset_type(size):
+    for bits in [8, 16, 32]:
+        if size < 2**bits:
+            return f"std::uint{bits}_t"
+    return "std::uint64_t"
+
+
+class _StringBlob(typing.NamedTuple):
+    offset_type: str
+    offsets: typing.List[int]
+
+
+def _get_string_lengths(d, members):
+    if d.value_type_typename != "std::string_view":
+        raise exceptions.Error(
+            f"String blob requires std::string_view values, not {d.value_type_typename}"
+        )
+    return [_get_string_length(member) for member in members]
+
+
+def _make_string_blob(lengths):
+    offsets = [0, *itertools.accumulate(lengths)]
+    return _StringBlob(offset_type=_get_offset_type(offsets[-1]), offsets=offsets)
+
+
 def _doxygenize(value):
     return value.replace("\n", "\n * ")
 
 
+def _group_by_name_length(members):
+    groups = {}
+    for member in members:
+        groups.setdefault(len(member.enumerator_name), []).append(member)
+    return sorted(groups.items())
+
+
+def _get_package_sources():
+    package = __name__.rpartition(".")[0]
+    return sorted(
+        module.__file__
+        for (name, module) in list(sys.modules.items())
+        if (name == package or name.startswith(package + "."))
+        and getattr(module, "__file__", None)
+    )
+
+
+def _get_enum_source(enum):
+    if isinstance(enum, py_enum.EnumMeta):
+        module = sys.modules.get(enum.__module__)
+        filename = getattr(module, "__file__", None)
+        if filename:
+            return [filename]
+    return []
+
+
+_FINGERPRINTED_MODULES = ("__init__.py", "definitions.py", "generators.py", "utils.py")
+"""The modules of the package whose source code affects the generated code
+
+The package version is defined in ``__init__.py``, so it is covered too.
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _get_code_digest(env):
+    digest = hashlib.sha256()
+    for name in _FINGERPRINTED_MODULES:
+        digest.update(name.encode())
+        digest.update(pkgutil.get_data(__package__, name))
+    for name in env.list_templates():
+        source, _, _ = env.loader.get_source(env, name)
+        digest.update(name.encode())
+        digest.update(source.encode())
+    return digest.digest()
+
+
+def _make_cxx_definition_dict(items):
+    # The Python values of the enumerators don't affect the C++ code
+    return {key: value for (key, value) in items if key != "enumerator_value"}
+
+
+class EnumPlan(typing.NamedTuple):
+    """The plan for generating code for an enhanced enum
+
+    Returned by :meth:`CodeGenerator.plan_enum_definitions()`.
+    """
+
+    label_enum_typename: str
+    """The typename of the label enum"""
+
+    enhanced_enum_typename: str
+    """The typename of the enhanced enum"""
+
+    value_type_typename: str
+    """The value type of the enum"""
+
+    fingerprint: str
+    """Hexadecimal digest identifying the generated code"""
+
+
 def _create_jinja_env():
     try:
         env = jinja2.Environment(loader=jinja2.PackageLoader(__name__))
@@ -59,9 +218,205 @@ def _create_jinja_env():
         )
     env.filters["initializer_list"] = _make_initializer_list_ensure_outer_braces
     env.filters["doxygenize"] = _doxygenize
+    env.filters["group_by_name_length"] = _group_by_name_length
+    env.filters["python_literal"] = _make_python_literal
+    env.filters["unique_by_value"] = _unique_by_value
     return env
 
 
+_MEMBERS_PER_CHUNK = 50000
+
+
+class _RenderedMembers(typing.NamedTuple):
+    size: int
+    labels: str
+    values: str
+    value_lengths: typing.List[int]
+    names: str
+    name_lookups: typing.Dict[int, str]
+    value_constants: str
+    enumerator_constants: str
+
+
+def _render_values(members):
+    return "".join(
+        "\n        value_type "
+        + _make_initializer_list_ensure_outer_braces(
+            member.enumerator_value_initializers
+        )
+        + ","
+        for member in members
+    )
+
+
+def _render_value_constants(enhanced, members, start, string_blob):
+    if string_blob:
+        return "".join(
+            f"\ninline constexpr {enhanced}::value_type "
+            f"{member.enumerator_value_constant_name} "
+            f"{{ {enhanced}::values[{index}] }};"
+            for (index, member) in enumerate(members, start)
+        )
+    return "".join(
+        f"\ninline constexpr const {enhanced}::value_type& "
+        f"{member.enumerator_value_constant_name} "
+        f"{{ std::get<{index}>({enhanced}::values) }};"
+        for (index, member) in enumerate(members, start)
+    )
+
+
+def _render_members(d, start, *, names, string_blob=False):
+    label = d.label_enum_typename
+    enhanced = d.enhanced_enum_typename
+    members = d.members
+    return _RenderedMembers(
+        size=len(members),
+        labels="".join(f"\n    {member.enumerator_name}," for member in members),
+        values="".join(
+            f"\n        {member.enumerator_value_initializers}" for member in members
+        )
+        if string_blob
+        else _render_values(members),
+        value_lengths=_get_string_lengths(d, members) if string_blob else [],
+        names="".join(
+            f'\n        "{member.enumerator_name}",' for member in members
+        )
+        if names
+        else "",
+        name_lookups={
+            length: "".join(
+                f'\n            if (name == "{member.enumerator_name}") {{'
+                f"\n                return {label}::{member.enumerator_name};"
+                "\n            }"
+                for member in group
+            )
+            for (length, group) in _group_by_name_length(members)
+        }
+        if names
+        else {},
+        value_constants=_render_value_constants(
+            enhanced, members, start, string_blob
+        ),
+        enumerator_constants="".join(
+            f"\ninline constexpr {enhanced} {member.enumerator_name} "
+            f"{{ {label}::{member.enumerator_name} }};"
+            for member in members
+        ),
+    )
+
+
+def _render_names(d, chunks):
+    pieces = [
+        "    static constexpr std::array<std::string_view, "
+        f"{sum(chunk.size for chunk in chunks)}> names {{",
+        *(chunk.names for chunk in chunks),
+        "\n    };\n",
+        "    constexpr std::string_view name() const noexcept\n",
+        "    {\n",
+        "        return names[static_cast<std::size_t>(get())];\n",
+        "    }\n",
+        f"    static constexpr std::optional<{d.enhanced_enum_typename}> "
+        "from_name(std::string_view name) noexcept\n",
+        "    {\n",
+        "        switch (name.size()) {",
+    ]
+    lengths = sorted(set().union(*(chunk.name_lookups for chunk in chunks)))
+    for length in lengths:
+        pieces.append(f"\n        case {length}:")
+        pieces.extend(chunk.name_lookups.get(length, "") for chunk in chunks)
+        pieces.append("\n            break;")
+    pieces.append("\n        }\n        return std::nullopt;\n    }\n")
+    return "".join(pieces)
+
+
+def _render_string_blob(chunks):
+    string_blob = _make_string_blob(
+        itertools.chain.from_iterable(chunk.value_lengths for chunk in chunks)
+    )
+    return "".join(
+        [
+            "    static constexpr ::enhanced_enum::string_blob<"
+            f"{string_blob.offset_type}, {len(string_blob.offsets) - 1}> values {{",
+            *(chunk.values for chunk in chunks),
+            ",\n        {",
+            *(f"\n            {offset}," for offset in string_blob.offsets),
+            "\n        },\n    };\n",
+        ]
+    )
+
+
+def _render_flags(d):
+    flags = d.flags_typename
+    operand_typenames = [flags, d.label_enum_typename]
+    return "".join(
+        [
+            f"\n\nusing {flags} = ::enhanced_enum::flags<{d.enhanced_enum_typename}>;",
+            *(
+                f"\n\nconstexpr {flags} operator{operator}"
+                f"({operand} lhs, {operand} rhs) noexcept\n"
+                f"{{\n    return {flags} {{lhs}} {operator}= rhs;\n}}"
+                for operator in ["|", "&", "^"]
+                for operand in operand_typenames
+            ),
+            *(
+                f"\n\nconstexpr {flags} operator~({operand} flags) noexcept\n"
+                f"{{\n    return {flags}::all() ^= flags;\n}}"
+                for operand in operand_typenames
+            ),
+        ]
+    )
+
+
+def _iter_rendered_enum_definitions(
+    d, chunks, *, names, label_enum=True, string_blob=False
+):
+    label = d.label_enum_typename
+    enhanced = d.enhanced_enum_typename
+    base = f"::enhanced_enum::enum_base<{enhanced}, {label}, {d.value_type_typename}>"
+    if label_enum:
+        yield "".join(
+            [
+                f"enum class {label} {{",
+                *(chunk.labels for chunk in chunks),
+                "\n};\n\n",
+            ]
+        )
+    yield "".join(
+        [
+            f"struct {enhanced} : {base} {{\n",
+            f"    using {base}::enum_base;\n",
+            *(
+                [_render_string_blob(chunks)]
+                if string_blob
+                else [
+                    "    static constexpr std::array values {",
+                    *(chunk.values for chunk in chunks),
+                    "\n    };\n",
+                ]
+            ),
+        ]
+    )
+    if names:
+        yield _render_names(d, chunks)
+    yield "".join(
+        [
+            "};\n\n",
+            f"constexpr {enhanced} enhance({label} e) noexcept\n",
+            "{\n    return e;\n}\n\n",
+            f"namespace {d.associate_namespace_name} {{",
+            *(chunk.value_constants for chunk in chunks),
+            *(chunk.enumerator_constants for chunk in chunks),
+            *(
+                f"\ninline constexpr auto {function}() noexcept "
+                f"{{ return {enhanced}::{function}();  }}"
+                for function in ["begin", "end", "all"]
+            ),
+            "\n}",
+            _render_flags(d) if d.flags_typename else "",
+        ]
+    )
+
+
 # pylint: disable=too-few-public-methods
 class CodeGenerator:
     """Code generator for an enhanced enum type
@@ -75,22 +430,48 @@ class CodeGenerator:
 
     _JINJA_ENV = _create_jinja_env()
 
-    def __init__(self, *, documentation: typing.Optional[DocumentationStyle] = None):
+    def __init__(
+        self,
+        *,
+        documentation: typing.Optional[DocumentationStyle] = None,
+        names: bool = False,
+        processes: int = 1,
+        string_blob: bool = False,
+    ):
         """
         Parameters:
             documentation: A :class:`DocumentationStyle` enumerator indicating the
                            documentation style. See :ref:`enumecg-documentation-generation`.
+            names: If ``True``, generate a table of the enumerator
+                   names, and a function for looking up enumerators by
+                   name. See :ref:`enumecg-enumerator-names`.
+            processes: The number of worker processes used to generate
+                       the definitions of enums with a large number of
+                       members. See :ref:`enumecg-parallel-generation`.
+            string_blob: If ``True``, store string values in a single
+                         character array. See :ref:`enumecg-string-blobs`.
         """
         self._documentation = documentation.value if documentation else None
+        self._names = names
+        self._processes = processes
+        self._string_blob = string_blob
         self._enum_definitions_template = self._JINJA_ENV.get_template(
             "enum_definitions.hh.in"
         )
+        self._module_interface_template = self._JINJA_ENV.get_template(
+            "enum_module.cppm.in"
+        )
+        self._python_module_template = self._JINJA_ENV.get_template(
+            "python_module.py.in"
+        )
 
-    def generate_enum_definitions(self, enum, **options):
+    def generate_enum_definitions(self, enum, *, label_enum: bool = True, **options):
         """Generate the C++ definitions needed for an enhanced enum
 
         Parameters:
             enum: The enum definition
+            label_enum: If ``False``, omit the definition of the label
+                        enum. See :ref:`enumecg-split-headers`.
             options: The options passed to :func:`definitions.make_definition()`.
 
         Returns:
@@ -100,7 +481,280 @@ class CodeGenerator:
             :exc:`exceptions.Error`: If the code generation fails due
               to an invalid enum definition.
         """
+        if self._processes > 1 and not self._documentation:
+            return "".join(
+                self._iter_enum_definitions_in_chunks(
+                    enum, label_enum=label_enum, **options
+                )
+            )
         return self._enum_definitions_template.render(
-            d=definitions.make_definition(enum, **options),
-            documentation=self._documentation,
+            **self._get_enum_definitions_context(enum, label_enum=label_enum, **options)
+        )
+
+    def generate_label_enum_definition(self, enum, **options):
+        """Generate the C++ definition of the label enum only
+
+        The code contains the label enum of
+        :meth:`generate_enum_definitions()`, and is meant to be used
+        together with the code generated with ``label_enum=False``.
+        See :ref:`enumecg-split-headers`.
+
+        Parameters:
+            enum: The enum definition
+            options: The options passed to :func:`definitions.make_definition()`.
+
+        Returns:
+            The generated code
+
+        Raises:
+            :exc:`exceptions.Error`: If the code generation fails due
+              to an invalid enum definition.
+        """
+        return self._enum_definitions_template.render(
+            **self._get_enum_definitions_context(enum, enhanced_enum=False, **options)
+        )
+
+    def iter_enum_definitions(
+        self, enum, *, label_enum: bool = True, **options
+    ) -> typing.Iterator[str]:
+        """Generate the C++ definitions needed for an enhanced enum in chunks
+
+        This is the streaming variant of
+        :meth:`generate_enum_definitions()`. The code is rendered
+        lazily as the chunks are consumed, and the concatenation of
+        the chunks is equal to the code returned by
+        :meth:`generate_enum_definitions()`.
+
+        Parameters:
+            enum: The enum definition
+            label_enum: If ``False``, omit the definition of the label enum
+            options: The options passed to :func:`definitions.make_definition()`.
+
+        Returns:
+            An iterator over the chunks of the generated code
+
+        Raises:
+            :exc:`exceptions.Error`: If the code generation fails due
+              to an invalid enum definition.
+        """
+        if self._processes > 1 and not self._documentation:
+            return self._iter_enum_definitions_in_chunks(
+                enum, label_enum=label_enum, **options
+            )
+        return self._enum_definitions_template.generate(
+            **self._get_enum_definitions_context(enum, label_enum=label_enum, **options)
+        )
+
+    def plan_enum_definitions(
+        self, enum, *, label_enum: bool = True, **options
+    ) -> EnumPlan:
+        """Plan the generation of the C++ definitions for an enhanced enum
+
+        Creates the enum definition, but does not render any code. The
+        fingerprint of the plan is computed from the definition, the
+        options of the generator, the templates, and the source code
+        and the version of the package. Code generated with the same fingerprint is
+        identical, so the fingerprint can be used to decide whether
+        previously generated code needs to be regenerated.
+
+        Parameters:
+            enum: The enum definition
+            label_enum: If ``False``, plan the code without the label enum
+            options: The options passed to :func:`definitions.make_definition()`.
+
+        Returns:
+            An :class:`EnumPlan` instance
+
+        Raises:
+            :exc:`exceptions.Error`: If ``enum`` is an invalid enum definition.
+        """
+        definition = definitions.make_definition(enum, **options)
+        fingerprint = hashlib.sha256(_get_code_digest(self._JINJA_ENV))
+        fingerprint.update(
+            json.dumps(
+                {
+                    "definition": dataclasses.asdict(
+                        definition, dict_factory=_make_cxx_definition_dict
+                    ),
+                    "documentation": self._documentation,
+                    "names": self._names,
+                    "string_blob": self._string_blob,
+                    "label_enum": label_enum,
+                },
+                sort_keys=True,
+            ).encode()
+        )
+        return EnumPlan(
+            label_enum_typename=definition.label_enum_typename,
+            enhanced_enum_typename=definition.enhanced_enum_typename,
+            value_type_typename=definition.value_type_typename,
+            fingerprint=fingerprint.hexdigest(),
+        )
+
+    def generate_module_interface(
+        self,
+        enums: typing.Iterable,
+        *,
+        module_name: str,
+        namespace: typing.Optional[str] = None,
+        includes: typing.Iterable[str] = (),
+        **options,
+    ):
+        """Generate a C++20 module interface unit for enhanced enums
+
+        The module interface contains the definitions of all ``enums``,
+        and exports them along with the ``enhanced_enum`` module. See
+        :ref:`enumecg-cxx-modules`.
+
+        Parameters:
+            enums: The enum definitions
+            module_name: The name of the module
+            namespace: If given, the definitions are placed in this namespace
+            includes: Additional headers included in the global module
+                      fragment, for instance headers defining custom
+                      value types
+            options: The options passed to :func:`definitions.make_definition()`.
+
+        Returns:
+            The generated code
+
+        Raises:
+            :exc:`exceptions.Error`: If the code generation fails due
+              to an invalid enum definition.
+        """
+        return self._module_interface_template.render(
+            enums=[self.generate_enum_definitions(enum, **options) for enum in enums],
+            module_name=module_name,
+            namespace=namespace,
+            includes=includes,
+        )
+
+    def generate_python_module(
+        self, enum, *, class_name: typing.Optional[str] = None, **options
+    ):
+        """Generate a Python module for an enhanced enum
+
+        The module contains a Python enum class with the same
+        enumerators and values as the enhanced enum, and tables
+        for looking up the enumerators by value and by name. See
+        :ref:`enumecg-python-modules`.
+
+        Parameters:
+            enum: The enum definition
+            class_name: The name of the enum class. Defaults to the
+                        typename of the enhanced enum.
+            options: The options passed to :func:`definitions.make_definition()`.
+
+        Returns:
+            The generated code
+
+        Raises:
+            :exc:`exceptions.Error`: If the code generation fails due
+              to an invalid enum definition, or a definition that
+              doesn't contain the Python values of the enumerators.
+        """
+        d = definitions.make_definition(enum, **options)
+        for member in d.members:
+            _check_python_member(member)
+        return self._python_module_template.render(
+            d=d, class_name=class_name or d.enhanced_enum_typename
+        )
+
+    def _iter_enum_definitions_in_chunks(self, enum, *, label_enum, **options):
+        d, chunks = definitions.map_member_chunks(
+            enum,
+            functools.partial(
+                _render_members, names=self._names, string_blob=self._string_blob
+            ),
+            chunk_size=_MEMBERS_PER_CHUNK,
+            processes=self._processes,
+            **options,
+        )
+        return _iter_rendered_enum_definitions(
+            d,
+            chunks,
+            names=self._names,
+            label_enum=label_enum,
+            string_blob=self._string_blob,
+        )
+
+    def _get_enum_definitions_context(
+        self, enum, *, label_enum=True, enhanced_enum=True, **options
+    ):
+        d = definitions.make_definition(enum, **options)
+        return {
+            "d": d,
+            "documentation": self._documentation,
+            "names": self._names,
+            "string_blob": _make_string_blob(_get_string_lengths(d, d.members))
+            if self._string_blob and enhanced_enum
+            else None,
+            "label_enum": label_enum,
+            "enhanced_enum": enhanced_enum,
+        }
+
+    def get_dependencies(self, enum=None) -> typing.List[str]:
+        """Return the files that the generated code depends on
+
+        The dependencies are the templates used by this generator, and
+        the source files of the :mod:`enumecg` package. If ``enum`` is
+        a Python enum class, the source file of the module defining it
+        is also included.
+
+        Parameters:
+            enum: The enum definition
+
+        Returns:
+            List of paths to the files read when generating the code
+        """
+        templates = [
+            self._enum_definitions_template,
+            self._module_interface_template,
+            self._python_module_template,
+        ]
+        if self._documentation:
+            templates.append(
+                self._JINJA_ENV.get_template(self._documentation + ".doc.in")
+            )
+        return (
+            _get_enum_source(enum)
+            + [template.filename for template in templates]
+            + _get_package_sources()
+        )
+
+
+class DirectCodeGenerator(CodeGenerator):
+    """Code generator writing the C++ code without templates
+
+    Generates the same code as :class:`CodeGenerator`, but writes the
+    definitions directly from preformatted strings instead of rendering
+    them from the Jinja templates, avoiding the overhead of the template
+    macros and filters applied for each member. Definitions with
+    documentation are still rendered from the templates.
+
+    The recommended way to create an instance is by using the
+    :func:`enumecg.generator()` function with ``backend="direct"``.
+    """
+
+    def generate_enum_definitions(self, enum, *, label_enum: bool = True, **options):
+        return "".join(
+            self.iter_enum_definitions(enum, label_enum=label_enum, **options)
+        )
+
+    def iter_enum_definitions(
+        self, enum, *, label_enum: bool = True, **options
+    ) -> typing.Iterator[str]:
+        if self._documentation or self._processes > 1:
+            return super().iter_enum_definitions(enum, label_enum=label_enum, **options)
+        d = definitions.make_definition(enum, **options)
+        return _iter_rendered_enum_definitions(
+            d,
+            [
+                _render_members(
+                    d, 0, names=self._names, string_blob=self._string_blob
+                )
+            ],
+            names=self._names,
+            label_enum=label_enum,
+            string_blob=self._string_blob,
         )
@@ -0,0 +1,246 @@
+"""
+Definition loaders
+..................
+
+Contains the functions used to load enum definitions from files. The
+loaders produce mappings accepted by
+:func:`definitions.make_definition()`, as discussed in
+:ref:`enumecg-definition-from-dict`.
+"""
+
+import collections.abc as cabc
+import csv
+import enum as py_enum
+import json
+import os
+import typing
+
+import yaml
+
+from . import exceptions
+
+
+class Format(py_enum.Enum):
+    """Supported definition file formats
+
+    These are the accepted choices for the ``format`` argument in
+    :func:`load()`.
+    """
+
+    yaml = "yaml"
+    """YAML document containing the definition"""
+
+    json = "json"
+    """JSON document containing the definition"""
+
+    csv = "csv"
+    """CSV table containing the enum members"""
+
+
+_EXTENSION_FORMATS = {
+    ".yaml": Format.yaml,
+    ".yml": Format.yaml,
+    ".json": Format.json,
+    ".csv": Format.csv,
+}
+
+
+def get_format(path: str) -> Format:
+    """Return the format of a definition file based on its extension
+
+    Files with unknown extensions are assumed to be YAML.
+
+    Parameters:
+        path: The path of the file
+
+    Returns:
+        A :class:`Format` enumerator
+    """
+    _, extension = os.path.splitext(path)
+    return _EXTENSION_FORMATS.get(extension.lower(), Format.yaml)
+
+
+def _parse_csv_value(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def iter_csv_members(file: typing.TextIO) -> typing.Iterator[typing.Mapping]:
+    """Read enum members from a CSV table row by row
+
+    The first row of the table is a header that must contain the
+    ``name`` and ``value`` columns. Other columns are ignored. Each
+    value is interpreted as JSON if possible, and as a string
+    otherwise.
+
+    .. testsetup::
+
+        import io
+        from enumecg.loaders import iter_csv_members
+
+    .. doctest::
+
+        >>> table = io.StringIO("name,value\\nPI,3.14\\nNEPER,2.71\\n")
+        >>> list(iter_csv_members(table))
+        [{'name': 'PI', 'value': 3.14}, {'name': 'NEPER', 'value': 2.71}]
+
+    Parameters:
+        file: The file containing the table
+
+    Raises:
+        :exc:`exceptions.Error`: If the table does not contain the
+          required columns.
+    """
+    reader = csv.reader(file)
+    try:
+        header = next(reader)
+    except StopIteration:
+        raise exceptions.Error("CSV table has no header") from None
+    try:
+        name_column = header.index("name")
+        value_column = header.index("value")
+    except ValueError:
+        raise exceptions.Error(
+            f"CSV table must have name and value columns, got {header!r}"
+        ) from None
+    for row in reader:
+        if row:
+            yield {
+                "name": row[name_column],
+                "value": _parse_csv_value(row[value_column]),
+            }
+
+
+_SEQUENCE_TAG = "tag:yaml.org,2002:seq"
+
+
+def _is_members_key(node):
+    return isinstance(node, yaml.ScalarNode) and node.value == "members"
+
+
+def _compose_members(loader, members):
+    start_event = loader.get_event()
+    while not loader.check_event(yaml.SequenceEndEvent):
+        member_node = loader.compose_node(None, None)
+        members.append(loader.construct_document(member_node))
+    end_event = loader.get_event()
+    return yaml.SequenceNode(
+        _SEQUENCE_TAG, [], start_event.start_mark, end_event.end_mark
+    )
+
+
+def _compose_definition(loader, members):
+    start_event = loader.get_event()
+    node = yaml.MappingNode(
+        loader.resolve(yaml.MappingNode, None, start_event.implicit),
+        [],
+        start_event.start_mark,
+        None,
+    )
+    while not loader.check_event(yaml.MappingEndEvent):
+        key_node = loader.compose_node(node, None)
+        is_members_key = _is_members_key(key_node)
+        if is_members_key:
+            # Like yaml.safe_load(), keep only the last value of a
+            # repeated key
+            members.clear()
+        if (
+            is_members_key
+            and loader.check_event(yaml.SequenceStartEvent)
+            and loader.peek_event().anchor is None
+            and loader.peek_event().tag in (None, "!", _SEQUENCE_TAG)
+        ):
+            value_node = _compose_members(loader, members)
+        else:
+            value_node = loader.compose_node(node, key_node)
+        node.value.append((key_node, value_node))
+    node.end_mark = loader.get_event().end_mark
+    return node
+
+
+def _load_yaml(file):
+    # Equivalent to yaml.safe_load(), except that the items of the
+    # top-level members sequence are composed and constructed one at a
+    # time, so that the node graph of the whole document is never held
+    # in memory.
+    loader = yaml.SafeLoader(file)
+    try:
+        loader.get_event()
+        if loader.check_event(yaml.StreamEndEvent):
+            return None
+        loader.get_event()
+        members = []
+        event = loader.peek_event()
+        if (
+            isinstance(event, yaml.MappingStartEvent)
+            and event.anchor is None
+            and event.tag in (None, "!")
+        ):
+            node = _compose_definition(loader, members)
+        else:
+            node = loader.compose_node(None, None)
+        loader.get_event()
+        if not loader.check_event(yaml.StreamEndEvent):
+            raise yaml.composer.ComposerError(
+                "expected a single document in the stream",
+                node.start_mark,
+                "but found another document",
+                loader.get_event().start_mark,
+            )
+        data = loader.construct_document(node)
+        if members:
+            data["members"] = members
+        return data
+    finally:
+        loader.dispose()
+
+
+def load(
+    file: typing.TextIO,
+    format: typing.Optional[Format] = None,  # pylint: disable=redefined-builtin
+    *,
+    typename: typing.Optional[str] = None,
+) -> typing.Mapping:
+    """Load enum definition from a file
+
+    YAML and JSON files contain a single document with the definition.
+    CSV files contain a table of enum members (see
+    :func:`iter_csv_members()`), and the typename is derived from the
+    file name unless given explicitly.
+
+    The members of a YAML definition are composed and constructed one
+    at a time, so the memory needed to load a definition with a large
+    number of members is proportional to the size of the resulting
+    mapping rather than the size of the whole YAML node graph.
+
+    Parameters:
+        file: The file containing the definition
+        format: A :class:`Format` enumerator. If not given, the format
+                is deduced from the name of the file (see :func:`get_format()`).
+        typename: If given, overrides the typename of the definition
+
+    Returns:
+        The enum definition as a mapping
+
+    Raises:
+        :exc:`exceptions.Error`: If the file cannot be loaded.
+    """
+    name = getattr(file, "name", "")
+    format = format or get_format(name)
+    try:
+        if format == Format.csv:
+            enum = {
+                "typename": os.path.splitext(os.path.basename(name))[0],
+                "members": list(iter_csv_members(file)),
+            }
+        elif format == Format.json:
+            enum = json.load(file)
+        else:
+            enum = _load_yaml(file)
+    except (ValueError, yaml.YAMLError) as ex:
+        raise exceptions.Error(f"Failed to load definition from {name}") from ex
+    if typename and isinstance(enum, cabc.Mapping):
+        enum = dict(enum, typename=typename)
+    return enum
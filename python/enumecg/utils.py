@@ -10,6 +10,7 @@ also be useful outside the scope of the :mod:`enumecg` package.
 import collections.abc as cabc
 import itertools
 import numbers
+import struct
 import typing
 
 import inflect
@@ -47,6 +48,13 @@ def _all_are_instances(values, type_):
     return values and all(isinstance(v, type_) for v in values)
 
 
+def _is_exact_float(value):
+    try:
+        return struct.unpack("f", struct.pack("f", value))[0] == value
+    except OverflowError:
+        return False
+
+
 class NameFormatter:
     """Format names in the same case style as sample names
 
@@ -139,6 +147,10 @@ class NameFormatter:
             return self._joiner(head + [last])
 
 
+class _ArrayShape(typing.NamedTuple):
+    element: typing.Any
+
+
 class CppTypeDeducer:
     """Deduce C++ types and initializers from Python values
 
@@ -154,7 +166,15 @@ class CppTypeDeducer:
         (numbers.Real, "double"),
     ]
 
-    def __init__(self, *values, type_name: typing.Optional[str] = None):
+    _narrow_integral_bits = [8, 16, 32, 64]
+
+    def __init__(
+        self,
+        *values,
+        type_name: typing.Optional[str] = None,
+        narrow: bool = False,
+        arrays: bool = False,
+    ):
         """
         If the explicit ``type_name`` parameter is given, it is preferred and
         the ``values`` are not examined.
@@ -162,12 +182,23 @@ class CppTypeDeducer:
         Parameters:
           values: The values used to deduce the type
           type_name: The type name
+          narrow: If ``True``, deduce the narrowest fixed width
+                  integer type and ``float`` instead of ``long`` and
+                  ``double`` when the values fit in them
+          arrays: If ``True``, deduce ``std::array`` instead of
+                  ``std::tuple`` for sequences whose elements all have
+                  the same type
 
         Raises:
           :exc:`exceptions.Error`: If no C++ type compatible with
             ``values`` can be deduced.
         """
-        self._type_name = type_name or self._get_compatible_type(values)
+        if type_name:
+            self._type_name, self._shape = type_name, None
+        else:
+            self._type_name, self._shape = self._get_compatible_type(
+                values, narrow, arrays
+            )
 
     @property
     def type_name(self) -> str:
@@ -186,6 +217,28 @@ class CppTypeDeducer:
             An expression that can be used in a C++ initializer list to
             initialize a type compatible with ``value`` at compile time
         """
+        return cls._get_initializer(value, None)
+
+    def get_value_initializer(self, value):
+        """Return C++ initializer for ``value`` of the deduced type
+
+        Like :meth:`get_initializer()`, except that the initializers of
+        the sequences deduced to ``std::array`` are wrapped in an extra
+        pair of braces. This makes the initializer list initialize the
+        array nested in ``std::array``, which is required when the
+        elements are themselves initialized from lists.
+
+        Parameters:
+            value: One of the values used to deduce the type
+
+        Return:
+            An expression that can be used in a C++ initializer list to
+            initialize :attr:`type_name` from ``value`` at compile time
+        """
+        return self._get_initializer(value, self._shape)
+
+    @classmethod
+    def _get_initializer(cls, value, shape):
         if isinstance(value, (str, bytes)):
             if isinstance(value, bytes):
                 value = value.decode()
@@ -195,22 +248,53 @@ class CppTypeDeducer:
         if isinstance(value, numbers.Real):
             return repr(value)
         if isinstance(value, cabc.Sequence):
-            return [cls.get_initializer(v) for v in value]
+            if isinstance(shape, _ArrayShape):
+                return [[cls._get_initializer(v, shape.element) for v in value]]
+            shapes = shape or []
+            return [
+                cls._get_initializer(v, shapes[n] if n < len(shapes) else None)
+                for (n, v) in enumerate(value)
+            ]
         raise exceptions.Error(f"Could not generate initializer for {value!r}")
 
     @classmethod
-    def _get_compatible_type(cls, values):
+    def _get_narrow_type(cls, values, py_type):
+        if py_type is numbers.Integral:
+            signed = any(v < 0 for v in values)
+            value_bits = max((~v if v < 0 else v).bit_length() for v in values)
+            for bits in cls._narrow_integral_bits:
+                if value_bits + signed <= bits:
+                    return f"std::{'' if signed else 'u'}int{bits}_t"
+        elif py_type is numbers.Real and all(_is_exact_float(v) for v in values):
+            return "float"
+        return None
+
+    @classmethod
+    def _get_compatible_type(cls, values, narrow, arrays):
         values = list(values)
         for (py_type, cpp_type_name) in cls._type_pairs:
             if _all_are_instances(values, py_type):
-                return cpp_type_name
+                narrow_type_name = narrow and cls._get_narrow_type(values, py_type)
+                return narrow_type_name or cpp_type_name, None
         if _all_are_instances(values, cabc.Sequence):
             sentinel = object()
             common_types = []
+            shapes = []
             for value_zip in itertools.zip_longest(*values, fillvalue=sentinel):
-                common_type = cls._get_compatible_type(
-                    v for v in value_zip if v is not sentinel
+                common_type, shape = cls._get_compatible_type(
+                    (v for v in value_zip if v is not sentinel), narrow, arrays
                 )
                 common_types.append(common_type)
-            return f"std::tuple<{', '.join(common_types)}>"
+                shapes.append(shape)
+            if (
+                arrays
+                and common_types
+                and len(set(common_types)) == 1
+                and len(set(len(value) for value in values)) == 1
+            ):
+                return (
+                    f"std::array<{common_types[0]}, {len(common_types)}>",
+                    _ArrayShape(shapes[0]),
+                )
+            return f"std::tuple<{', '.join(common_types)}>", shapes
         raise exceptions.Error(f"Could not deduce compatible type for {values!r}")
@@ -0,0 +1,129 @@
+"""
+Watching definition files
+.........................
+
+Contains the utilities for watching a directory of enum definitions
+and detecting changed files. They are used to implement the watch mode
+of the command line interface, where the code generator is kept
+running and the headers are regenerated as soon as the definitions
+change.
+"""
+
+import fnmatch
+import os
+import time
+import typing
+
+DEFAULT_PATTERNS = ("*.yaml", "*.yml", "*.json", "*.csv")
+"""Default file name patterns of the watched definition files"""
+
+
+def _get_signature(entry):
+    stat = entry.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class Watcher:
+    """Watch a directory for changed definition files
+
+    The watcher polls the modification times and sizes of the files
+    matching the given patterns in a directory. A file is reported as
+    changed once it has stayed unchanged for the debounce period, so
+    that an editor writing a file in several steps only triggers one
+    regeneration.
+
+    .. testsetup::
+
+        import os
+        import tempfile
+        from enumecg.watch import Watcher
+        directory = tempfile.mkdtemp()
+        open(f"{directory}/status.yaml", "w").close()
+
+    .. doctest::
+
+        >>> watcher = Watcher(directory)
+        >>> [os.path.basename(path) for path in watcher.poll()]
+        ['status.yaml']
+        >>> watcher.poll()
+        []
+
+    All matching files are reported as changed on the first poll,
+    without waiting for the debounce period.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        patterns: typing.Iterable[str] = DEFAULT_PATTERNS,
+        debounce: float = 0.1,
+    ):
+        """
+        Parameters:
+          directory: The directory to watch
+          patterns: The patterns of the file names to watch
+          debounce: The time (in seconds) a file must stay unchanged
+            before it is reported
+        """
+        self._directory = directory
+        self._patterns = tuple(patterns)
+        self._debounce = debounce
+        self._reported = None
+        self._pending = {}
+
+    def _scan(self):
+        signatures = {}
+        with os.scandir(self._directory) as entries:
+            for entry in entries:
+                if entry.is_file() and any(
+                    fnmatch.fnmatch(entry.name, pattern) for pattern in self._patterns
+                ):
+                    try:
+                        signatures[entry.path] = _get_signature(entry)
+                    except FileNotFoundError:
+                        pass
+        return signatures
+
+    def poll(self) -> typing.List[str]:
+        """Return the files that have changed since the previous poll
+
+        Returns:
+          List of paths to the changed files, in sorted order
+        """
+        now = time.monotonic()
+        signatures = self._scan()
+        if self._reported is None:
+            self._reported = signatures
+            return sorted(signatures)
+        for path in set(self._reported) - set(signatures):
+            del self._reported[path]
+        for path in set(self._pending) - set(signatures):
+            del self._pending[path]
+        changed = []
+        for path, signature in sorted(signatures.items()):
+            if self._reported.get(path) == signature:
+                self._pending.pop(path, None)
+                continue
+            pending_signature, since = self._pending.get(path, (None, now))
+            if pending_signature != signature:
+                since = now
+            if now - since >= self._debounce:
+                self._pending.pop(path, None)
+                self._reported[path] = signature
+                changed.append(path)
+            else:
+                self._pending[path] = (signature, since)
+        return changed
+
+    def watch(self, callback: typing.Callable[[str], None], *, interval: float = 0.1):
+        """Poll the directory until interrupted
+
+        Parameters:
+          callback: Function invoked with the path of each changed file
+          interval: The polling interval in seconds
+        """
+        while True:
+            for path in self.poll():
+                callback(path)
+            time.sleep(interval)
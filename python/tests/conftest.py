@@ -1,5 +1,9 @@
 import copy
 import enum
+import http.server
+import threading
+import time
+
 import pytest
 
 from enumecg.definitions import EnumDefinition, EnumMemberDefinition, EnumDocumentation
@@ -111,3 +115,62 @@ def status_documentation():
         short_description="An example enumeration for testing",
         long_description="This is a long description of the test enum.",
     )
+
+
+class _CacheRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def _respond(self, status, body=b""):
+        time.sleep(self.server.delay)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.server.requests.append(("GET", self.path))
+        body = self.server.entries.get(self.path)
+        if body is None:
+            self._respond(404)
+        else:
+            self._respond(200, body)
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        self.server.requests.append(("PUT", self.path))
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.entries[self.path] = body
+        self._respond(201)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture
+def cache_server():
+    """Return HTTP server implementing the protocol of :mod:`enumecg.cache`
+
+    The server runs in a background thread. The entries stored in the
+    cache are in the ``entries`` dict keyed by the request path, and
+    the requests and number of connections made are recorded in the
+    ``requests`` and ``connections`` attributes. Setting ``delay``
+    delays the responses by the given number of seconds.
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _CacheRequestHandler)
+    server.daemon_threads = True
+    server.entries = {}
+    server.requests = []
+    server.connections = 0
+    server.delay = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/enumecg"
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
@@ -0,0 +1,246 @@
+import contextlib
+import io
+import json
+
+import pytest
+
+from enumecg import batch, generate
+from enumecg import plan as plan_enum
+from enumecg.batch import (
+    Job,
+    JobPlan,
+    JobResult,
+    Shard,
+    check,
+    dump_results,
+    is_up_to_date,
+    load_manifest,
+    load_results,
+    merge_results,
+    parse_shard,
+    plan,
+    select_shard,
+)
+from enumecg.exceptions import Error
+
+
+@pytest.fixture
+def job(tmpdir, status_definition_dict):
+    """Return job with a JSON definition and an up to date header"""
+    definition = tmpdir.join("status.json")
+    definition.write(json.dumps(status_definition_dict))
+    header = tmpdir.join("status.hh")
+    header.write(generate(status_definition_dict) + "\n")
+    return Job(str(definition), str(header))
+
+
+def test_load_manifest_should_return_jobs():
+    file = io.StringIO(json.dumps([{"definition": "enum.yaml", "header": "enum.hh"}]))
+    assert load_manifest(file) == [Job("enum.yaml", "enum.hh")]
+
+
+def test_load_manifest_should_resolve_paths_relative_to_manifest(tmpdir):
+    path = tmpdir.join("manifest.json")
+    path.write(json.dumps([{"definition": "enum.yaml", "header": "include/enum.hh"}]))
+    with open(path) as file:
+        assert load_manifest(file) == [
+            Job(str(tmpdir.join("enum.yaml")), str(tmpdir.join("include/enum.hh")))
+        ]
+
+
+@pytest.mark.parametrize(
+    "manifest",
+    ["not json", "{}", '[{"definition": "enum.yaml"}]'],
+)
+def test_load_manifest_should_fail_if_manifest_is_invalid(manifest):
+    with pytest.raises(Error):
+        load_manifest(io.StringIO(manifest))
+
+
+def test_up_to_date_header(job):
+    assert is_up_to_date(job)
+
+
+def test_header_with_different_content_should_not_be_up_to_date(job):
+    with open(job.header, "a") as header:
+        header.write("// Extra content\n")
+    assert not is_up_to_date(job)
+
+
+def test_header_generated_with_different_options_should_not_be_up_to_date(job):
+    assert not is_up_to_date(job, documentation="doxygen")
+
+
+def test_missing_header_should_not_be_up_to_date(job, tmpdir):
+    assert not is_up_to_date(job._replace(header=str(tmpdir.join("missing.hh"))))
+
+
+def test_comparison_should_stop_at_first_difference(job, monkeypatch):
+    def _iter_generate(enum, **options):
+        yield "// Different"
+        raise AssertionError("Chunks should not be consumed after a difference")
+
+    monkeypatch.setattr(batch, "iter_generate", _iter_generate)
+    assert not is_up_to_date(job)
+
+
+def test_up_to_date_should_fail_if_definition_is_invalid(job):
+    with open(job.definition, "w") as definition:
+        definition.write("{}")
+    with pytest.raises(Error):
+        is_up_to_date(job)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_check_should_return_stale_jobs(job, tmpdir, processes):
+    stale_job = job._replace(header=str(tmpdir.join("missing.hh")))
+    assert check([stale_job, job, stale_job], processes=processes) == [
+        stale_job,
+        stale_job,
+    ]
+
+
+def test_plan_should_return_plans_for_jobs(job, status_definition_dict):
+    assert plan([job], names=True) == [
+        JobPlan(job, plan_enum(status_definition_dict, names=True))
+    ]
+
+
+def test_plan_should_not_read_headers(job, tmpdir):
+    job = job._replace(header=str(tmpdir.join("missing.hh")))
+    assert plan([job])[0].job == job
+
+
+def test_job_plan_asdict(job, status_definition_dict):
+    job_plan = JobPlan(job, plan_enum(status_definition_dict))
+    assert job_plan.asdict() == {
+        "definition": job.definition,
+        "header": job.header,
+        **plan_enum(status_definition_dict)._asdict(),
+    }
+
+
+def test_parse_shard():
+    assert parse_shard("2/3") == Shard(2, 3)
+    assert str(Shard(2, 3)) == "2/3"
+
+
+@pytest.mark.parametrize("spec", ["", "1", "a/b", "0/3", "4/3", "1/2/3"])
+def test_parse_shard_should_fail_if_shard_is_invalid(spec):
+    with pytest.raises(Error):
+        parse_shard(spec)
+
+
+def _make_jobs(directory, count):
+    return [
+        Job(f"{directory}/enum{n}.yaml", f"{directory}/include/enum{n}.hh")
+        for n in range(count)
+    ]
+
+
+@pytest.mark.parametrize("count", [1, 2, 7])
+def test_select_shard_should_assign_each_job_to_one_shard(count):
+    jobs = _make_jobs("defs", 100)
+    shards = [select_shard(jobs, Shard(index, count)) for index in range(1, count + 1)]
+    assert sorted(job for shard in shards for job in shard) == sorted(jobs)
+    for shard in shards:
+        assert shard == [job for job in jobs if job in shard]
+        assert len(shard) > 50 / count
+
+
+def test_select_shard_should_not_depend_on_root():
+    shards = [
+        select_shard(_make_jobs(directory, 20), Shard(1, 3), root=directory)
+        for directory in ["a", "/path/to/b"]
+    ]
+    assert [job.header.rpartition("/")[2] for job in shards[0]] == [
+        job.header.rpartition("/")[2] for job in shards[1]
+    ]
+
+
+def _dump_results(path, results, shard):
+    with open(path, "w") as file:
+        dump_results(results, file, shard=shard)
+
+
+def _make_results(tmpdir, names, status="generated"):
+    return [
+        JobResult(
+            Job(str(tmpdir.join(f"{name}.yaml")), str(tmpdir.join(f"out/{name}.hh"))),
+            f"{name}-fingerprint",
+            status,
+        )
+        for name in names
+    ]
+
+
+def test_dump_results_should_write_paths_relative_to_result_file(tmpdir):
+    results = _make_results(tmpdir, ["status"])
+    _dump_results(tmpdir.join("results.json"), results, Shard(2, 3))
+    assert json.loads(tmpdir.join("results.json").read()) == {
+        "shard": "2/3",
+        "results": [
+            {
+                "definition": "status.yaml",
+                "header": "out/status.hh",
+                "fingerprint": "status-fingerprint",
+                "status": "generated",
+            }
+        ],
+    }
+
+
+def test_load_results_should_return_dumped_results(tmpdir):
+    results = _make_results(tmpdir, ["status", "color"], "stale")
+    _dump_results(tmpdir.join("results.json"), results, Shard(2, 3))
+    with open(tmpdir.join("results.json")) as file:
+        assert load_results(file) == (Shard(2, 3), results)
+
+
+@pytest.mark.parametrize(
+    "document", ["[]", '{"shard": "1/1"}', '{"shard": "2/1", "results": []}']
+)
+def test_load_results_should_fail_if_result_file_is_invalid(document):
+    with pytest.raises(Error):
+        load_results(io.StringIO(document))
+
+
+def _merge_results(tmpdir, shards):
+    with contextlib.ExitStack() as stack:
+        files = []
+        for (n, (shard, results)) in enumerate(shards):
+            path = tmpdir.join(f"results{n}.json")
+            _dump_results(path, results, shard)
+            files.append(stack.enter_context(open(path)))
+        return merge_results(files)
+
+
+def test_merge_results_should_return_results_of_all_shards(tmpdir):
+    first = _make_results(tmpdir, ["status"])
+    second = _make_results(tmpdir, ["color", "shape"], "unchanged")
+    assert (
+        _merge_results(tmpdir, [(Shard(2, 2), second), (Shard(1, 2), first)])
+        == first + second
+    )
+
+
+@pytest.mark.parametrize(
+    "shards",
+    [
+        [Shard(1, 2)],
+        [Shard(1, 2), Shard(1, 2)],
+        [Shard(1, 2), Shard(2, 3)],
+    ],
+)
+def test_merge_results_should_fail_if_shards_do_not_match(tmpdir, shards):
+    results = [
+        (shard, _make_results(tmpdir, [f"enum{n}"])) for (n, shard) in enumerate(shards)
+    ]
+    with pytest.raises(Error):
+        _merge_results(tmpdir, results)
+
+
+def test_merge_results_should_fail_if_header_is_in_many_shards(tmpdir):
+    results = _make_results(tmpdir, ["status"])
+    with pytest.raises(Error):
+        _merge_results(tmpdir, [(Shard(1, 2), results), (Shard(2, 2), results)])
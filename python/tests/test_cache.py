@@ -0,0 +1,113 @@
+import pytest
+
+from enumecg import definitions, generate, plan
+from enumecg.cache import RemoteCache
+from enumecg.exceptions import Error
+
+
+@pytest.fixture
+def remote_cache(cache_server):
+    """Return :class:`RemoteCache` connected to ``cache_server``"""
+    with RemoteCache(cache_server.url, timeout=1) as cache:
+        yield cache
+
+
+@pytest.mark.parametrize(
+    "url", ["enumecg", "ftp://example.com/enumecg", "http:///enumecg", "http://a:b/"]
+)
+def test_remote_cache_should_reject_invalid_url(url):
+    with pytest.raises(Error):
+        RemoteCache(url)
+
+
+def test_remote_cache_get_should_return_stored_code(cache_server, remote_cache):
+    cache_server.entries["/enumecg/abcd"] = "code".encode("utf-8")
+    assert remote_cache.get("abcd") == "code"
+    assert remote_cache.info().hits == 1
+
+
+def test_remote_cache_get_should_return_none_for_missing_code(remote_cache):
+    assert remote_cache.get("abcd") is None
+    assert remote_cache.info().misses == 1
+
+
+def test_remote_cache_put_should_store_code(cache_server, remote_cache):
+    assert remote_cache.put("abcd", "code")
+    assert cache_server.entries["/enumecg/abcd"] == b"code"
+    assert remote_cache.info().stores == 1
+
+
+def test_remote_cache_generate_should_store_generated_code(
+    cache_server, remote_cache, status_definition_dict
+):
+    code = remote_cache.generate(status_definition_dict, names=True)
+    assert code == generate(status_definition_dict, names=True)
+    fingerprint = plan(status_definition_dict, names=True).fingerprint
+    assert cache_server.entries[f"/enumecg/{fingerprint}"] == code.encode("utf-8")
+
+
+def test_remote_cache_generate_should_make_definition_once(
+    remote_cache, status_definition_dict, monkeypatch
+):
+    converted = []
+    make_definition = definitions.make_definition
+
+    def counting_make_definition(enum, **options):
+        if not isinstance(enum, definitions.EnumDefinition):
+            converted.append(enum)
+        return make_definition(enum, **options)
+
+    monkeypatch.setattr(definitions, "make_definition", counting_make_definition)
+    code = remote_cache.generate(status_definition_dict, narrow_types=True)
+    assert converted == [status_definition_dict]
+    assert code == generate(status_definition_dict, narrow_types=True)
+
+
+def test_remote_cache_generate_should_return_cached_code(
+    cache_server, remote_cache, status_definition_dict
+):
+    fingerprint = plan(status_definition_dict).fingerprint
+    cache_server.entries[f"/enumecg/{fingerprint}"] = b"cached"
+    assert remote_cache.generate(status_definition_dict) == "cached"
+    assert cache_server.requests == [("GET", f"/enumecg/{fingerprint}")]
+
+
+def test_remote_cache_should_reuse_connection(
+    cache_server, remote_cache, status_definition_dict
+):
+    for _ in range(3):
+        remote_cache.generate(status_definition_dict)
+    assert cache_server.connections == 1
+    info = remote_cache.info()
+    assert (info.hits, info.misses, info.stores, info.requests) == (2, 1, 1, 4)
+
+
+def test_remote_cache_should_reconnect_after_close(cache_server, remote_cache):
+    remote_cache.get("abcd")
+    remote_cache.close()
+    remote_cache.get("abcd")
+    assert cache_server.connections == 2
+
+
+def test_remote_cache_should_fall_back_to_generating_code_on_timeout(
+    cache_server, status_definition_dict
+):
+    cache_server.delay = 1
+    with RemoteCache(cache_server.url, timeout=0.1) as remote_cache:
+        for _ in range(2):
+            code = remote_cache.generate(status_definition_dict)
+            assert code == generate(status_definition_dict)
+        info = remote_cache.info()
+    assert (info.hits, info.errors, info.requests) == (0, 1, 1)
+
+
+def test_remote_cache_should_fall_back_to_generating_code_if_unreachable(
+    cache_server, status_definition_dict
+):
+    url = cache_server.url
+    cache_server.shutdown()
+    cache_server.server_close()
+    with RemoteCache(url, timeout=1) as remote_cache:
+        code = remote_cache.generate(status_definition_dict)
+        assert code == generate(status_definition_dict)
+        assert remote_cache.info().errors == 1
@@ -1,11 +1,21 @@
+import json
 import yaml
 import pytest
 
 from click.testing import CliRunner
 
-from enumecg import generate
+from enumecg import (
+    generate,
+    generate_label_enum,
+    generate_module,
+    generate_python_module,
+    generators,
+    loaders,
+    plan,
+)
 from enumecg.cli import cli
 from enumecg.definitions import PrimaryType
+from enumecg.watch import Watcher
 
 
 @pytest.fixture
@@ -55,6 +65,51 @@ def test_cli_should_have_value_type_option(
     assert result.output == generate(status_definition_dict, value_type="MyType") + "\n"
 
 
+def test_cli_should_have_names_option(cli_runner, enum_file, status_definition_dict):
+    result = cli_runner.invoke(cli, ["--names", str(enum_file)])
+    assert result.output == generate(status_definition_dict, names=True) + "\n"
+
+
+def test_cli_should_have_string_blob_option(
+    cli_runner, enum_file, status_definition_dict
+):
+    result = cli_runner.invoke(cli, ["--string-blob", str(enum_file)])
+    assert result.output == generate(status_definition_dict, string_blob=True) + "\n"
+
+
+def test_cli_should_have_narrow_types_option(cli_runner, nested_enum_definition_dict):
+    result = cli_runner.invoke(
+        cli,
+        ["--narrow-types", "--format", "json"],
+        input=json.dumps(nested_enum_definition_dict),
+    )
+    assert (
+        result.output == generate(nested_enum_definition_dict, narrow_types=True) + "\n"
+    )
+
+
+def test_cli_should_have_array_sequences_option(
+    cli_runner, nested_enum_definition_dict
+):
+    result = cli_runner.invoke(
+        cli,
+        ["--array-sequences", "--format", "json"],
+        input=json.dumps(nested_enum_definition_dict),
+    )
+    assert (
+        result.output
+        == generate(nested_enum_definition_dict, array_sequences=True) + "\n"
+    )
+
+
+def test_cli_should_generate_large_enums_in_parallel_with_jobs_option(
+    cli_runner, enum_file, status_definition, monkeypatch
+):
+    monkeypatch.setattr(generators, "_MEMBERS_PER_CHUNK", 1)
+    result = cli_runner.invoke(cli, ["--jobs", "2", "--names", str(enum_file)])
+    assert result.output == generate(status_definition, names=True) + "\n"
+
+
 def test_cli_should_fail_if_input_cannot_be_parsed(cli_runner):
     result = cli_runner.invoke(
         cli, input=""" " let's open a string literal and never close it """
@@ -66,3 +121,674 @@ def test_cli_should_fail_if_input_is_invalid(cli_runner, status_definition_dict)
     del status_definition_dict["members"][0]["name"]
     result = cli_runner.invoke(cli, input=yaml.dump(status_definition_dict))
     assert result.exit_code != 0
+
+
+def test_cli_should_fail_if_file_does_not_exist(cli_runner, tmpdir):
+    result = cli_runner.invoke(cli, [str(tmpdir.join("missing.yaml"))])
+    assert result.exit_code == 2
+    assert "Invalid value for '[FILE]...'" in result.output
+
+
+def test_cli_should_write_headers_to_output_dir(
+    cli_runner, tmpdir, enum_file, status_definition
+):
+    output_dir = tmpdir.join("include")
+    result = cli_runner.invoke(cli, ["--output-dir", str(output_dir), str(enum_file)])
+    assert result.exit_code == 0
+    assert output_dir.join("enum.hh").read() == generate(status_definition) + "\n"
+
+
+def test_cli_should_generate_multiple_files_in_one_invocation(
+    cli_runner, tmpdir, enum_file, status_definition
+):
+    another_enum_file = tmpdir.join("another.yaml")
+    enum_file.copy(another_enum_file)
+    output_dir = tmpdir.join("include")
+    result = cli_runner.invoke(
+        cli, ["--output-dir", str(output_dir), str(enum_file), str(another_enum_file)]
+    )
+    assert result.exit_code == 0
+    assert output_dir.join("enum.hh").read() == generate(status_definition) + "\n"
+    assert output_dir.join("another.hh").read() == generate(status_definition) + "\n"
+
+
+def test_cli_should_not_rewrite_unchanged_headers(cli_runner, tmpdir, enum_file):
+    output_dir = tmpdir.join("include")
+    cli_runner.invoke(cli, ["--output-dir", str(output_dir), str(enum_file)])
+    header = output_dir.join("enum.hh")
+    header.setmtime(0)
+    cli_runner.invoke(cli, ["--output-dir", str(output_dir), str(enum_file)])
+    assert header.mtime() == 0
+
+
+def test_cli_should_touch_stamp(cli_runner, tmpdir, enum_file):
+    stamp = tmpdir.join("enum.stamp")
+    result = cli_runner.invoke(cli, ["--stamp", str(stamp), str(enum_file)])
+    assert result.exit_code == 0
+    assert stamp.check(file=1)
+
+
+def test_cli_should_fail_if_files_would_write_same_header(
+    cli_runner, tmpdir, status_definition_dict
+):
+    for directory in ["a", "b"]:
+        tmpdir.mkdir(directory).join("status.json").write(
+            json.dumps(status_definition_dict)
+        )
+    result = cli_runner.invoke(
+        cli,
+        [
+            "--output-dir",
+            str(tmpdir.join("out")),
+            str(tmpdir.join("a/status.json")),
+            str(tmpdir.join("b/status.json")),
+        ],
+    )
+    assert result.exit_code != 0
+    assert "would be written to" in result.output
+    assert not tmpdir.join("out").check()
+
+
+def test_cli_should_not_read_stdin_with_output_dir(cli_runner, tmpdir):
+    result = cli_runner.invoke(cli, ["--output-dir", str(tmpdir)])
+    assert result.exit_code != 0
+
+
+def test_cli_should_write_depfile_for_stamp(cli_runner, tmpdir, enum_file):
+    stamp = tmpdir.join("enum.stamp")
+    depfile = tmpdir.join("enum.d")
+    result = cli_runner.invoke(
+        cli,
+        [
+            "--output-dir",
+            str(tmpdir.join("include")),
+            "--stamp",
+            str(stamp),
+            "--depfile",
+            str(depfile),
+            str(enum_file),
+        ],
+    )
+    assert result.exit_code == 0
+    target, dependencies = depfile.read().split(":", 1)
+    assert target == str(stamp)
+    assert str(enum_file) in dependencies
+    assert "enum_definitions.hh.in" in dependencies
+
+
+def test_cli_should_write_depfile_for_headers(cli_runner, tmpdir, enum_file):
+    output_dir = tmpdir.join("include")
+    depfile = tmpdir.join("enum.d")
+    result = cli_runner.invoke(
+        cli,
+        ["--output-dir", str(output_dir), "--depfile", str(depfile), str(enum_file)],
+    )
+    assert result.exit_code == 0
+    target, _ = depfile.read().split(":", 1)
+    assert target == str(output_dir.join("enum.hh"))
+
+
+def test_cli_should_require_target_for_depfile(cli_runner, tmpdir, enum_file):
+    result = cli_runner.invoke(
+        cli, ["--depfile", str(tmpdir.join("enum.d")), str(enum_file)]
+    )
+    assert result.exit_code != 0
+
+
+@pytest.fixture
+def single_poll_watch(monkeypatch):
+    """Make the watch mode of the CLI exit after polling once"""
+
+    def _watch(self, callback, **kwargs):
+        for path in self.poll():
+            callback(path)
+
+    monkeypatch.setattr(Watcher, "watch", _watch)
+
+
+def test_cli_watch_should_generate_headers(
+    cli_runner, tmpdir, enum_file, status_definition, single_poll_watch
+):
+    output_dir = tmpdir.join("include")
+    result = cli_runner.invoke(
+        cli, ["--watch", str(tmpdir), "--output-dir", str(output_dir)]
+    )
+    assert result.exit_code == 0
+    assert output_dir.join("enum.hh").read() == generate(status_definition) + "\n"
+    assert "generated" in result.output
+
+
+def test_cli_watch_should_report_json_events(
+    cli_runner, tmpdir, enum_file, single_poll_watch
+):
+    output_dir = tmpdir.join("include")
+    result = cli_runner.invoke(
+        cli,
+        ["--watch", str(tmpdir), "--output-dir", str(output_dir), "--events", "json"],
+    )
+    assert json.loads(result.output) == {
+        "event": "generated",
+        "input": str(enum_file),
+        "output": str(output_dir.join("enum.hh")),
+    }
+
+
+def test_cli_watch_should_report_errors_without_failing(
+    cli_runner, tmpdir, single_poll_watch
+):
+    tmpdir.join("invalid.yaml").write("typename: Invalid")
+    result = cli_runner.invoke(
+        cli,
+        ["--watch", str(tmpdir), "--output-dir", str(tmpdir), "--events", "json"],
+    )
+    assert result.exit_code == 0
+    assert json.loads(result.output)["event"] == "error"
+
+
+def test_cli_watch_should_require_output_dir(cli_runner, tmpdir):
+    result = cli_runner.invoke(cli, ["--watch", str(tmpdir)])
+    assert result.exit_code != 0
+    assert "--watch requires --output-dir" in result.output
+
+
+def test_cli_should_report_only_given_incompatible_options(cli_runner, tmpdir):
+    result = cli_runner.invoke(
+        cli,
+        ["--watch", str(tmpdir), "--output-dir", str(tmpdir), "--check", "--plan"],
+    )
+    assert result.exit_code != 0
+    assert "--watch cannot be used with --check or --plan" in result.output
+
+
+def test_cli_should_load_json_file(
+    cli_runner, tmpdir, status_definition_dict, status_definition
+):
+    path = tmpdir.join("enum.json")
+    path.write(json.dumps(status_definition_dict))
+    result = cli_runner.invoke(cli, [str(path)])
+    assert result.output == generate(status_definition) + "\n"
+
+
+def test_cli_should_load_csv_file(cli_runner, tmpdir):
+    path = tmpdir.join("table.csv")
+    path.write("name,value\nINITIALIZING,initializing\n")
+    result = cli_runner.invoke(cli, ["--typename", "Status", str(path)])
+    expected_definition = {
+        "typename": "Status",
+        "members": [{"name": "INITIALIZING", "value": "initializing"}],
+    }
+    assert result.output == generate(expected_definition) + "\n"
+
+
+def test_cli_should_have_format_option(
+    cli_runner, status_definition_dict, status_definition
+):
+    result = cli_runner.invoke(
+        cli, ["--format", "json"], input=json.dumps(status_definition_dict)
+    )
+    assert result.output == generate(status_definition) + "\n"
+
+
+def test_cli_should_generate_module_interface(cli_runner, enum_file, status_definition):
+    result = cli_runner.invoke(
+        cli, ["--module", "status", "--namespace", "testapp", str(enum_file)]
+    )
+    assert (
+        result.output
+        == generate_module(
+            [status_definition], module_name="status", namespace="testapp"
+        )
+        + "\n"
+    )
+
+
+def test_cli_should_write_module_interface_to_output_dir(
+    cli_runner, tmpdir, enum_file, status_definition
+):
+    output_dir = tmpdir.join("modules")
+    result = cli_runner.invoke(
+        cli, ["--module", "status", "--output-dir", str(output_dir), str(enum_file)]
+    )
+    assert result.exit_code == 0
+    assert (
+        output_dir.join("status.cppm").read()
+        == generate_module([status_definition], module_name="status") + "\n"
+    )
+
+
+def test_cli_should_generate_python_module(
+    cli_runner, enum_file, status_definition_dict
+):
+    result = cli_runner.invoke(
+        cli, ["--python", "--primary-type", "enhanced", str(enum_file)]
+    )
+    assert (
+        result.output
+        == generate_python_module(status_definition_dict, primary_type="enhanced")
+        + "\n"
+    )
+
+
+def test_cli_should_write_python_modules_to_output_dir(
+    cli_runner, tmpdir, enum_file, status_definition_dict
+):
+    output_dir = tmpdir.join("modules")
+    result = cli_runner.invoke(
+        cli, ["--python", "--output-dir", str(output_dir), str(enum_file)]
+    )
+    assert result.exit_code == 0
+    assert (
+        output_dir.join("enum.py").read()
+        == generate_python_module(status_definition_dict) + "\n"
+    )
+
+
+@pytest.mark.parametrize("option", [["--check"], ["--plan"], ["--module", "status"]])
+def test_cli_python_should_fail_with_incompatible_options(
+    cli_runner, tmpdir, enum_file, option
+):
+    result = cli_runner.invoke(
+        cli, ["--python", "--output-dir", str(tmpdir), str(enum_file)] + option
+    )
+    assert result.exit_code != 0
+    assert "--python cannot be used" in result.output
+
+
+def test_cli_should_write_split_headers_to_output_dir(
+    cli_runner, tmpdir, enum_file, status_definition
+):
+    output_dir = tmpdir.join("include")
+    result = cli_runner.invoke(
+        cli,
+        [
+            "--split-headers",
+            "--documentation",
+            "doxygen",
+            "--output-dir",
+            str(output_dir),
+            str(enum_file),
+        ],
+    )
+    assert result.exit_code == 0
+    assert output_dir.join("enum_label.hh").read() == (
+        "#pragma once\n\n"
+        + generate_label_enum(status_definition, documentation="doxygen")
+        + "\n"
+    )
+    assert output_dir.join("enum.hh").read() == (
+        '#include "enum_label.hh"\n\n'
+        + generate(status_definition, documentation="doxygen", label_enum=False)
+        + "\n"
+    )
+
+
+def test_cli_should_write_split_headers_to_depfile(cli_runner, tmpdir, enum_file):
+    output_dir = tmpdir.join("include")
+    depfile = tmpdir.join("enum.d")
+    result = cli_runner.invoke(
+        cli,
+        [
+            "--split-headers",
+            "--output-dir",
+            str(output_dir),
+            "--depfile",
+            str(depfile),
+            str(enum_file),
+        ],
+    )
+    assert result.exit_code == 0
+    targets, _ = depfile.read().split(":", 1)
+    assert targets.split() == [
+        str(output_dir.join("enum_label.hh")),
+        str(output_dir.join("enum.hh")),
+    ]
+
+
+@pytest.mark.parametrize(
+    "option", [[], ["--check"], ["--plan"], ["--module", "status"], ["--python"]]
+)
+def test_cli_split_headers_should_fail_with_incompatible_options(
+    cli_runner, tmpdir, enum_file, option
+):
+    output_dir = [] if option == [] else ["--output-dir", str(tmpdir)]
+    result = cli_runner.invoke(
+        cli, ["--split-headers"] + output_dir + option + [str(enum_file)]
+    )
+    assert result.exit_code != 0
+    assert "--split-headers" in result.output
+
+
+@pytest.fixture
+def manifest(tmpdir, enum_file):
+    """Return path to a manifest pairing :func:`enum_file()` with a header"""
+    p = tmpdir.join("manifest.json")
+    p.write(json.dumps([{"definition": enum_file.basename, "header": "out/enum.hh"}]))
+    return p
+
+
+def test_cli_should_write_headers_listed_in_manifest(
+    cli_runner, tmpdir, manifest, status_definition
+):
+    result = cli_runner.invoke(cli, ["--manifest", str(manifest)])
+    assert result.exit_code == 0
+    assert tmpdir.join("out/enum.hh").read() == generate(status_definition) + "\n"
+
+
+def test_cli_should_not_accept_files_with_manifest(cli_runner, manifest, enum_file):
+    result = cli_runner.invoke(cli, ["--manifest", str(manifest), str(enum_file)])
+    assert result.exit_code != 0
+
+
+def test_cli_should_fail_if_definition_in_manifest_does_not_exist(
+    cli_runner, tmpdir
+):
+    manifest = tmpdir.join("manifest.json")
+    manifest.write(json.dumps([{"definition": "missing.yaml", "header": "enum.hh"}]))
+    result = cli_runner.invoke(cli, ["--manifest", str(manifest)])
+    assert result.exit_code == 1
+    assert "Could not open file" in result.output
+    assert not tmpdir.join("enum.hh").exists()
+
+
+@pytest.mark.parametrize("processes", ["1", "2"])
+def test_cli_check_should_succeed_if_headers_are_up_to_date(
+    cli_runner, tmpdir, enum_file, processes
+):
+    output_dir = tmpdir.join("include")
+    cli_runner.invoke(cli, ["--output-dir", str(output_dir), str(enum_file)])
+    result = cli_runner.invoke(
+        cli,
+        [
+            "--check",
+            "--jobs",
+            processes,
+            "--output-dir",
+            str(output_dir),
+            str(enum_file),
+        ],
+    )
+    assert result.exit_code == 0
+    assert result.output == ""
+
+
+def test_cli_check_should_report_stale_headers(cli_runner, tmpdir, manifest):
+    cli_runner.invoke(cli, ["--manifest", str(manifest)])
+    header = tmpdir.join("out/enum.hh")
+    header.write("// Stale\n", mode="a")
+    result = cli_runner.invoke(cli, ["--check", "--manifest", str(manifest)])
+    assert result.exit_code != 0
+    assert result.output.splitlines()[0] == str(header)
+
+
+def test_cli_check_should_not_write_headers(cli_runner, tmpdir, manifest):
+    result = cli_runner.invoke(cli, ["--check", "--manifest", str(manifest)])
+    assert result.exit_code != 0
+    assert not tmpdir.join("out/enum.hh").check()
+
+
+def test_cli_check_should_require_headers(cli_runner, enum_file):
+    result = cli_runner.invoke(cli, ["--check", str(enum_file)])
+    assert result.exit_code != 0
+
+
+@pytest.fixture
+def large_manifest(tmpdir, status_definition_dict):
+    """Return path to a manifest listing ten definitions"""
+    entries = []
+    for n in range(10):
+        tmpdir.join(f"enum{n}.json").write(
+            json.dumps(dict(status_definition_dict, typename=f"Enum{n}"))
+        )
+        entries.append({"definition": f"enum{n}.json", "header": f"out/enum{n}.hh"})
+    p = tmpdir.join("manifest.json")
+    p.write(json.dumps(entries))
+    return p
+
+
+def test_cli_should_write_headers_of_shard(cli_runner, tmpdir, large_manifest):
+    headers = []
+    for index in range(1, 4):
+        result = cli_runner.invoke(
+            cli, ["--manifest", str(large_manifest), "--shard", f"{index}/3"]
+        )
+        assert result.exit_code == 0
+        shard_headers = set(tmpdir.join("out").listdir()) - set(headers)
+        assert 0 < len(shard_headers) < 10
+        headers.extend(shard_headers)
+    assert len(headers) == 10
+
+
+def test_cli_should_write_results(cli_runner, tmpdir, manifest, status_definition):
+    result = cli_runner.invoke(
+        cli,
+        ["--manifest", str(manifest), "--results", str(tmpdir.join("results.json"))],
+    )
+    assert result.exit_code == 0
+    assert json.loads(tmpdir.join("results.json").read()) == {
+        "shard": "1/1",
+        "results": [
+            {
+                "definition": "enum.yaml",
+                "header": "out/enum.hh",
+                "fingerprint": plan(status_definition).fingerprint,
+                "status": "generated",
+            }
+        ],
+    }
+    cli_runner.invoke(
+        cli,
+        ["--manifest", str(manifest), "--results", str(tmpdir.join("results.json"))],
+    )
+    assert "unchanged" in tmpdir.join("results.json").read()
+
+
+def test_cli_should_load_definitions_once_when_writing_results(
+    cli_runner, tmpdir, manifest, monkeypatch
+):
+    loads = []
+    load = loaders.load
+
+    def counting_load(file, **options):
+        loads.append(file.name)
+        return load(file, **options)
+
+    monkeypatch.setattr(loaders, "load", counting_load)
+    result = cli_runner.invoke(
+        cli,
+        ["--manifest", str(manifest), "--results", str(tmpdir.join("results.json"))],
+    )
+    assert result.exit_code == 0
+    assert len(loads) == 1
+
+
+def test_cli_should_write_results_of_split_headers(
+    cli_runner, tmpdir, manifest, status_definition
+):
+    result = cli_runner.invoke(
+        cli,
+        [
+            "--manifest",
+            str(manifest),
+            "--split-headers",
+            "--results",
+            str(tmpdir.join("results.json")),
+        ],
+    )
+    assert result.exit_code == 0
+    (entry,) = json.loads(tmpdir.join("results.json").read())["results"]
+    assert entry["fingerprint"] == plan(status_definition, label_enum=False).fingerprint
+
+
+def _run_shards(cli_runner, tmpdir, manifest, count, options=()):
+    paths = [str(tmpdir.join(f"results{index}.json")) for index in range(1, count + 1)]
+    for (index, path) in enumerate(paths, 1):
+        cli_runner.invoke(
+            cli,
+            ["--manifest", str(manifest), "--shard", f"{index}/{count}"]
+            + ["--results", path]
+            + list(options),
+        )
+    return paths
+
+
+def test_cli_should_merge_results(cli_runner, tmpdir, large_manifest):
+    paths = _run_shards(cli_runner, tmpdir, large_manifest, 3)
+    result = cli_runner.invoke(
+        cli, ["--merge-results", "--results", str(tmpdir.join("merged.json"))] + paths
+    )
+    assert result.exit_code == 0
+    merged = json.loads(tmpdir.join("merged.json").read())
+    assert merged["shard"] == "1/1"
+    assert sorted(result["header"] for result in merged["results"]) == sorted(
+        f"out/enum{n}.hh" for n in range(10)
+    )
+
+
+def test_cli_merge_results_should_report_stale_headers(
+    cli_runner, tmpdir, large_manifest
+):
+    cli_runner.invoke(cli, ["--manifest", str(large_manifest)])
+    tmpdir.join("out/enum3.hh").write("// Stale\n", mode="a")
+    paths = _run_shards(cli_runner, tmpdir, large_manifest, 2, ["--check"])
+    result = cli_runner.invoke(cli, ["--merge-results"] + paths)
+    assert result.exit_code != 0
+    assert "out/enum3.hh" in result.output
+
+
+def test_cli_merge_results_should_fail_if_shard_is_missing(
+    cli_runner, tmpdir, large_manifest
+):
+    paths = _run_shards(cli_runner, tmpdir, large_manifest, 3)
+    result = cli_runner.invoke(cli, ["--merge-results"] + paths[1:])
+    assert result.exit_code != 0
+
+
+@pytest.mark.parametrize(
+    "option", [["--shard", "0/2"], ["--shard", "2"], ["--shard", "1/2", "--python"]]
+)
+def test_cli_should_fail_with_invalid_shard(cli_runner, manifest, option):
+    result = cli_runner.invoke(cli, ["--manifest", str(manifest)] + option)
+    assert result.exit_code != 0
+
+
+def test_cli_shard_should_require_headers(cli_runner, enum_file):
+    result = cli_runner.invoke(cli, ["--shard", "1/2", str(enum_file)])
+    assert result.exit_code != 0
+
+
+def test_cli_merge_results_should_fail_with_manifest(cli_runner, manifest):
+    result = cli_runner.invoke(cli, ["--merge-results", "--manifest", str(manifest)])
+    assert result.exit_code != 0
+
+
+def test_cli_should_print_plan(cli_runner, tmpdir, manifest, status_definition):
+    result = cli_runner.invoke(cli, ["--plan", "--manifest", str(manifest)])
+    assert result.exit_code == 0
+    assert json.loads(result.output) == [
+        {
+            "definition": str(tmpdir.join("enum.yaml")),
+            "header": str(tmpdir.join("out/enum.hh")),
+            **plan(status_definition)._asdict(),
+        }
+    ]
+    assert not tmpdir.join("out/enum.hh").check()
+
+
+def test_cli_plan_should_pass_options(cli_runner, enum_file, status_definition):
+    result = cli_runner.invoke(cli, ["--plan", "--names", str(enum_file)])
+    assert (
+        json.loads(result.output)[0]["fingerprint"]
+        == plan(status_definition, names=True).fingerprint
+    )
+
+
+@pytest.mark.parametrize("option", [["--check"], ["--module", "status"]])
+def test_cli_plan_should_fail_with_incompatible_options(cli_runner, manifest, option):
+    result = cli_runner.invoke(cli, ["--plan", "--manifest", str(manifest)] + option)
+    assert result.exit_code != 0
+
+
+def test_cli_plan_should_fail_with_standard_input(cli_runner):
+    result = cli_runner.invoke(cli, ["--plan"], input="{}")
+    assert result.exit_code != 0
+
+
+def test_cli_should_store_headers_in_cache(cli_runner, cache_server, large_manifest):
+    result = cli_runner.invoke(
+        cli, ["--manifest", str(large_manifest), "--cache-url", cache_server.url]
+    )
+    assert result.exit_code == 0
+    assert len(cache_server.entries) == 10
+    assert cache_server.connections == 1
+    assert "0 hits, 10 misses, 10 stores, 0 errors" in result.stderr
+
+
+def test_cli_should_fetch_headers_from_cache(
+    cli_runner, tmpdir, cache_server, large_manifest
+):
+    cli_runner.invoke(
+        cli, ["--manifest", str(large_manifest), "--cache-url", cache_server.url]
+    )
+    headers = {path.basename: path.read() for path in tmpdir.join("out").listdir()}
+    tmpdir.join("out").remove()
+    cache_server.requests.clear()
+    result = cli_runner.invoke(
+        cli, ["--manifest", str(large_manifest), "--cache-url", cache_server.url]
+    )
+    assert result.exit_code == 0
+    assert {
+        path.basename: path.read() for path in tmpdir.join("out").listdir()
+    } == headers
+    assert all(method == "GET" for (method, _) in cache_server.requests)
+    assert "10 hits, 0 misses, 0 stores, 0 errors" in result.stderr
+
+
+def test_cli_cache_should_pass_options(
+    cli_runner, cache_server, enum_file, status_definition
+):
+    result = cli_runner.invoke(
+        cli, ["--names", "--cache-url", cache_server.url, str(enum_file)]
+    )
+    assert result.stdout == generate(status_definition, names=True) + "\n"
+    fingerprint = plan(status_definition, names=True).fingerprint
+    assert f"/enumecg/{fingerprint}" in cache_server.entries
+
+
+def test_cli_should_generate_headers_if_cache_times_out(
+    cli_runner, tmpdir, cache_server, enum_file, status_definition
+):
+    cache_server.delay = 1
+    result = cli_runner.invoke(
+        cli,
+        [
+            "--output-dir",
+            str(tmpdir.join("out")),
+            "--cache-url",
+            cache_server.url,
+            "--cache-timeout",
+            "0.1",
+            str(enum_file),
+        ],
+    )
+    assert result.exit_code == 0
+    assert tmpdir.join("out/enum.hh").read() == generate(status_definition) + "\n"
+    assert "1 errors" in result.stderr
+
+
+def test_cli_should_fail_with_invalid_cache_url(cli_runner, enum_file):
+    result = cli_runner.invoke(cli, ["--cache-url", "enumecg", str(enum_file)])
+    assert result.exit_code != 0
+
+
+@pytest.mark.parametrize(
+    "option", [["--check"], ["--plan"], ["--python"], ["--split-headers"]]
+)
+def test_cli_cache_should_fail_with_incompatible_options(
+    cli_runner, cache_server, manifest, option
+):
+    result = cli_runner.invoke(
+        cli,
+        ["--manifest", str(manifest), "--cache-url", cache_server.url] + option,
+    )
+    assert result.exit_code != 0
+    assert not cache_server.requests
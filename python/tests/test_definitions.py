@@ -1,10 +1,17 @@
+import enum
+import gc
+
 import pytest
 
+from enumecg import definitions
 from enumecg.definitions import (
     EnumDefinition,
     EnumMemberDefinition,
     make_definition,
+    map_member_chunks,
     PrimaryType,
+    clear_definition_cache,
+    get_definition_cache_info,
 )
 from enumecg.exceptions import Error
 
@@ -65,9 +72,256 @@ def test_make_definition_type_deduction(nested_enum_definition_dict):
     )
 
 
+def test_make_definition_narrow_type_deduction(nested_enum_definition_dict):
+    nested_enum_definition = make_definition(
+        nested_enum_definition_dict, narrow_types=True
+    )
+    assert (
+        nested_enum_definition.value_type_typename
+        == "std::tuple<std::uint8_t, std::tuple<std::string_view, bool>>"
+    )
+
+
+def test_make_definition_array_sequences(status_definition_dict):
+    status_definition_dict["members"][0]["value"] = (1, 2)
+    status_definition_dict["members"][1]["value"] = (3, 4)
+    status_definition_dict["members"][2]["value"] = (5, 6)
+    definition = make_definition(status_definition_dict, array_sequences=True)
+    assert definition.value_type_typename == "std::array<long, 2>"
+    initializers = [
+        member.enumerator_value_initializers for member in definition.members
+    ]
+    assert initializers == [[["1", "2"]], [["3", "4"]], [["5", "6"]]]
+
+
 def test_make_definition_enumerator_value_initializers(nested_enum_definition_dict):
     nested_enum_definition = make_definition(nested_enum_definition_dict)
     assert nested_enum_definition.members[0].enumerator_value_initializers == [
         "0",
         ['"string"', "true"],
     ]
+
+
+_PERMISSION_DEFINITION_DICT = {
+    "typename": "Permission",
+    "flags": True,
+    "members": [
+        {"name": "READ"},
+        {"name": "WRITE", "value": 1},
+        {"name": "EXECUTE"},
+        {"name": "DELETE", "value": 16},
+    ],
+}
+
+
+def test_make_definition_should_assign_flag_values():
+    definition = make_definition(_PERMISSION_DEFINITION_DICT)
+    assert definition.flags_typename == "PermissionFlags"
+    assert [member.enumerator_value for member in definition.members] == [
+        2,
+        1,
+        4,
+        16,
+    ]
+    assert [
+        member.enumerator_value_initializers for member in definition.members
+    ] == ["2", "1", "4", "16"]
+
+
+def test_make_definition_should_not_make_flags_by_default(status_definition_dict):
+    assert make_definition(status_definition_dict).flags_typename is None
+
+
+@pytest.mark.parametrize("value", [0, 3, -2, True, 2.0, "2"])
+def test_make_definition_should_raise_error_on_invalid_flag_value(value):
+    members = [{"name": "READ", "value": value}]
+    with pytest.raises(Error):
+        make_definition(dict(_PERMISSION_DEFINITION_DICT, members=members))
+
+
+def test_make_definition_should_raise_error_on_duplicate_flag_values():
+    members = [{"name": "READ", "value": 4}, {"name": "WRITE", "value": 4}]
+    with pytest.raises(Error):
+        make_definition(dict(_PERMISSION_DEFINITION_DICT, members=members))
+
+
+def test_make_definition_should_make_flags_from_python_flag():
+    class Permission(enum.Flag):
+        READ = enum.auto()
+        WRITE = enum.auto()
+
+    definition = make_definition(Permission)
+    assert definition.flags_typename == "PermissionFlags"
+    assert [member.enumerator_value for member in definition.members] == [1, 2]
+
+
+def test_make_definition_should_skip_empty_and_composite_python_flags():
+    class Permission(enum.Flag):
+        NONE = 0
+        READ = 1
+        WRITE = 2
+        READ_WRITE = READ | WRITE
+        EXECUTE = 4
+
+    definition = make_definition(Permission)
+    assert [member.enumerator_name for member in definition.members] == [
+        "READ",
+        "WRITE",
+        "EXECUTE",
+    ]
+    assert [member.enumerator_value for member in definition.members] == [1, 2, 4]
+
+
+def test_map_member_chunks_should_assign_flag_values_across_chunks():
+    _, chunks = map_member_chunks(
+        _PERMISSION_DEFINITION_DICT, _get_chunk, chunk_size=1
+    )
+    assert [
+        member for (_, chunk) in chunks for member in chunk.members
+    ] == make_definition(_PERMISSION_DEFINITION_DICT).members
+
+
+@pytest.fixture
+def empty_definition_cache():
+    """Clear the definition cache before and after the test"""
+    clear_definition_cache()
+    yield
+    clear_definition_cache()
+
+
+def test_make_definition_should_cache_python_enum_definitions(
+    status_definition, empty_definition_cache
+):
+    assert make_definition(Status) == status_definition
+    assert make_definition(Status) == status_definition
+    info = get_definition_cache_info()
+    assert (info.hits, info.misses, info.size) == (1, 1, 1)
+
+
+def test_definition_cache_should_be_keyed_by_options(empty_definition_cache):
+    label_definition = make_definition(Status, primary_type=PrimaryType.label)
+    enhanced_definition = make_definition(Status, primary_type=PrimaryType.enhanced)
+    assert label_definition != enhanced_definition
+    info = get_definition_cache_info()
+    assert (info.hits, info.misses, info.size) == (0, 2, 2)
+
+
+@pytest.mark.parametrize("option", ["narrow_types", "array_sequences"])
+def test_definition_cache_should_be_keyed_by_deduction_options(
+    empty_definition_cache, option
+):
+    make_definition(Status)
+    make_definition(Status, **{option: True})
+    info = get_definition_cache_info()
+    assert (info.hits, info.misses, info.size) == (0, 2, 2)
+
+
+def test_cached_definition_should_be_copied(status_definition, empty_definition_cache):
+    make_definition(Status).members.clear()
+    assert make_definition(Status) == status_definition
+
+
+def test_cached_definition_should_share_enumerator_values(empty_definition_cache):
+    class Sequences(enum.Enum):
+        VALUE = [1, 2]
+
+    first = make_definition(Sequences).members[0]
+    second = make_definition(Sequences).members[0]
+    assert first is not second
+    assert first.enumerator_value is second.enumerator_value
+
+
+def test_definition_cache_should_not_keep_enum_alive(empty_definition_cache):
+    class Temporary(enum.Enum):
+        VALUE = 1
+
+    make_definition(Temporary)
+    assert get_definition_cache_info().size == 1
+    del Temporary
+    gc.collect()
+    assert get_definition_cache_info().size == 0
+
+
+def test_clear_definition_cache(empty_definition_cache):
+    make_definition(Status)
+    clear_definition_cache()
+    info = get_definition_cache_info()
+    assert (info.hits, info.misses, info.size) == (0, 0, 0)
+
+
+def test_definition_cache_should_not_cache_errors(empty_definition_cache):
+    class Invalid(enum.Enum):
+        VALUE = object()
+
+    for _ in range(2):
+        with pytest.raises(Error):
+            make_definition(Invalid)
+    assert Invalid not in definitions._DEFINITION_CACHE._definitions
+
+
+def _get_chunk(definition, start):
+    return start, definition
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_map_member_chunks_should_split_members_to_chunks(
+    status_definition, processes, chunk_size
+):
+    definition, chunks = map_member_chunks(
+        Status, _get_chunk, chunk_size=chunk_size, processes=processes
+    )
+    assert [start for (start, _) in chunks] == list(
+        range(0, len(status_definition.members), chunk_size)
+    )
+    assert [
+        member for (_, chunk) in chunks for member in chunk.members
+    ] == status_definition.members
+    for (_, chunk) in chunks:
+        assert chunk.label_enum_typename == status_definition.label_enum_typename
+    assert definition.members == []
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_map_member_chunks_should_accept_native_definition(
+    status_definition, processes
+):
+    definition, chunks = map_member_chunks(
+        status_definition, _get_chunk, chunk_size=2, processes=processes
+    )
+    assert [
+        member for (_, chunk) in chunks for member in chunk.members
+    ] == status_definition.members
+
+
+def test_map_member_chunks_should_pass_options_to_definition(
+    nested_enum_definition_dict,
+):
+    _, chunks = map_member_chunks(
+        nested_enum_definition_dict,
+        _get_chunk,
+        chunk_size=1,
+        narrow_types=True,
+        array_sequences=True,
+    )
+    expected = make_definition(
+        nested_enum_definition_dict, narrow_types=True, array_sequences=True
+    )
+    assert [
+        member for (_, chunk) in chunks for member in chunk.members
+    ] == expected.members
+
+
+def test_map_member_chunks_should_raise_error_on_invalid_definition(
+    status_definition_dict,
+):
+    del status_definition_dict["typename"]
+    with pytest.raises(Error):
+        map_member_chunks(status_definition_dict, _get_chunk, chunk_size=1)
+
+
+def test_map_member_chunks_should_reject_unknown_options(status_definition_dict):
+    with pytest.raises(TypeError):
+        map_member_chunks(
+            status_definition_dict, _get_chunk, chunk_size=1, unknown_option=True
+        )
@@ -1,7 +1,16 @@
 import pytest
 
-from enumecg import generate, generator
-from enumecg.generators import CodeGenerator, DocumentationStyle
+from enumecg import (
+    generate,
+    generate_label_enum,
+    generate_module,
+    generate_python_module,
+    generator,
+    generators,
+    iter_generate,
+    plan,
+)
+from enumecg.generators import CodeGenerator, DirectCodeGenerator, DocumentationStyle
 from enumecg.definitions import PrimaryType
 from enumecg.exceptions import Error
 
@@ -10,12 +19,88 @@ def test_generator_function_should_return_code_generator():
     assert type(generator()) is CodeGenerator
 
 
+@pytest.mark.parametrize(
+    "backend,generator_class",
+    [("jinja", CodeGenerator), ("direct", DirectCodeGenerator)],
+)
+def test_generator_function_should_select_backend(backend, generator_class):
+    assert type(generator(backend=backend)) is generator_class
+
+
+def test_generate_in_parallel_should_return_same_code(status_definition, monkeypatch):
+    monkeypatch.setattr(generators, "_MEMBERS_PER_CHUNK", 1)
+    assert generate(status_definition, processes=2) == generate(status_definition)
+
+
+def test_generate_with_string_blob_should_return_code(status_definition):
+    assert generate(status_definition, string_blob=True) == CodeGenerator(
+        string_blob=True
+    ).generate_enum_definitions(status_definition)
+    assert plan(status_definition, string_blob=True) == CodeGenerator(
+        string_blob=True
+    ).plan_enum_definitions(status_definition)
+
+
+def test_generator_function_should_fail_if_backend_is_invalid():
+    with pytest.raises(Error):
+        generator(backend="invalid")
+
+
 def test_generate_should_return_code(status_definition):
     assert generate(status_definition, documentation="doxygen") == CodeGenerator(
         documentation=DocumentationStyle.doxygen
     ).generate_enum_definitions(status_definition)
 
 
+def test_generate_should_pass_names_to_generator(status_definition):
+    assert generate(status_definition, names=True) == CodeGenerator(
+        names=True
+    ).generate_enum_definitions(status_definition)
+
+
+def test_generate_should_pass_narrow_types_to_definition(nested_enum_definition_dict):
+    assert "std::uint8_t" in generate(nested_enum_definition_dict, narrow_types=True)
+
+
+def test_generate_should_pass_array_sequences_to_definition(
+    nested_enum_definition_dict,
+):
+    nested_enum_definition_dict["members"][0]["value"] = (1, 2)
+    assert "std::array<long, 2>" in generate(
+        nested_enum_definition_dict, array_sequences=True
+    )
+
+
+@pytest.mark.parametrize("documentation", [None, "doxygen"])
+def test_iter_generate_should_return_chunks_of_code(status_definition, documentation):
+    assert "".join(
+        iter_generate(status_definition, documentation=documentation)
+    ) == generate(status_definition, documentation=documentation)
+
+
+def test_plan_should_return_plan(status_definition):
+    assert plan(status_definition, documentation="doxygen") == CodeGenerator(
+        documentation=DocumentationStyle.doxygen
+    ).plan_enum_definitions(status_definition)
+
+
+def test_plan_should_accept_label_enum(status_definition):
+    assert plan(
+        status_definition, label_enum=False
+    ) == CodeGenerator().plan_enum_definitions(status_definition, label_enum=False)
+
+
+def test_plan_should_pass_options_to_definition(nested_enum_definition_dict):
+    enum_plan = plan(
+        nested_enum_definition_dict, primary_type="enhanced", narrow_types=True
+    )
+    assert enum_plan.enhanced_enum_typename == "NestedEnum"
+    assert (
+        enum_plan.value_type_typename
+        == "std::tuple<std::uint8_t, std::tuple<std::string_view, bool>>"
+    )
+
+
 @pytest.mark.parametrize("primary_type", PrimaryType)
 def test_generate_should_accept_primary_type_as_string(
     status_definition_dict, primary_type
@@ -42,3 +127,52 @@ def test_invalid_primary_type_should_raise_error(status_definition):
 def test_invalid_documentation_should_raise_error(status_definition):
     with pytest.raises(Error):
         generate(status_definition, documentation="invalid")
+
+
+def test_generate_label_enum_should_return_code(status_definition_dict):
+    assert generate_label_enum(
+        status_definition_dict, documentation="doxygen", primary_type="enhanced"
+    ) == CodeGenerator(
+        documentation=DocumentationStyle.doxygen
+    ).generate_label_enum_definition(
+        status_definition_dict, primary_type=PrimaryType.enhanced
+    )
+
+
+def test_generate_without_label_enum_should_return_code(status_definition_dict):
+    assert generate(
+        status_definition_dict, label_enum=False
+    ) == CodeGenerator().generate_enum_definitions(
+        status_definition_dict, label_enum=False
+    )
+    assert "".join(iter_generate(status_definition_dict, label_enum=False)) == (
+        generate(status_definition_dict, label_enum=False)
+    )
+
+
+def test_generate_module_should_return_code(status_definition_dict):
+    assert generate_module(
+        [status_definition_dict],
+        module_name="status",
+        documentation="doxygen",
+        primary_type="enhanced",
+    ) == CodeGenerator(
+        documentation=DocumentationStyle.doxygen
+    ).generate_module_interface(
+        [status_definition_dict],
+        module_name="status",
+        primary_type=PrimaryType.enhanced,
+    )
+
+
+def test_generate_python_module_should_return_code(status_definition_dict):
+    code = generate_python_module(status_definition_dict, primary_type="enhanced")
+    assert code == CodeGenerator().generate_python_module(
+        status_definition_dict, primary_type=PrimaryType.enhanced
+    )
+    assert "class Status(enum.Enum):" in code
+
+
+def test_generate_python_module_should_accept_class_name(status_definition_dict):
+    code = generate_python_module(status_definition_dict, class_name="PyStatus")
+    assert "class PyStatus(enum.Enum):" in code
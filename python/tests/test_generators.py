@@ -1,10 +1,23 @@
+import copy
+import enum as py_enum
+import os
 import pytest
+import random
 import re
+import string
+import sys
 
-from enumecg.generators import CodeGenerator, DocumentationStyle
+from enumecg.definitions import PrimaryType
+from enumecg import generators
+from enumecg.generators import CodeGenerator, DirectCodeGenerator, DocumentationStyle
 from enumecg.exceptions import Error
 
-from .conftest import STATUS_DEFINITION
+from .conftest import (
+    NESTED_ENUM_DEFINITION_DICT,
+    STATUS_DEFINITION,
+    STATUS_DEFINITION_DICT,
+    Status,
+)
 
 
 def _generate_enum_definitions(definition, documentation=None):
@@ -104,7 +117,527 @@ def test_enhanced_enum_documentation_should_contain_long_description(
     )
 
 
+def test_enum_definitions_should_not_contain_names_if_not_requested(enum_code):
+    assert "from_name" not in enum_code
+
+
+@pytest.mark.parametrize("member", STATUS_DEFINITION.members)
+def test_enum_definitions_should_contain_names_if_requested(status_definition, member):
+    enum_code = CodeGenerator(names=True).generate_enum_definitions(status_definition)
+    assert f'"{member.enumerator_name}",' in enum_code
+
+
+@pytest.mark.parametrize("member", STATUS_DEFINITION.members)
+def test_from_name_should_dispatch_by_name_length(status_definition, member):
+    enum_code = CodeGenerator(names=True).generate_enum_definitions(status_definition)
+    assert re.search(
+        rf"case {len(member.enumerator_name)}:\s+"
+        rf'if \(name == "{member.enumerator_name}"\) {{\s+'
+        rf"return StatusLabel::{member.enumerator_name};",
+        enum_code,
+    )
+
+
 def test_code_generation_should_fail_if_enum_definition_is_invalid(status_definition):
     status_definition.members[0].enumerator_value_initializers = object()
     with pytest.raises(Error):
         _generate_enum_definitions(status_definition)
+
+
+def test_plan_should_contain_typenames(status_definition):
+    enum_plan = CodeGenerator().plan_enum_definitions(status_definition)
+    assert enum_plan.label_enum_typename == "StatusLabel"
+    assert enum_plan.enhanced_enum_typename == "EnhancedStatus"
+    assert enum_plan.value_type_typename == "std::string_view"
+
+
+def test_plan_fingerprint_should_be_equal_for_equal_definitions(
+    status_definition_dict,
+):
+    assert (
+        CodeGenerator().plan_enum_definitions(status_definition_dict).fingerprint
+        == DirectCodeGenerator().plan_enum_definitions(Status).fingerprint
+    )
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        dict(documentation=DocumentationStyle.doxygen),
+        dict(names=True),
+        dict(string_blob=True),
+    ],
+)
+def test_plan_fingerprint_should_depend_on_generator_options(
+    status_definition, options
+):
+    assert (
+        CodeGenerator().plan_enum_definitions(status_definition).fingerprint
+        != CodeGenerator(**options).plan_enum_definitions(status_definition).fingerprint
+    )
+
+
+def test_plan_fingerprint_should_depend_on_definition(status_definition):
+    fingerprint = CodeGenerator().plan_enum_definitions(status_definition).fingerprint
+    status_definition.members[0].enumerator_value_initializers = '"changed"'
+    assert (
+        CodeGenerator().plan_enum_definitions(status_definition).fingerprint
+        != fingerprint
+    )
+
+
+def test_plan_fingerprint_should_depend_on_source_code(monkeypatch, status_definition):
+    fingerprint = CodeGenerator().plan_enum_definitions(status_definition).fingerprint
+    get_data = generators.pkgutil.get_data
+
+    def _get_modified_data(package, resource):
+        data = get_data(package, resource)
+        return data + b"# changed" if resource == "generators.py" else data
+
+    monkeypatch.setattr(generators.pkgutil, "get_data", _get_modified_data)
+    generators._get_code_digest.cache_clear()
+    try:
+        assert (
+            CodeGenerator().plan_enum_definitions(status_definition).fingerprint
+            != fingerprint
+        )
+    finally:
+        generators._get_code_digest.cache_clear()
+
+
+def test_plan_fingerprint_should_depend_on_label_enum(status_definition):
+    generator = CodeGenerator()
+    assert (
+        generator.plan_enum_definitions(status_definition).fingerprint
+        != generator.plan_enum_definitions(
+            status_definition, label_enum=False
+        ).fingerprint
+    )
+
+
+def test_label_enum_definition_should_contain_only_label_enum(status_definition):
+    code = CodeGenerator(names=True).generate_label_enum_definition(status_definition)
+    assert code.startswith("enum class StatusLabel")
+    assert "EnhancedStatus" not in code
+
+
+def test_enum_definitions_without_label_enum_should_not_contain_label_enum(
+    enum_code, status_definition
+):
+    code = CodeGenerator().generate_enum_definitions(
+        status_definition, label_enum=False
+    )
+    assert code.startswith("struct EnhancedStatus")
+    assert "enum class" not in code
+
+
+@pytest.mark.parametrize("documentation", [None, DocumentationStyle.doxygen])
+@pytest.mark.parametrize("processes", [1, 2])
+@pytest.mark.parametrize("generator_type", [CodeGenerator, DirectCodeGenerator])
+def test_split_definitions_should_be_equal_to_full_definitions(
+    status_definition, documentation, processes, generator_type
+):
+    generator = generator_type(
+        documentation=documentation, names=True, processes=processes
+    )
+    label_code = generator.generate_label_enum_definition(status_definition)
+    code = generator.generate_enum_definitions(status_definition, label_enum=False)
+    assert label_code + "\n\n" + code == generator.generate_enum_definitions(
+        status_definition
+    )
+    assert (
+        "".join(generator.iter_enum_definitions(status_definition, label_enum=False))
+        == code
+    )
+
+
+def test_dependencies_should_contain_templates():
+    dependencies = CodeGenerator().get_dependencies()
+    assert any(path.endswith("enum_definitions.hh.in") for path in dependencies)
+    assert not any(path.endswith(".doc.in") for path in dependencies)
+
+
+def test_dependencies_should_contain_documentation_templates_if_requested():
+    dependencies = CodeGenerator(
+        documentation=DocumentationStyle.doxygen
+    ).get_dependencies()
+    assert any(path.endswith("doxygen.doc.in") for path in dependencies)
+
+
+def test_dependencies_should_contain_package_sources():
+    dependencies = CodeGenerator().get_dependencies()
+    assert any(
+        path.endswith(os.path.join("enumecg", "generators.py")) for path in dependencies
+    )
+
+
+def test_dependencies_should_contain_python_enum_module():
+    dependencies = CodeGenerator().get_dependencies(Status)
+    assert dependencies[0] == sys.modules[Status.__module__].__file__
+
+
+@pytest.fixture
+def module_code(status_definition):
+    """Return module interface generated from the :func:`status_definition()` fixture"""
+    return CodeGenerator().generate_module_interface(
+        [status_definition], module_name="status"
+    )
+
+
+def test_module_interface_should_declare_module(module_code):
+    assert "export module status;" in module_code
+
+
+def test_module_interface_should_export_enhanced_enum_module(module_code):
+    assert "export import enhanced_enum;" in module_code
+
+
+def test_module_interface_should_contain_enum_definitions(
+    status_definition, module_code
+):
+    assert CodeGenerator().generate_enum_definitions(status_definition) in module_code
+
+
+def test_module_interface_should_contain_all_enums(status_definition):
+    another_definition = copy.deepcopy(status_definition)
+    another_definition.enhanced_enum_typename = "AnotherStatus"
+    module_code = CodeGenerator().generate_module_interface(
+        [status_definition, another_definition], module_name="statuses"
+    )
+    assert "struct EnhancedStatus" in module_code
+    assert "struct AnotherStatus" in module_code
+
+
+def test_module_interface_with_namespace(status_definition):
+    module_code = CodeGenerator().generate_module_interface(
+        [status_definition], module_name="status", namespace="testapp"
+    )
+    assert "export namespace testapp {" in module_code
+
+
+def test_module_interface_with_includes(status_definition):
+    module_code = CodeGenerator().generate_module_interface(
+        [status_definition], module_name="status", includes=["my/value.hh"]
+    )
+    assert module_code.index("#include <my/value.hh>") < module_code.index(
+        "export module"
+    )
+
+
+def _make_random_value(rng, depth=0):
+    kind = rng.randrange(5 if depth < 2 else 4)
+    if kind == 0:
+        return rng.randrange(-1000, 1000)
+    if kind == 1:
+        return rng.random() * 100
+    if kind == 2:
+        return rng.choice([True, False])
+    if kind == 3:
+        return "".join(rng.choices(string.ascii_letters + " ", k=rng.randrange(10)))
+    return tuple(_make_random_value(rng, depth + 1) for _ in range(rng.randrange(1, 4)))
+
+
+def _make_random_enum(seed):
+    rng = random.Random(seed)
+    value = _make_random_value(rng)
+    n_members = rng.randrange(1, 30)
+    names = rng.sample(range(1000), n_members)
+    return {
+        "typename": f"RandomEnum{seed}",
+        "members": [
+            {"name": f"ENUMERATOR_{name}" * rng.randrange(1, 3), "value": value}
+            for name in names
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "enum",
+    [STATUS_DEFINITION, STATUS_DEFINITION_DICT, NESTED_ENUM_DEFINITION_DICT, Status]
+    + [_make_random_enum(seed) for seed in range(20)],
+)
+@pytest.mark.parametrize("names", [False, True])
+def test_direct_backend_should_generate_same_code_as_jinja_backend(enum, names):
+    assert DirectCodeGenerator(names=names).generate_enum_definitions(
+        enum
+    ) == CodeGenerator(names=names).generate_enum_definitions(enum)
+
+
+@pytest.mark.parametrize("primary_type", PrimaryType)
+def test_direct_backend_should_pass_options_to_definition(primary_type):
+    assert DirectCodeGenerator().generate_enum_definitions(
+        Status, primary_type=primary_type
+    ) == CodeGenerator().generate_enum_definitions(Status, primary_type=primary_type)
+
+
+def test_direct_backend_should_render_documentation_from_templates(
+    status_definition_dict,
+):
+    documentation = DocumentationStyle.doxygen
+    assert DirectCodeGenerator(documentation=documentation).generate_enum_definitions(
+        status_definition_dict
+    ) == CodeGenerator(documentation=documentation).generate_enum_definitions(
+        status_definition_dict
+    )
+
+
+def test_direct_backend_should_generate_code_in_chunks(status_definition):
+    generator = DirectCodeGenerator(names=True)
+    chunks = list(generator.iter_enum_definitions(status_definition))
+    assert len(chunks) > 1
+    assert "".join(chunks) == generator.generate_enum_definitions(status_definition)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(generators, "_MEMBERS_PER_CHUNK", 3)
+
+
+@pytest.mark.parametrize(
+    "enum",
+    [STATUS_DEFINITION, NESTED_ENUM_DEFINITION_DICT, Status]
+    + [_make_random_enum(seed) for seed in range(10)],
+)
+@pytest.mark.parametrize("names", [False, True])
+@pytest.mark.parametrize("generator_type", [CodeGenerator, DirectCodeGenerator])
+def test_parallel_generation_should_generate_same_code_as_sequential(
+    small_chunks, enum, names, generator_type
+):
+    assert generator_type(names=names, processes=2).generate_enum_definitions(
+        enum
+    ) == CodeGenerator(names=names).generate_enum_definitions(enum)
+
+
+def test_parallel_generation_should_pass_options_to_definition(small_chunks):
+    options = dict(primary_type=PrimaryType.enhanced, narrow_types=True)
+    assert CodeGenerator(processes=2).generate_enum_definitions(
+        NESTED_ENUM_DEFINITION_DICT, **options
+    ) == CodeGenerator().generate_enum_definitions(
+        NESTED_ENUM_DEFINITION_DICT, **options
+    )
+
+
+def test_parallel_generation_should_render_documentation_from_templates(
+    small_chunks, status_definition_dict
+):
+    documentation = DocumentationStyle.doxygen
+    assert CodeGenerator(
+        documentation=documentation, processes=2
+    ).generate_enum_definitions(status_definition_dict) == CodeGenerator(
+        documentation=documentation
+    ).generate_enum_definitions(
+        status_definition_dict
+    )
+
+
+def test_parallel_generation_should_fail_if_enum_definition_is_invalid(
+    small_chunks, status_definition_dict
+):
+    status_definition_dict["members"][0]["value"] = object()
+    with pytest.raises(Error):
+        CodeGenerator(processes=2).generate_enum_definitions(status_definition_dict)
+
+
+def _exec_python_module(code):
+    namespace = {}
+    exec(code, namespace)
+    return namespace
+
+
+def _make_definition_dict_from_python_enum(enum_type):
+    return {
+        "typename": enum_type.__name__,
+        "members": [
+            {"name": name, "value": member.value}
+            for (name, member) in enum_type.__members__.items()
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "enum",
+    [STATUS_DEFINITION_DICT, NESTED_ENUM_DEFINITION_DICT, Status]
+    + [_make_random_enum(seed) for seed in range(20)],
+)
+def test_python_module_should_define_same_enum_as_cxx_code(enum):
+    typename = enum["typename"] if isinstance(enum, dict) else enum.__name__
+    module = _exec_python_module(
+        CodeGenerator().generate_python_module(enum, class_name=typename)
+    )
+    assert _generate_enum_definitions(
+        _make_definition_dict_from_python_enum(module[typename])
+    ) == _generate_enum_definitions(enum)
+
+
+def test_python_module_should_contain_frozen_lookup_tables(status_definition_dict):
+    module = _exec_python_module(
+        CodeGenerator().generate_python_module(status_definition_dict)
+    )
+    enum_type = module["EnhancedStatus"]
+    assert module["MEMBERS_BY_VALUE"] == {e.value: e for e in enum_type}
+    assert module["MEMBERS_BY_NAME"] == {e.name: e for e in enum_type}
+    with pytest.raises(TypeError):
+        module["MEMBERS_BY_VALUE"]["busy"] = None
+
+
+def test_python_module_should_look_up_first_enumerator_with_value():
+    module = _exec_python_module(
+        CodeGenerator().generate_python_module(
+            {
+                "typename": "Enum",
+                "members": [
+                    {"name": "FIRST", "value": [1, "one"]},
+                    {"name": "SECOND", "value": [1, "one"]},
+                ],
+            }
+        )
+    )
+    enum_type = module["EnhancedEnum"]
+    assert module["MEMBERS_BY_VALUE"] == {(1, "one"): enum_type.FIRST}
+    assert module["MEMBERS_BY_NAME"]["SECOND"] is enum_type.FIRST
+
+
+def test_python_module_should_require_python_values(status_definition):
+    with pytest.raises(Error):
+        CodeGenerator().generate_python_module(status_definition)
+
+
+def test_python_module_should_fail_if_name_is_not_valid_in_python():
+    with pytest.raises(Error):
+        CodeGenerator().generate_python_module(
+            {"typename": "Enum", "members": [{"name": "class", "value": 0}]}
+        )
+
+
+_STRING_ENUM_DEFINITION_DICT = {
+    "typename": "Text",
+    "members": [
+        {"name": "EMPTY", "value": ""},
+        {"name": "ESCAPED", "value": "tab\tquote'nul\x00"},
+        {"name": "UNICODE", "value": "\u00e4\u200b"},
+        {"name": "BYTES", "value": b"bytes"},
+    ],
+}
+
+
+def test_string_blob_should_contain_strings_and_offsets(status_definition):
+    code = CodeGenerator(string_blob=True).generate_enum_definitions(status_definition)
+    assert (
+        "static constexpr ::enhanced_enum::string_blob<std::uint8_t, 3> values {\n"
+        '        "initializing"\n'
+        '        "waitingForInput"\n'
+        '        "busy",\n'
+        "        {\n"
+        "            0,\n"
+        "            12,\n"
+        "            27,\n"
+        "            31,\n"
+        "        },\n"
+        "    };\n"
+    ) in code
+    assert (
+        "inline constexpr EnhancedStatus::value_type BUSY_VALUE "
+        "{ EnhancedStatus::values[2] };"
+    ) in code
+
+
+def test_string_blob_offsets_should_count_bytes():
+    code = CodeGenerator(string_blob=True).generate_enum_definitions(
+        _STRING_ENUM_DEFINITION_DICT
+    )
+    offsets = [0, 0, 14, 19, 24]
+    assert "".join(f"\n            {offset}," for offset in offsets) in code
+
+
+def test_string_blob_offset_type_should_fit_strings():
+    enum = {"typename": "Long", "members": [{"name": "LONG", "value": "x" * 256}]}
+    code = CodeGenerator(string_blob=True).generate_enum_definitions(enum)
+    assert "string_blob<std::uint16_t, 1>" in code
+
+
+@pytest.mark.parametrize(
+    "enum",
+    [
+        NESTED_ENUM_DEFINITION_DICT,
+        {"typename": "Number", "members": [{"name": "ONE", "value": 1}]},
+    ],
+)
+@pytest.mark.parametrize("generator_type", [CodeGenerator, DirectCodeGenerator])
+def test_string_blob_should_fail_if_values_are_not_strings(enum, generator_type):
+    with pytest.raises(Error):
+        generator_type(string_blob=True).generate_enum_definitions(enum)
+
+
+@pytest.mark.parametrize(
+    "enum", [STATUS_DEFINITION, Status, _STRING_ENUM_DEFINITION_DICT]
+)
+@pytest.mark.parametrize("names", [False, True])
+@pytest.mark.parametrize("processes", [1, 2])
+@pytest.mark.parametrize("generator_type", [CodeGenerator, DirectCodeGenerator])
+def test_string_blob_should_generate_same_code_with_all_backends(
+    small_chunks, enum, names, processes, generator_type
+):
+    assert generator_type(
+        names=names, processes=processes, string_blob=True
+    ).generate_enum_definitions(enum) == CodeGenerator(
+        names=names, string_blob=True
+    ).generate_enum_definitions(
+        enum
+    )
+
+
+_PERMISSION_DEFINITION_DICT = {
+    "typename": "Permission",
+    "flags": True,
+    "members": [
+        {"name": name}
+        for name in ["READ", "WRITE", "EXECUTE", "DELETE", "CREATE", "LIST", "ADMIN"]
+    ],
+}
+
+
+def test_flags_should_contain_flags_type_and_operators():
+    code = _generate_enum_definitions(_PERMISSION_DEFINITION_DICT)
+    assert (
+        "using PermissionFlags = ::enhanced_enum::flags<EnhancedPermission>;" in code
+    )
+    for operand in ["PermissionFlags", "PermissionLabel"]:
+        for operator in ["|", "&", "^"]:
+            assert (
+                f"constexpr PermissionFlags operator{operator}"
+                f"({operand} lhs, {operand} rhs) noexcept"
+            ) in code
+        assert f"constexpr PermissionFlags operator~({operand} flags) noexcept" in code
+
+
+def test_enum_definitions_should_not_contain_flags_if_not_flags(enum_code):
+    assert "flags" not in enum_code
+
+
+def test_label_enum_definition_should_not_contain_flags():
+    code = CodeGenerator().generate_label_enum_definition(_PERMISSION_DEFINITION_DICT)
+    assert "flags" not in code
+
+
+@pytest.mark.parametrize("documentation", [None, DocumentationStyle.doxygen])
+@pytest.mark.parametrize("processes", [1, 2])
+@pytest.mark.parametrize("generator_type", [CodeGenerator, DirectCodeGenerator])
+def test_flags_should_generate_same_code_with_all_backends(
+    small_chunks, documentation, processes, generator_type
+):
+    assert generator_type(
+        documentation=documentation, processes=processes
+    ).generate_enum_definitions(_PERMISSION_DEFINITION_DICT) == CodeGenerator(
+        documentation=documentation
+    ).generate_enum_definitions(
+        _PERMISSION_DEFINITION_DICT
+    )
+
+
+def test_python_module_should_define_flag_for_flags():
+    module = _exec_python_module(
+        CodeGenerator().generate_python_module(_PERMISSION_DEFINITION_DICT)
+    )
+    enum_type = module["EnhancedPermission"]
+    assert issubclass(enum_type, py_enum.Flag)
+    assert [e.value for e in enum_type] == [1, 2, 4, 8, 16, 32, 64]
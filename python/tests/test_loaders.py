@@ -0,0 +1,130 @@
+import io
+import json
+
+import pytest
+import yaml
+
+from enumecg.loaders import Format, get_format, iter_csv_members, load
+from enumecg.exceptions import Error
+
+
+@pytest.mark.parametrize(
+    "path,format",
+    [
+        ("enum.yaml", Format.yaml),
+        ("enum.yml", Format.yaml),
+        ("enum.json", Format.json),
+        ("enum.CSV", Format.csv),
+        ("enum", Format.yaml),
+    ],
+)
+def test_get_format_should_deduce_format_from_extension(path, format):
+    assert get_format(path) == format
+
+
+def test_load_yaml(status_definition_dict):
+    file = io.StringIO(yaml.dump(status_definition_dict))
+    assert load(file, Format.yaml) == status_definition_dict
+
+
+def test_load_json(status_definition_dict):
+    file = io.StringIO(json.dumps(status_definition_dict))
+    assert load(file, Format.json) == status_definition_dict
+
+
+def test_load_should_deduce_format_from_file_name(tmpdir, status_definition_dict):
+    path = tmpdir.join("status.json")
+    path.write(json.dumps(status_definition_dict))
+    with open(path) as file:
+        assert load(file) == status_definition_dict
+
+
+def test_load_csv_should_derive_typename_from_file_name(tmpdir):
+    path = tmpdir.join("Status.csv")
+    path.write("name,value\nBUSY,busy\n")
+    with open(path) as file:
+        assert load(file) == {
+            "typename": "Status",
+            "members": [{"name": "BUSY", "value": "busy"}],
+        }
+
+
+def test_load_should_override_typename(status_definition_dict):
+    file = io.StringIO(json.dumps(status_definition_dict))
+    assert load(file, Format.json, typename="Other")["typename"] == "Other"
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        "typename: T\nmembers:\n- name: A\n  value: 1\n- {name: B, value: [1, 2]}\n",
+        "members:\n- &a {name: A, value: 1}\n- {name: B, value: *a}\ntypename: T\n",
+        "base: &base {typename: T}\n<<: *base\nmembers: [{name: A, value: 1}]\n",
+        "members: &m [{name: A, value: 1}]\nother: *m\n",
+        "members: []\n",
+        "members: {A: 1}\n",
+        "members: [{name: A, value: 1}]\nmembers: [{name: B, value: 2}]\n",
+        "members: [{name: A, value: 1}]\nmembers: []\n",
+        "members: [{name: A, value: 1}]\nmembers: &m [{name: B, value: 2}]\n",
+        "members: &m [{name: A, value: 1}]\nmembers: [{name: B, value: 2}]\n",
+        "[1, 2]\n",
+        "",
+    ],
+)
+def test_load_yaml_should_be_equivalent_to_safe_load(document):
+    assert load(io.StringIO(document), Format.yaml) == yaml.safe_load(document)
+
+
+def test_load_yaml_should_construct_members_one_at_a_time(monkeypatch):
+    constructed = []
+    construct_document = yaml.SafeLoader.construct_document
+
+    def _construct_document(self, node):
+        data = construct_document(self, node)
+        constructed.append(data)
+        return data
+
+    monkeypatch.setattr(yaml.SafeLoader, "construct_document", _construct_document)
+    enum = load(
+        io.StringIO("typename: T\nmembers:\n- {name: A, value: 1}\n- {name: B}\n"),
+        Format.yaml,
+    )
+    assert constructed[:2] == enum["members"]
+
+
+def test_load_yaml_with_multiple_documents_should_raise_error():
+    with pytest.raises(Error):
+        load(io.StringIO("typename: T\n---\ntypename: U\n"), Format.yaml)
+
+
+def test_load_invalid_document_should_raise_error():
+    with pytest.raises(Error):
+        load(io.StringIO("{"), Format.json)
+
+
+def test_csv_members_should_be_read_row_by_row():
+    members = iter_csv_members(io.StringIO("name,value\nFIRST,1\nSECOND,2\n"))
+    assert next(members) == {"name": "FIRST", "value": 1}
+    assert next(members) == {"name": "SECOND", "value": 2}
+
+
+def test_csv_values_should_be_parsed_as_json_if_possible():
+    members = iter_csv_members(
+        io.StringIO('name,value\nA,3.14\nB,true\nC,"[1, 2]"\nD,string\n')
+    )
+    assert [member["value"] for member in members] == [3.14, True, [1, 2], "string"]
+
+
+def test_csv_members_should_ignore_extra_columns():
+    members = iter_csv_members(io.StringIO("comment,value,name\nextra,1,FIRST\n"))
+    assert list(members) == [{"name": "FIRST", "value": 1}]
+
+
+def test_csv_without_required_columns_should_raise_error():
+    with pytest.raises(Error):
+        list(iter_csv_members(io.StringIO("name,other\nFIRST,1\n")))
+
+
+def test_empty_csv_should_raise_error():
+    with pytest.raises(Error):
+        list(iter_csv_members(io.StringIO("")))
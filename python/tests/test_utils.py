@@ -133,6 +133,67 @@ def test_type_deducer_tuple_complex():
     )
 
 
+@pytest.mark.parametrize(
+    "values,type_name",
+    [
+        ((0, 255), "std::uint8_t"),
+        ((0, 256), "std::uint16_t"),
+        ((-128, 127), "std::int8_t"),
+        ((-129, 127), "std::int16_t"),
+        ((2 ** 32 - 1,), "std::uint32_t"),
+        ((-(2 ** 31),), "std::int32_t"),
+        ((2 ** 64 - 1,), "std::uint64_t"),
+        ((-(2 ** 63),), "std::int64_t"),
+        ((2 ** 64,), "long"),
+        ((0.5, 1), "float"),
+        ((0.1,), "double"),
+        ((1e300,), "double"),
+        ((True, False), "bool"),
+    ],
+)
+def test_type_deducer_narrow(values, type_name):
+    assert CppTypeDeducer(*values, narrow=True).type_name == type_name
+
+
+def test_type_deducer_narrow_tuple():
+    deducer = CppTypeDeducer(("string", 1, 2.5), ("another", 300), narrow=True)
+    assert deducer.type_name == "std::tuple<std::string_view, std::uint16_t, float>"
+
+
+def test_type_deducer_array():
+    deducer = CppTypeDeducer((1, 2, 3), (4, 5, 6), arrays=True)
+    assert deducer.type_name == "std::array<long, 3>"
+    assert deducer.get_value_initializer((4, 5, 6)) == [["4", "5", "6"]]
+
+
+def test_type_deducer_nested_array():
+    deducer = CppTypeDeducer(((0, "a"), (1, "b")), ((2, "c"), (3, "d")), arrays=True)
+    assert deducer.type_name == "std::array<std::tuple<long, std::string_view>, 2>"
+    assert deducer.get_value_initializer(((2, "c"), (3, "d"))) == [
+        [["2", '"c"'], ["3", '"d"']]
+    ]
+
+
+def test_type_deducer_sequences_of_different_lengths_should_not_be_array():
+    deducer = CppTypeDeducer((1, 2, 3), (4, 5), arrays=True)
+    assert deducer.type_name == "std::tuple<long, long, long>"
+    assert deducer.get_value_initializer((4, 5)) == ["4", "5"]
+
+
+def test_type_deducer_array_in_tuple():
+    deducer = CppTypeDeducer(("string", (1, 2)), arrays=True)
+    assert deducer.type_name == "std::tuple<std::string_view, std::array<long, 2>>"
+    assert deducer.get_value_initializer(("string", (1, 2))) == [
+        '"string"',
+        [["1", "2"]],
+    ]
+
+
+def test_type_deducer_heterogeneous_sequence_should_not_be_array():
+    deducer = CppTypeDeducer(("string", 1), arrays=True)
+    assert deducer.type_name == "std::tuple<std::string_view, long>"
+
+
 def test_type_deducer_with_explicit_typename():
     deducer = CppTypeDeducer(type_name="MyType")
     assert deducer.type_name == "MyType"
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from enumecg.watch import Watcher
+
+
+@pytest.fixture
+def watched_dir(tmpdir):
+    """Return directory containing a definition file ``enum.yaml``"""
+    tmpdir.join("enum.yaml").write("typename: Enum")
+    return tmpdir
+
+
+def _modify(path, content):
+    mtime = path.mtime()
+    path.write(content)
+    os.utime(path, (mtime + 1, mtime + 1))
+
+
+def test_watcher_should_report_all_files_on_first_poll(watched_dir):
+    watcher = Watcher(str(watched_dir))
+    assert watcher.poll() == [str(watched_dir.join("enum.yaml"))]
+
+
+def test_watcher_should_ignore_files_not_matching_patterns(watched_dir):
+    watched_dir.join("enum.hh").write("")
+    watcher = Watcher(str(watched_dir))
+    assert watcher.poll() == [str(watched_dir.join("enum.yaml"))]
+
+
+def test_watcher_should_not_report_unchanged_files(watched_dir):
+    watcher = Watcher(str(watched_dir), debounce=0)
+    watcher.poll()
+    assert watcher.poll() == []
+
+
+def test_watcher_should_report_changed_files(watched_dir):
+    watcher = Watcher(str(watched_dir), debounce=0)
+    watcher.poll()
+    _modify(watched_dir.join("enum.yaml"), "typename: Changed")
+    assert watcher.poll() == [str(watched_dir.join("enum.yaml"))]
+    assert watcher.poll() == []
+
+
+def test_watcher_should_report_new_files(watched_dir):
+    watcher = Watcher(str(watched_dir), debounce=0)
+    watcher.poll()
+    watched_dir.join("new.yml").write("typename: New")
+    assert watcher.poll() == [str(watched_dir.join("new.yml"))]
+
+
+def test_watcher_should_debounce_changes(watched_dir):
+    watcher = Watcher(str(watched_dir), debounce=3600)
+    watcher.poll()
+    _modify(watched_dir.join("enum.yaml"), "typename: Changed")
+    assert watcher.poll() == []